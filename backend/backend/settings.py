@@ -232,6 +232,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.QueryStatsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -495,6 +496,9 @@ SUPPORTED_EXTENSIONS = set(
         '.jpg',
         '.jpeg',
         '.json',
+        '.jsonl',
+        '.arrow',
+        '.parquet',
         '.m4a',
         '.mp3',
         '.ogg',
@@ -532,6 +536,9 @@ TASKS_MAX_NUMBER = 1000000
 TASKS_MAX_FILE_SIZE = DATA_UPLOAD_MAX_MEMORY_SIZE
 
 TASK_LOCK_TTL = int(get_env('TASK_LOCK_TTL', default=86400))
+# Expired task locks are deleted by a periodic RQ job with this interval (seconds),
+# without redis they are cleared inline by Task.set_lock / release_lock
+TASK_LOCK_SWEEP_INTERVAL = int(get_env('TASK_LOCK_SWEEP_INTERVAL', default=300))
 
 LABEL_STREAM_HISTORY_LIMIT = int(get_env('LABEL_STREAM_HISTORY_LIMIT', default=100))
 
@@ -571,6 +578,10 @@ TASK_DATA_PER_BATCH = int(get_env('TASK_DATA_PER_BATCH', 50 * 1024 * 1024))  # 5
 REIMPORT_BATCH_SIZE = int(get_env('REIMPORT_BATCH_SIZE', 1000))
 # Batch size for streaming import operations to reduce memory usage
 IMPORT_BATCH_SIZE = int(get_env('IMPORT_BATCH_SIZE', 500))
+# Opt-in for trusted uniform imports: only the first IMPORT_FAST_VALIDATION_SAMPLE_SIZE tasks of a batch
+# are fully validated, the rest tasks of the same shape get cheap structural checks
+IMPORT_FAST_VALIDATION = get_bool_env('IMPORT_FAST_VALIDATION', False)
+IMPORT_FAST_VALIDATION_SAMPLE_SIZE = int(get_env('IMPORT_FAST_VALIDATION_SAMPLE_SIZE', 100))
 # Batch size for processing prediction imports to avoid memory issues with large datasets
 PREDICTION_IMPORT_BATCH_SIZE = int(get_env('PREDICTION_IMPORT_BATCH_SIZE', 500))
 PROJECT_TITLE_MIN_LEN = 3
@@ -725,6 +736,43 @@ APP_WEBSERVER = get_env('APP_WEBSERVER', 'django')
 
 BATCH_JOB_RETRY_TIMEOUT = int(get_env('BATCH_JOB_RETRY_TIMEOUT', 60))
 
+# Materialized project counters (projects.models.ProjectCounters) are used by Project.objects.with_counts()
+# while they were reconciled no longer than N seconds ago, otherwise counters are aggregated live.
+# None disables the materialized value for a counter.
+PROJECT_COUNTERS_MAX_STALENESS = {
+    'task_number': 3600,
+    'finished_task_number': 600,
+    'total_predictions_number': 3600,
+    'total_annotations_number': 3600,
+    'num_tasks_with_annotations': 300,
+    'useful_annotation_number': 3600,
+    'ground_truth_number': 600,
+    'skipped_annotations_number': 3600,
+}
+# Delay before reconciling invalidated counters, repeated invalidations within it share one job
+PROJECT_COUNTERS_RECONCILE_DELAY = int(get_env('PROJECT_COUNTERS_RECONCILE_DELAY', 60))
+
+# Data Manager filters compiled to ORM expressions are cached in process memory,
+# entries are keyed by filters and project labeling config, TTL bounds staleness of resolved field types
+DATA_MANAGER_COMPILED_FILTERS_CACHE_SIZE = int(get_env('DATA_MANAGER_COMPILED_FILTERS_CACHE_SIZE', 1024))
+DATA_MANAGER_COMPILED_FILTERS_CACHE_TTL = int(get_env('DATA_MANAGER_COMPILED_FILTERS_CACHE_TTL', 300))
+
+# Data Manager page loads retrieve missing ML predictions in background jobs,
+# a job for the same tasks isn't started again within this number of seconds
+EVALUATE_PREDICTIONS_DEDUP_TTL = int(get_env('EVALUATE_PREDICTIONS_DEDUP_TTL', 60))
+
+# Maximum number of SQL queries per request for hot endpoints by URL name,
+# checked by core.utils.query_stats.assert_query_budget in tests and reported by QueryStatsMiddleware in debug mode.
+# Budgets are the counts measured by the core query budget tests plus 3 queries
+QUERY_BUDGETS = {
+    'tasks:api:task-list': 27,
+    'tasks:api:task-annotations': 70,
+    'projects:api:project-next': 41,
+    'projects:api:project-list': 14,
+    'projects:api:project-counts-list': 9,
+    'data_export:api-projects:project-export': 20,
+}
+
 FUTURE_SAVE_TASK_TO_STORAGE = get_bool_env('FUTURE_SAVE_TASK_TO_STORAGE', default=False)
 FUTURE_SAVE_TASK_TO_STORAGE_JSON_EXT = get_bool_env('FUTURE_SAVE_TASK_TO_STORAGE_JSON_EXT', default=True)
 STORAGE_IN_PROGRESS_TIMER = float(get_env('STORAGE_IN_PROGRESS_TIMER', 5.0))
@@ -921,6 +969,7 @@ DM_MAX_USERS_TO_DISPLAY = int(get_env('DM_MAX_USERS_TO_DISPLAY', 10))
 FSM_CACHE_TTL = 300  # Cache TTL in seconds (5 minutes)
 FSM_SYNC_PROJECT_STATE = 'fsm.project_transitions.sync_project_state'
 FSM_INFERENCE_FUNCTION = 'fsm.state_inference._get_or_infer_state'
+FSM_BULK_INFERENCE_FUNCTION = 'fsm.state_inference._bulk_infer_states'
 
 # Used for async migrations. In LSE this is set to a real queue name, including here so we
 # can use settings.SERVICE_QUEUE_NAME in async migrations in LSO
@@ -0,0 +1,416 @@
+"""This file and its contents are licensed under the Apache License 2.0. Please see the included NOTICE for copyright information and LICENSE for a copy of the license.
+
+Offline benchmarks of hot paths on synthetic projects, run them with `python manage.py run_benchmarks`.
+"""
+import itertools
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.utils.query_stats import capture_query_stats
+from data_export.mixins import ExportMixin
+from data_export.serializers import ExportDataSerializer
+from data_import.functions import _async_import_background_streaming
+from data_manager.models import Filter, FilterGroup, View
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from io_storages.models import S3ImportStorage
+from organizations.models import Organization
+from projects.models import Project, ProjectImport
+from rest_framework.test import APIClient
+from tasks.functions import bulk_update_is_labeled_by_overlap, update_tasks_counters
+from tasks.models import Annotation, Prediction, Task
+from users.models import User
+from webhooks.models import Webhook, WebhookAction
+from webhooks.utils import emit_webhooks_for_instance_sync
+
+try:
+    import boto3
+    from moto import mock_s3
+except ImportError:  # moto is a test dependency, storage sync benchmark is skipped without it
+    boto3 = mock_s3 = None
+
+logger = logging.getLogger(__name__)
+
+LABEL_CONFIG = """
+<View>
+  <Text name="text" value="$text"/>
+  <Choices name="sentiment" toName="text">
+    <Choice value="positive"/>
+    <Choice value="negative"/>
+    <Choice value="neutral"/>
+  </Choices>
+</View>
+"""
+CHOICES = ['positive', 'negative', 'neutral']
+WORDS = ['label', 'studio', 'task', 'annotation', 'prediction', 'data', 'manager', 'export', 'import', 'storage']
+
+# filters and ordering of seeded Data Manager views, views are used in turn by the task list benchmark
+VIEW_SETTINGS = [
+    ([('filter:tasks:total_annotations', 'Number', 'greater', 0)], ['tasks:-total_annotations']),
+    ([('filter:tasks:data.text', 'String', 'contains', 'label')], ['tasks:id']),
+    ([('filter:tasks:predictions_score', 'Number', 'greater', 0.5)], ['tasks:-predictions_score']),
+    ([], ['tasks:-updated_at']),
+]
+
+
+class BenchmarkSkipped(Exception):
+    pass
+
+
+def make_text(rng):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 30)))
+
+
+def make_result(rng):
+    return [
+        {
+            'from_name': 'sentiment',
+            'to_name': 'text',
+            'type': 'choices',
+            'value': {'choices': [rng.choice(CHOICES)]},
+        }
+    ]
+
+
+def make_task_data(rng, index):
+    return {'text': make_text(rng), 'index': index}
+
+
+def create_user_and_organization():
+    user = User.objects.create_user(email='benchmark@localhost', password=None, username='benchmark')
+    organization = Organization.create_organization(created_by=user, title='Benchmarks')
+    user.active_organization = organization
+    user.save(update_fields=['active_organization'])
+    return user, organization
+
+
+def seed_project(user, organization, rng, tasks=1000, annotations=1, predictions=1, views=4, labeled_ratio=0.5):
+    """Create a project with synthetic tasks, annotations, predictions and Data Manager views,
+    first labeled_ratio of tasks are annotated so the labeling stream has tasks to return
+    """
+    project = Project.objects.create(
+        title=f'Benchmark {tasks} tasks',
+        organization=organization,
+        created_by=user,
+        label_config=LABEL_CONFIG,
+        is_published=True,
+    )
+
+    Task.objects.bulk_create(
+        [Task(project=project, data=make_task_data(rng, i), inner_id=i + 1) for i in range(tasks)],
+        batch_size=settings.BATCH_SIZE,
+    )
+    task_ids = list(project.tasks.order_by('id').values_list('id', flat=True))
+    Annotation.objects.bulk_create(
+        [
+            Annotation(project=project, task_id=task_id, completed_by=user, result=make_result(rng), lead_time=1.0)
+            for task_id in task_ids[: int(len(task_ids) * labeled_ratio)]
+            for _ in range(annotations)
+        ],
+        batch_size=settings.BATCH_SIZE,
+    )
+    Prediction.objects.bulk_create(
+        [
+            Prediction(
+                project=project,
+                task_id=task_id,
+                result=make_result(rng),
+                score=round(rng.random(), 4),
+                model_version=f'model_{i % 2}',
+            )
+            for task_id in task_ids
+            for i in range(predictions)
+        ],
+        batch_size=settings.BATCH_SIZE,
+    )
+    update_tasks_counters(Task.objects.filter(project=project))
+    bulk_update_is_labeled_by_overlap(task_ids, project)
+
+    for i in range(views):
+        view_filters, ordering = VIEW_SETTINGS[i % len(VIEW_SETTINGS)]
+        filter_group = None
+        if view_filters:
+            filter_group = FilterGroup.objects.create(conjunction='and')
+            for index, (column, column_type, operator, value) in enumerate(view_filters):
+                filter_group.filters.add(
+                    Filter.objects.create(index=index, column=column, type=column_type, operator=operator, value=value)
+                )
+        View.objects.create(
+            project=project, user=user, filter_group=filter_group, ordering=ordering, data={'title': f'View {i}'}
+        )
+    return project
+
+
+class LocalHTTPSink:
+    """HTTP server on localhost accepting any POST, it's used instead of real webhook receivers"""
+
+    def __init__(self):
+        sink = self
+        self.requests = 0
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                sink.requests += 1
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/webhook'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@contextmanager
+def local_s3():
+    if mock_s3 is None:
+        raise BenchmarkSkipped('moto is not installed')
+    with mock_s3():
+        yield boto3.client('s3', region_name='us-east-1')
+
+
+def measure(run, setup=None, repeat=5, warmup=1):
+    """Call run(*setup()) warmup + repeat times, setup isn't timed.
+    Returns timings in seconds and SQL query stats of measured runs
+    """
+    timings, queries = [], []
+    for i in range(warmup + repeat):
+        args = setup() if setup else ()
+        with capture_query_stats() as stats:
+            start = time.perf_counter()
+            run(*args)
+            duration = time.perf_counter() - start
+        if i >= warmup:
+            timings.append(duration)
+            queries.append(stats.count)
+    return {
+        'repeat': repeat,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'max': max(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'queries': statistics.median(queries),
+    }
+
+
+class BenchmarkSuite:
+    """Seeds synthetic data and times hot paths, every benchmark_* method returns measure() results"""
+
+    def __init__(
+        self,
+        tasks=1000,
+        annotations=1,
+        predictions=1,
+        views=4,
+        labeled_ratio=0.5,
+        import_tasks=1000,
+        storage_objects=100,
+        webhook_tasks=100,
+        page_size=100,
+        repeat=5,
+        warmup=1,
+        seed=0,
+    ):
+        self.params = {
+            'tasks': tasks,
+            'annotations': annotations,
+            'predictions': predictions,
+            'views': views,
+            'labeled_ratio': labeled_ratio,
+            'import_tasks': import_tasks,
+            'storage_objects': storage_objects,
+            'webhook_tasks': webhook_tasks,
+            'page_size': page_size,
+            'repeat': repeat,
+            'warmup': warmup,
+            'seed': seed,
+        }
+        self.rng = random.Random(seed)
+        self.user, self.organization = create_user_and_organization()
+        self.project = seed_project(
+            self.user,
+            self.organization,
+            self.rng,
+            tasks=tasks,
+            annotations=annotations,
+            predictions=predictions,
+            views=views,
+            labeled_ratio=labeled_ratio,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def measure(self, run, setup=None):
+        return measure(run, setup, repeat=self.params['repeat'], warmup=self.params['warmup'])
+
+    def new_project(self):
+        project = Project.objects.create(
+            title='Benchmark', organization=self.organization, created_by=self.user, label_config=LABEL_CONFIG
+        )
+        # AutoOneToOneField creates the summary on first access, import locks it with select_for_update()
+        project.summary
+        return project
+
+    def benchmark_dm_tasks_list(self):
+        """Data Manager task list API, views with filters and ordering are used in turn"""
+        views = list(self.project.views.values_list('id', flat=True)) or [0]
+        url = reverse('tasks:api:task-list')
+        requests = itertools.count()
+
+        def run():
+            view_id = views[next(requests) % len(views)]
+            params = {'project': self.project.id, 'page': 1, 'page_size': self.params['page_size']}
+            if view_id:
+                params['view'] = view_id
+            response = self.client.get(url, params)
+            assert response.status_code == 200, response.content
+
+        return self.measure(run)
+
+    def benchmark_next_task(self):
+        """Labeling stream next task API, it runs get_next_task"""
+        url = reverse('projects:api:project-next', kwargs={'pk': self.project.id})
+
+        def run():
+            response = self.client.get(url)
+            assert response.status_code == 200, response.content
+
+        return self.measure(run)
+
+    def benchmark_streaming_import(self):
+        """Streaming import of inline tasks into a new project"""
+        return self.measure_streaming_import()
+
+    def benchmark_streaming_import_fast_validation(self):
+        """Streaming import with IMPORT_FAST_VALIDATION, only a sample of each batch is fully validated"""
+        with override_settings(IMPORT_FAST_VALIDATION=True):
+            return self.measure_streaming_import()
+
+    def measure_streaming_import(self):
+        def setup():
+            tasks = [{'data': make_task_data(self.rng, i)} for i in range(self.params['import_tasks'])]
+            project_import = ProjectImport.objects.create(
+                project=self.new_project(), tasks=tasks, commit_to_project=True
+            )
+            return (project_import,)
+
+        def run(project_import):
+            _async_import_background_streaming(project_import, self.user)
+            project_import.refresh_from_db()
+            assert project_import.status == ProjectImport.Status.COMPLETED, project_import.error
+
+        return self.measure(run, setup)
+
+    def benchmark_export_serializer(self):
+        """Project export serialization with ExportDataSerializer, batched like the export API"""
+        options = ExportMixin._get_export_serializer_option({})
+
+        def run():
+            tasks = Task.objects.filter(project=self.project).select_related('project')
+            tasks = tasks.prefetch_related('annotations', 'predictions').order_by('id')
+            task_ids = list(tasks.values_list('id', flat=True))
+            for i in range(0, len(task_ids), settings.BATCH_SIZE):
+                ExportDataSerializer(
+                    tasks.filter(id__in=task_ids[i : i + settings.BATCH_SIZE]), many=True, **options
+                ).data
+
+        return self.measure(run)
+
+    def benchmark_s3_storage_sync(self):
+        """S3 import storage sync against moto, a new storage and project are used for every run"""
+        with local_s3() as s3:
+            bucket = 'benchmark'
+            s3.create_bucket(Bucket=bucket)
+            for i in range(self.params['storage_objects']):
+                s3.put_object(Bucket=bucket, Key=f'tasks/{i}.json', Body=f'{{"text": "{make_text(self.rng)}"}}')
+
+            def setup():
+                storage = S3ImportStorage.objects.create(
+                    project=self.new_project(),
+                    bucket=bucket,
+                    prefix='tasks',
+                    aws_access_key_id='benchmark',
+                    aws_secret_access_key='benchmark',
+                    region_name='us-east-1',
+                    use_blob_urls=False,
+                )
+                # sync jobs are started for queued storages only
+                storage.info_set_queued()
+                return (storage,)
+
+            def run(storage):
+                storage.scan_and_create_links()
+                assert storage.project.tasks.count() == self.params['storage_objects']
+
+            return self.measure(run, setup)
+
+    def benchmark_webhooks(self):
+        """TASKS_CREATED webhook emission with payload to a local HTTP sink"""
+        task_ids = list(
+            self.project.tasks.order_by('id').values_list('id', flat=True)[: self.params['webhook_tasks']]
+        )
+
+        def run():
+            emit_webhooks_for_instance_sync(self.organization, self.project, WebhookAction.TASKS_CREATED, task_ids)
+
+        with LocalHTTPSink() as sink:
+            webhook = Webhook.objects.create(
+                organization=self.organization,
+                project=self.project,
+                url=sink.url,
+                send_payload=True,
+                send_for_all_actions=True,
+            )
+            result = self.measure(run)
+            webhook.delete()
+        result['received_requests'] = sink.requests
+        return result
+
+    def get_benchmarks(self):
+        return {
+            name[len('benchmark_') :]: getattr(self, name) for name in dir(self) if name.startswith('benchmark_')
+        }
+
+    def run(self, names=None):
+        results = {}
+        for name, benchmark in self.get_benchmarks().items():
+            if names and name not in names:
+                continue
+            logger.info(f'Running benchmark {name}')
+            try:
+                results[name] = benchmark()
+            except BenchmarkSkipped as e:
+                results[name] = {'skipped': str(e)}
+        return results
+
+
+def get_environment():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'database': connection.vendor,
+    }
@@ -1,6 +1,7 @@
 from threading import local
 from typing import Any
 
+from django.conf import settings
 from django.core.signals import request_finished
 from django.dispatch import receiver
 from django.middleware.common import CommonMiddleware
@@ -77,6 +78,29 @@ class CurrentContext:
         """
         return cls.get('fsm_disabled', False)
 
+    @classmethod
+    def set_fsm_change_tracking_disabled(cls, disabled: bool):
+        """
+        Disable/enable FSM field change tracking for models loaded in the current thread.
+
+        Useful for read-only iterations over large querysets (exports, counters),
+        the flag isn't shared with jobs spawned by the current thread.
+
+        Args:
+            disabled: True to disable change tracking, False to enable it
+        """
+        cls.set('fsm_change_tracking_disabled', disabled, shared=False)
+
+    @classmethod
+    def is_fsm_change_tracking_disabled(cls) -> bool:
+        """
+        Check if FSM field change tracking is disabled for the current thread.
+
+        Returns:
+            True if change tracking is disabled, False otherwise
+        """
+        return cls.get('fsm_change_tracking_disabled', False)
+
     @classmethod
     def _cache_fsm_enabled_state(cls, user):
         """
@@ -154,6 +178,15 @@ class ThreadLocalMiddleware(CommonMiddleware):
     def process_request(self, request):
         CurrentContext.set_request(request)
 
+    def process_response(self, request, response):
+        if settings.DEBUG:
+            # Only import when needed to avoid circular imports
+            from core.feature_flags import get_flags_evaluations_count
+
+            # debug mode only: make feature flags evaluations per request visible to catch regressions in hot paths
+            response['X-Feature-Flags-Evaluations'] = str(get_flags_evaluations_count())
+        return super().process_response(request, response)
+
 
 @receiver(request_finished)
 def clean_request(sender, **kwargs):
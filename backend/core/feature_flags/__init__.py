@@ -1 +1 @@
-from .base import all_flags, flag_set, get_feature_file_path
+from .base import all_flags, flag_set, get_feature_file_path, get_flags_evaluations_count
@@ -1,11 +1,15 @@
 import logging
+from threading import local
 
 import ldclient
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core.signals import request_finished
+from django.dispatch import receiver
 from ldclient.config import Config, HTTPConfig
 from ldclient.feature_store import CacheConfig
 from ldclient.integrations import Files, Redis
+from rq import get_current_job
 
 from core.current_request import get_current_request
 from core.utils.common import load_func
@@ -70,6 +74,94 @@ else:
     client = ldclient.get()
 
 
+class FlagsCache:
+    """Memoized flag values, user representations and env overrides for one request or RQ job"""
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.values = {}
+        self.user_reprs = {}
+        self.env_values = {}
+        self.calls = 0
+        self.evaluations = 0
+
+    def get_user_repr(self, context_key, user, organization):
+        if context_key not in self.user_reprs:
+            self.user_reprs[context_key] = _get_user_repr(user, organization)
+        return self.user_reprs[context_key]
+
+    def get_env_value(self, feature_flag):
+        if feature_flag not in self.env_values:
+            self.env_values[feature_flag] = get_bool_env(feature_flag, default=None)
+        return self.env_values[feature_flag]
+
+
+_flags_cache = local()
+
+
+def _get_cache_scope():
+    request = get_current_request()
+    if request is not None:
+        return 'request', id(request)
+    job = get_current_job()
+    if job is not None:
+        return 'job', job.id
+    return None
+
+
+def get_flags_cache():
+    """Feature flags cache for the current request or RQ job, it's None outside of them,
+    so flags are evaluated on every call in shell, management commands, etc.
+    """
+    scope = _get_cache_scope()
+    if scope is None:
+        return None
+    cache = getattr(_flags_cache, 'cache', None)
+    if cache is None or cache.scope != scope:
+        cache = FlagsCache(scope)
+        _flags_cache.cache = cache
+    return cache
+
+
+def get_flags_evaluations_count():
+    """Number of real flag evaluations (cache misses) in the current request or RQ job"""
+    cache = get_flags_cache()
+    return cache.evaluations if cache is not None else 0
+
+
+@receiver(request_finished)
+def clean_flags_cache(sender, **kwargs):
+    cache = getattr(_flags_cache, 'cache', None)
+    if cache is not None:
+        logger.debug(f'Feature flags: {cache.calls} calls, {cache.evaluations} evaluations for {cache.scope}')
+        del _flags_cache.cache
+
+
+def _get_context_key(user, organization):
+    if organization is not None:
+        return 'organization', organization.id
+    # user can be AnonymousUser class itself, its is_authenticated is a property object
+    if getattr(user, 'is_authenticated', False) is True:
+        return 'user', user.id, getattr(user, 'active_organization_id', None)
+    return ('anonymous',)
+
+
+def _get_user_repr(user, organization):
+    if organization is None:
+        return get_user_repr(user)
+    return get_user_repr_from_organization(organization)
+
+
+def _evaluate_flag(feature_flag, user_dict, env_value, override_system_default):
+    if env_value is not None:
+        return env_value
+    if override_system_default is not None:
+        system_default = override_system_default
+    else:
+        system_default = settings.FEATURE_FLAGS_DEFAULT_VALUE
+    return client.variation(feature_flag, user_dict, system_default)
+
+
 def flag_set(feature_flag, user=None, override_system_default=None, organization=None):
     """Use this method to check whether this flag is set ON to the current user, to split the logic on backend
     For example,
@@ -81,6 +173,8 @@ def flag_set(feature_flag, user=None, override_system_default=None, organization
     ```
     `override_default` is used to override any system defaults in place in case no files or LD API flags provided
 
+    Flag values are memoized for the current request or RQ job, see get_flags_cache()
+
     stale_feature_flags will be checked to confirm if the feature flags are still active
 
     stale feature flags are considered "deprecated" and should not be changeable in any circumstance.
@@ -98,19 +192,22 @@ def flag_set(feature_flag, user=None, override_system_default=None, organization
         if request and getattr(request, 'user', None) and request.user.is_authenticated:
             user = request.user
 
-    if organization is None:
-        user_dict = get_user_repr(user)
-    else:
-        user_dict = get_user_repr_from_organization(organization)
-
-    env_value = get_bool_env(feature_flag, default=None)
-    if env_value is not None:
-        return env_value
-    if override_system_default is not None:
-        system_default = override_system_default
-    else:
-        system_default = settings.FEATURE_FLAGS_DEFAULT_VALUE
-    return client.variation(feature_flag, user_dict, system_default)
+    cache = get_flags_cache()
+    if cache is None:
+        user_dict = _get_user_repr(user, organization)
+        env_value = get_bool_env(feature_flag, default=None)
+        return _evaluate_flag(feature_flag, user_dict, env_value, override_system_default)
+
+    # memoize flag values for the current request or job
+    cache.calls += 1
+    context_key = _get_context_key(user, organization)
+    key = (feature_flag, context_key, override_system_default)
+    if key not in cache.values:
+        cache.evaluations += 1
+        user_dict = cache.get_user_repr(context_key, user, organization)
+        env_value = cache.get_env_value(feature_flag)
+        cache.values[key] = _evaluate_flag(feature_flag, user_dict, env_value, override_system_default)
+    return cache.values[key]
 
 
 def all_flags(user):
@@ -47,3 +47,28 @@ def test_flag_set_with_organization_context_env_override(monkeypatch, settings):
     # Unset env should fall back to override_system_default=False
     monkeypatch.delenv('fflag_feat_test_org_targeting', raising=False)
     assert flag_set('fflag_feat_test_org_targeting', organization=org, override_system_default=False) is False
+
+
+def test_flag_set_is_memoized_per_request(monkeypatch, rf):
+    from django.contrib.auth.models import AnonymousUser
+    from label_studio.core.current_request import CurrentContext
+    from label_studio.core.feature_flags.base import clean_flags_cache, get_flags_evaluations_count
+
+    request = rf.get('/')
+    request.user = AnonymousUser()
+    CurrentContext.set_request(request)
+    try:
+        evaluations = get_flags_evaluations_count()
+        monkeypatch.setenv('fflag_feat_test_memoized', 'true')
+        assert flag_set('fflag_feat_test_memoized', user='auto') is True
+
+        # env snapshot and value are kept until the end of the request
+        monkeypatch.setenv('fflag_feat_test_memoized', 'false')
+        assert flag_set('fflag_feat_test_memoized', user='auto') is True
+        assert get_flags_evaluations_count() == evaluations + 1
+    finally:
+        clean_flags_cache(sender=None)
+        CurrentContext.clear()
+
+    # no request - no memoization
+    assert flag_set('fflag_feat_test_memoized', user='auto') is False
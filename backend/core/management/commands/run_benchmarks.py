@@ -0,0 +1,71 @@
+import json
+import logging
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Run hot path benchmarks on synthetic projects in a temporary test database and print results as JSON. '
+        'Runs offline: S3 is emulated with moto, webhooks are sent to a local HTTP sink. '
+        'Stop Redis or unset REDIS_LOCATION to run background jobs inline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1000, help='tasks in the seeded project')
+        parser.add_argument('--annotations', type=int, default=1, help='annotations per task')
+        parser.add_argument('--predictions', type=int, default=1, help='predictions per task')
+        parser.add_argument('--labeled-ratio', type=float, default=0.5, help='share of annotated tasks')
+        parser.add_argument('--views', type=int, default=4, help='Data Manager views with filters and ordering')
+        parser.add_argument('--import-tasks', type=int, default=1000, help='tasks per streaming import')
+        parser.add_argument('--storage-objects', type=int, default=100, help='JSON objects in the S3 bucket')
+        parser.add_argument('--webhook-tasks', type=int, default=100, help='tasks in the webhook payload')
+        parser.add_argument('--page-size', type=int, default=100, help='Data Manager page size')
+        parser.add_argument('--repeat', type=int, default=5, help='measured runs of every benchmark')
+        parser.add_argument('--warmup', type=int, default=1, help='not measured runs before measured ones')
+        parser.add_argument('--seed', type=int, default=0, help='random seed of synthetic data')
+        parser.add_argument('--only', nargs='*', default=None, help='benchmark names to run, all by default')
+        parser.add_argument('--output', default=None, help='JSON output file, stdout by default')
+
+    def handle(self, *args, **options):
+        # imported here because benchmarks import most of the apps
+        from core.benchmarks import BenchmarkSuite, get_environment
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            started_at = datetime.now(timezone.utc).isoformat()
+            suite = BenchmarkSuite(
+                tasks=options['tasks'],
+                annotations=options['annotations'],
+                predictions=options['predictions'],
+                views=options['views'],
+                labeled_ratio=options['labeled_ratio'],
+                import_tasks=options['import_tasks'],
+                storage_objects=options['storage_objects'],
+                webhook_tasks=options['webhook_tasks'],
+                page_size=options['page_size'],
+                repeat=options['repeat'],
+                warmup=options['warmup'],
+                seed=options['seed'],
+            )
+            results = suite.run(options['only'])
+            report = {
+                'started_at': started_at,
+                'environment': get_environment(),
+                'params': suite.params,
+                'results': results,
+            }
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output)
+            logger.info(f'Benchmark results were saved to {options["output"]}')
+        else:
+            self.stdout.write(output)
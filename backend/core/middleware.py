@@ -7,6 +7,7 @@ from uuid import uuid4
 
 import ujson as json
 from core.utils.contextlog import ContextLog
+from core.utils.query_stats import capture_query_stats, get_query_budget
 from csp.middleware import CSPMiddleware
 from django.conf import settings
 from django.contrib.auth import logout
@@ -168,6 +169,34 @@ class DatabaseIsLockedRetryMiddleware(CommonMiddleware):
         return response
 
 
+class QueryStatsMiddleware:
+    """Debug mode only: collect SQL query count, total SQL time and duplicate queries per request
+    and expose them in X-DB-* response headers. Requests exceeding the view budget
+    from settings.QUERY_BUDGETS are logged."""
+
+    def __init__(self, get_response):
+        if not settings.DEBUG:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with capture_query_stats() as stats:
+            response = self.get_response(request)
+
+        for header, value in stats.to_headers().items():
+            response[header] = value
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        budget = get_query_budget(resolver_match.view_name) if resolver_match else None
+        if budget is not None:
+            response['X-DB-Query-Budget'] = str(budget)
+            if stats.count > budget:
+                logger.warning(
+                    f'{resolver_match.view_name} exceeded its query budget: {stats.count} > {budget}\n{stats.report()}'
+                )
+        return response
+
+
 class XApiKeySupportMiddleware:
     """Middleware that adds support for the X-Api-Key header, by having its value supersede
     anything that's set in the Authorization header."""
@@ -11,8 +11,10 @@ import redis
 from core.current_request import CurrentContext
 from django.conf import settings
 from django_rq import get_connection
+from rq import get_current_job
 from rq.command import send_stop_job_command
-from rq.exceptions import InvalidJobOperation
+from rq.exceptions import InvalidJobOperation, NoSuchJobError
+from rq.job import Job
 from rq.registry import StartedJobRegistry
 
 logger = logging.getLogger(__name__)
@@ -227,6 +229,67 @@ def start_job_async_or_sync(job, *args, in_seconds=0, **kwargs):
             raise
 
 
+def update_job_progress(processed, total, **kwargs):
+    """
+    Save progress of the current job to its meta, so it can be polled by job id.
+    Does nothing when the job is running synchronously (without redis)
+    :param processed: Number of processed items
+    :param total: Total number of items
+    :param kwargs: Any additional serializable progress info
+    """
+    job = get_current_job()
+    if job is None:
+        return
+    try:
+        job.meta['progress'] = {'processed': processed, 'total': total, **kwargs}
+        job.save_meta()
+    except redis.exceptions.RedisError as exc:
+        logger.warning(f'Failed to save progress for job {job.id}: {exc}')
+
+
+def _job_cancel_key(job_id):
+    return f'rq:job:{job_id}:cancel_requested'
+
+
+def is_job_cancel_requested(job=None):
+    """
+    Check if cancellation was requested for the job, see request_job_cancel().
+    Always False when the job is running synchronously (without redis)
+    :param job: RQ Job, the current job by default
+    """
+    job = job or get_current_job()
+    if job is None:
+        return False
+    try:
+        return bool(job.connection.exists(_job_cancel_key(job.id)))
+    except redis.exceptions.RedisError as exc:
+        logger.warning(f'Failed to check cancel status for job {job.id}: {exc}')
+        return False
+
+
+def request_job_cancel(job):
+    """
+    Ask the job to stop gracefully: jobs check it between chunks with is_job_cancel_requested().
+    The flag is stored in a separate key, not in job.meta, so progress saved by the job can't overwrite it
+    :param job: RQ Job
+    """
+    job.connection.set(_job_cancel_key(job.id), 1, ex=settings.RQ_LONG_JOB_TIMEOUT)
+
+
+def fetch_job(job_id):
+    """
+    Fetch RQ job by id
+    :param job_id: Job ID
+    :return: Job or None if redis is not connected or job doesn't exist
+    """
+    if not redis_connected():
+        return None
+    try:
+        return Job.fetch(job_id, connection=_redis)
+    except NoSuchJobError:
+        return None
+
+
 def is_job_in_queue(queue, func_name, meta):
     """
     Checks if func_name with kwargs[meta] is in queue (doesn't check workers)
@@ -0,0 +1,37 @@
+import pytest
+from core.benchmarks import BenchmarkSuite
+from tasks.models import Annotation, Prediction, Task
+
+pytestmark = pytest.mark.django_db
+
+
+def test_benchmark_suite_small_project():
+    """Benchmark suite seeds data and runs every benchmark offline"""
+    suite = BenchmarkSuite(
+        tasks=6, annotations=2, predictions=1, views=4, import_tasks=5, storage_objects=3, webhook_tasks=5, repeat=1
+    )
+
+    assert Task.objects.filter(project=suite.project).count() == 6
+    assert Annotation.objects.filter(project=suite.project).count() == 6
+    assert Prediction.objects.filter(project=suite.project).count() == 6
+    assert suite.project.views.count() == 4
+
+    results = suite.run()
+
+    assert set(results) == {
+        'dm_tasks_list',
+        'export_serializer',
+        'next_task',
+        's3_storage_sync',
+        'streaming_import',
+        'streaming_import_fast_validation',
+        'webhooks',
+    }
+    for name, result in results.items():
+        if 'skipped' in result:
+            assert name == 's3_storage_sync'
+            continue
+        assert result['repeat'] == 1
+        assert result['min'] <= result['median'] <= result['max']
+        assert result['queries'] >= 0
+    assert results['webhooks']['received_requests'] == 2
@@ -0,0 +1,104 @@
+import pytest
+from core.utils.query_stats import assert_query_budget, capture_query_stats, fingerprint_sql
+from django.urls import reverse
+from projects.tests.factories import ProjectFactory
+from rest_framework.test import APIClient
+from tasks.models import Task
+from tasks.tests.factories import AnnotationFactory, PredictionFactory, TaskFactory
+
+
+def test_fingerprint_sql_ignores_parameters():
+    """Queries differing only by parameters share a fingerprint"""
+    assert fingerprint_sql('SELECT * FROM task WHERE id = 1') == fingerprint_sql('SELECT  *\nFROM task WHERE id = 25')
+    assert fingerprint_sql("SELECT * FROM task WHERE data = 'it''s'") == 'SELECT * FROM task WHERE data = ?'
+    assert fingerprint_sql('SELECT * FROM task WHERE id IN (%s, %s)') == 'SELECT * FROM task WHERE id IN (...)'
+    assert fingerprint_sql('SELECT * FROM task WHERE id IN (%s)') == 'SELECT * FROM task WHERE id IN (...)'
+    assert fingerprint_sql('SELECT * FROM task') != fingerprint_sql('SELECT * FROM task_completion')
+
+
+@pytest.mark.django_db
+def test_capture_query_stats_counts_duplicates():
+    """QueryStats counts queries and repeated fingerprints"""
+    project = ProjectFactory()
+    tasks = [TaskFactory(project=project) for _ in range(3)]
+
+    with capture_query_stats() as stats:
+        for task in tasks:
+            Task.objects.get(id=task.id)
+
+    assert stats.count == 3
+    assert len(stats.duplicates) == 1
+    assert stats.duplicates_count == 2
+    assert stats.time > 0
+    assert stats.to_headers()['X-DB-Query-Count'] == '3'
+
+
+def make_project(tasks_number):
+    project = ProjectFactory()
+    # export passes the organization owner token to the converter, tokens aren't created on user signup
+    project.organization.created_by.reset_token()
+    for _ in range(tasks_number):
+        task = TaskFactory(project=project)
+        AnnotationFactory(task=task, project=project, completed_by=project.created_by)
+        PredictionFactory(task=task, project=project)
+    return project
+
+
+def get_client(project):
+    client = APIClient()
+    client.force_authenticate(user=project.created_by)
+    return client
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'view_name, get_url',
+    [
+        ('tasks:api:task-list', lambda project: f'{reverse("tasks:api:task-list")}?project={project.id}'),
+        ('projects:api:project-list', lambda project: reverse('projects:api:project-list')),
+        ('projects:api:project-counts-list', lambda project: reverse('projects:api:project-counts-list')),
+        (
+            'data_export:api-projects:project-export',
+            lambda project: reverse('data_export:api-projects:project-export', kwargs={'pk': project.id}),
+        ),
+    ],
+)
+def test_list_endpoints_query_budget(view_name, get_url):
+    """List endpoints stay within their query budget and don't run queries per item"""
+    counts = []
+    for tasks_number in (2, 6):
+        project = make_project(tasks_number)
+        client = get_client(project)
+        with assert_query_budget(view_name) as stats:
+            response = client.get(get_url(project))
+        assert response.status_code == 200
+        counts.append(stats.count)
+
+    assert counts[0] == counts[1], f'{view_name} runs queries per item: {counts}'
+
+
+@pytest.mark.django_db
+def test_next_task_query_budget():
+    """Next task endpoint stays within its query budget"""
+    project = ProjectFactory()
+    for _ in range(5):
+        TaskFactory(project=project)
+    client = get_client(project)
+
+    with assert_query_budget('projects:api:project-next'):
+        response = client.get(reverse('projects:api:project-next', kwargs={'pk': project.id}))
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_annotation_create_query_budget():
+    """Annotation creation stays within its query budget"""
+    project = ProjectFactory()
+    task = TaskFactory(project=project)
+    client = get_client(project)
+
+    with assert_query_budget('tasks:api:task-annotations'):
+        response = client.post(
+            reverse('tasks:api:task-annotations', kwargs={'pk': task.id}), data={'result': []}, format='json'
+        )
+    assert response.status_code == 201
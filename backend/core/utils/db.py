@@ -5,6 +5,7 @@ from typing import Dict, Optional, TypeVar
 
 from django.db import OperationalError, connection, models, transaction
 from django.db.models import Model, QuerySet, Subquery
+from django.db.models.deletion import Collector, RestrictedError, get_candidate_relations_to_delete
 from django.db.models.signals import post_migrate
 from django.db.utils import DatabaseError, ProgrammingError
 from django.dispatch import receiver
@@ -123,6 +124,59 @@ def batch_delete(queryset, batch_size=500):
     return total_deleted
 
 
+def raw_cascade_delete(model, pks, batch_size=500):
+    """
+    Delete objects by primary keys together with all dependent rows using raw DELETE statements.
+
+    Relations are followed the same way Django's Collector does it (CASCADE deletes, SET_NULL nullifies,
+    DO_NOTHING is skipped), but objects are never loaded into memory and delete signals are not sent.
+    Existing dependent rows of PROTECT and RESTRICT relations raise ProtectedError and RestrictedError,
+    SET_DEFAULT and SET() relations are updated by Django's Collector.
+    Dependent rows are processed in pk ordered batches, so rows are locked in a consistent order.
+
+    Args:
+        model: Model class of deleted objects
+        pks: Primary keys of objects to delete
+        batch_size: Number of dependent objects to process in each batch
+
+    Returns:
+        int: Number of deleted objects of the model
+    """
+    pks = list(pks)
+    if not pks:
+        return 0
+
+    for related in get_candidate_relations_to_delete(model._meta):
+        field = related.field
+        on_delete = field.remote_field.on_delete
+        if on_delete == models.DO_NOTHING:
+            continue
+
+        related_queryset = related.related_model._base_manager.filter(**{f'{field.name}__in': pks})
+        if on_delete == models.CASCADE:
+            related_pks = list(related_queryset.order_by('pk').values_list('pk', flat=True))
+            for i in range(0, len(related_pks), batch_size):
+                raw_cascade_delete(related.related_model, related_pks[i : i + batch_size], batch_size=batch_size)
+        elif on_delete == models.SET_NULL:
+            related_queryset.update(**{field.name: None})
+        elif not related_queryset.exists():
+            continue
+        elif on_delete == models.RESTRICT:
+            raise RestrictedError(
+                f"Cannot delete some instances of model '{model.__name__}' because they are referenced "
+                f"through restricted foreign key: '{related.related_model.__name__}.{field.name}'",
+                set(related_queryset),
+            )
+        else:
+            # PROTECT raises ProtectedError, SET_DEFAULT and SET() register field updates applied by the collector
+            collector = Collector(using=related_queryset.db, origin=model)
+            on_delete(collector, field, related_queryset, related_queryset.db)
+            collector.delete()
+
+    queryset = model._base_manager.filter(pk__in=pks).order_by()
+    return queryset._raw_delete(queryset.db)
+
+
 # =====================
 # Schema helpers
 # =====================
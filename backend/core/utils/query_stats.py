@@ -0,0 +1,107 @@
+"""This file and its contents are licensed under the Apache License 2.0. Please see the included NOTICE for copyright information and LICENSE for a copy of the license.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDERS_LIST_RE = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint_sql(sql: str) -> str:
+    """Normalize SQL so the same query with different parameters gets the same fingerprint:
+    literals are replaced with ?, IN lists of any length are collapsed to (...)
+    """
+    sql = _STRING_LITERAL_RE.sub('?', sql)
+    sql = _NUMBER_LITERAL_RE.sub('?', sql)
+    sql = _PLACEHOLDERS_LIST_RE.sub('(...)', sql)
+    return _WHITESPACE_RE.sub(' ', sql).strip()
+
+
+class QueryStats:
+    """Database execute wrapper collecting query count, total SQL time and query fingerprints"""
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+        self.queries: List[str] = []
+        self.fingerprints: Counter = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - start
+            self.count += 1
+            self.queries.append(sql)
+            self.fingerprints[fingerprint_sql(sql)] += 1
+
+    @property
+    def duplicates(self) -> Dict[str, int]:
+        """Fingerprints of queries executed more than once, the usual sign of N+1"""
+        return {fingerprint: count for fingerprint, count in self.fingerprints.items() if count > 1}
+
+    @property
+    def duplicates_count(self) -> int:
+        """Number of executions that repeat an already executed query fingerprint"""
+        return sum(count - 1 for count in self.duplicates.values())
+
+    def to_headers(self) -> Dict[str, str]:
+        return {
+            'X-DB-Query-Count': str(self.count),
+            'X-DB-Query-Time-Ms': f'{self.time * 1000:.2f}',
+            'X-DB-Duplicate-Queries': str(self.duplicates_count),
+        }
+
+    def report(self) -> str:
+        lines = [f'{self.count} queries, {self.time * 1000:.2f} ms']
+        lines += [f'{count}x {fingerprint}' for fingerprint, count in self.fingerprints.most_common()]
+        return '\n'.join(lines)
+
+
+@contextmanager
+def capture_query_stats() -> Iterator[QueryStats]:
+    """Collect QueryStats for all queries executed inside the block on all database connections
+    of the current thread. Unlike CaptureQueriesContext it doesn't depend on DEBUG.
+    """
+    stats = QueryStats()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        yield stats
+
+
+def get_query_budget(view_name: str) -> Optional[int]:
+    """Declared maximum number of queries per request for the view from settings.QUERY_BUDGETS"""
+    return settings.QUERY_BUDGETS.get(view_name)
+
+
+@contextmanager
+def assert_query_budget(view_name: str, max_queries: Optional[int] = None) -> Iterator[QueryStats]:
+    """Test helper: fail if the block runs more queries than the declared budget of the view
+
+    Usage:
+        with assert_query_budget('projects:api:project-next'):
+            client.get(url)
+    """
+    if max_queries is None:
+        max_queries = get_query_budget(view_name)
+        assert max_queries is not None, f'No query budget declared for {view_name} in settings.QUERY_BUDGETS'
+
+    with capture_query_stats() as stats:
+        yield stats
+
+    assert stats.count <= max_queries, (
+        f'{view_name} exceeded its query budget: {stats.count} > {max_queries}\n{stats.report()}'
+    )
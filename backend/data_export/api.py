@@ -184,7 +184,7 @@ class ExportAPI(generics.RetrieveAPIView):
             annotations_qs = annotations_qs.with_state()
 
         qs = queryset.select_related('project').prefetch_related(
-            Prefetch('annotations', queryset=annotations_qs), 'predictions'
+            Prefetch('annotations', queryset=annotations_qs), 'predictions', 'drafts', 'comment_authors'
         )
 
         # Add FSM state annotation to tasks as well to avoid N+1 queries during export
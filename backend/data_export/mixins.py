@@ -25,6 +25,7 @@ from django.db import transaction
 from django.db.models import Prefetch
 from django.db.models.query_utils import Q
 from django.utils import dateformat, timezone
+from fsm.utils import fsm_change_tracking_disabled
 from label_studio_sdk.converter import Converter
 from tasks.models import Annotation, AnnotationDraft, Task
 
@@ -235,7 +236,9 @@ class ExportMixin:
 
             for ids in batch(task_ids, BATCH_SIZE):
                 i += 1
-                tasks = list(self.get_task_queryset(ids, annotation_filter_options))
+                # exported tasks and annotations are read-only, skip FSM change tracking
+                with fsm_change_tracking_disabled():
+                    tasks = list(self.get_task_queryset(ids, annotation_filter_options))
                 logger.debug(f'Batch: {i*BATCH_SIZE}')
                 if isinstance(task_filter_options, dict) and task_filter_options.get('only_with_annotations'):
                     tasks = [task for task in tasks if task.annotations.exists()]
@@ -102,7 +102,7 @@ class BaseExportDataSerializer(FlexFieldsModelSerializer):
 
     class Meta:
         model = Task
-        exclude = ('overlap', 'is_labeled', 'precomputed_agreement')
+        exclude = ('overlap', 'is_labeled', 'precomputed_agreement', 'data_hash')
         expandable_fields = {
             'drafts': (AnnotationDraftSerializer, {'many': True}),
             'predictions': (PredictionSerializer, {'many': True}),
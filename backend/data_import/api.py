@@ -10,7 +10,7 @@ from core.decorators import override_report_only_csp
 from core.feature_flags import flag_set
 from core.permissions import ViewClassPermission, all_permissions
 from core.redis import start_job_async_or_sync
-from core.utils.common import retry_database_locked, timeit
+from core.utils.common import batched_iterator, retry_database_locked, timeit
 from core.utils.params import bool_from_request, list_of_strings_from_request
 from csp.decorators import csp
 from django.conf import settings
@@ -20,7 +20,7 @@ from django.utils.decorators import method_decorator
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
 from label_studio_sdk.label_interface import LabelInterface
-from projects.models import Project, ProjectImport, ProjectReimport
+from projects.models import Project, ProjectCounters, ProjectImport, ProjectReimport
 from ranged_fileresponse import RangedFileResponse
 from rest_framework import generics, status
 from rest_framework.exceptions import ValidationError
@@ -45,6 +45,7 @@ from .functions import (
     set_reimport_background_failure,
 )
 from .models import FileUpload
+from .parsers import StreamingJSONListParser
 from .serializers import FileUploadSerializer, ImportApiSerializer, PredictionSerializer
 from .uploader import create_file_uploads, load_tasks
 
@@ -159,6 +160,14 @@ task_create_response_scheme = {
                 default=False,
                 required=False,
             ),
+            OpenApiParameter(
+                name='skip_duplicates',
+                type=OpenApiTypes.BOOL,
+                location='query',
+                description='Set to "true" to skip tasks with the same data as already existing project tasks.',
+                default=False,
+                required=False,
+            ),
             OpenApiParameter(
                 name='preannotated_from_fields',
                 many=True,
@@ -262,7 +271,11 @@ class ImportAPI(generics.CreateAPIView):
             project = generics.get_object_or_404(Project.objects.for_user(self.request.user), pk=project_id)
         else:
             project = None
-        return {'project': project, 'user': self.request.user}
+        return {
+            'project': project,
+            'user': self.request.user,
+            'skip_duplicates': bool_from_request(self.request.query_params, 'skip_duplicates', False),
+        }
 
     def post(self, *args, **kwargs):
         return super(ImportAPI, self).post(*args, **kwargs)
@@ -376,6 +389,7 @@ class ImportAPI(generics.CreateAPIView):
             preannotated_from_fields=preannotated_from_fields,
             commit_to_project=commit_to_project,
             return_task_ids=return_task_ids,
+            skip_duplicates=bool_from_request(request.query_params, 'skip_duplicates', False),
         )
 
         if len(request.FILES):
@@ -488,9 +502,10 @@ class ImportPredictionsAPI(generics.CreateAPIView):
     """
 
     permission_required = all_permissions.projects_change
-    parser_classes = (JSONParser, MultiPartParser, FormParser)
+    parser_classes = (StreamingJSONListParser, MultiPartParser, FormParser)
     serializer_class = PredictionSerializer
     queryset = Project.objects.all()
+    stream_json_list = False
 
     def create(self, request, *args, **kwargs):
         # check project permissions
@@ -498,6 +513,8 @@ class ImportPredictionsAPI(generics.CreateAPIView):
 
         # Use feature flag to control memory-efficient implementation rollout
         if flag_set('fflag_fix_back_4620_memory_efficient_predictions_import_08012025_short', user=self.request.user):
+            # JSON body is parsed item by item while predictions are processed
+            self.stream_json_list = True
             return self._create_memory_efficient(project)
         else:
             return self._create_legacy(project)
@@ -508,20 +525,37 @@ class ImportPredictionsAPI(generics.CreateAPIView):
         # Use smaller batch size for processing to avoid memory issues
         PROCESSING_BATCH_SIZE = getattr(settings, 'PREDICTION_IMPORT_BATCH_SIZE', 500)
 
-        request_data = self.request.data
-        total_predictions = len(request_data)
-
         logger.debug(
-            f'Importing {total_predictions} predictions to project {project} using memory-efficient batch processing (batch size: {PROCESSING_BATCH_SIZE})'
+            f'Importing predictions to project {project} using memory-efficient streaming batch processing '
+            f'(batch size: {PROCESSING_BATCH_SIZE})'
         )
 
-        total_created = 0
         all_task_ids = set()
+        try:
+            total_created = self._create_batches(project, PROCESSING_BATCH_SIZE, all_task_ids)
+        finally:
+            # Batches are committed one by one, so counters are updated for all affected tasks
+            # even if a later batch fails to parse or validate
+            if all_task_ids:
+                start_job_async_or_sync(update_tasks_counters, Task.objects.filter(id__in=all_task_ids))
+
+        return Response({'created': total_created}, status=status.HTTP_201_CREATED)
 
-        # Process predictions in smaller batches to avoid memory issues
-        for batch_start in range(0, total_predictions, PROCESSING_BATCH_SIZE):
-            batch_end = min(batch_start + PROCESSING_BATCH_SIZE, total_predictions)
-            batch_items = request_data[batch_start:batch_end]
+    def _create_batches(self, project, batch_size, all_task_ids):
+        """Create predictions in batches as they are parsed from the request body,
+        ids of tasks with created predictions are added to all_task_ids
+
+        Returns:
+            Number of created predictions
+        """
+        total_created = 0
+        batch_start = 0
+
+        for batch_items in batched_iterator(self.request.data, batch_size):
+            batch_end = batch_start + len(batch_items)
+
+            if not all(isinstance(item, dict) for item in batch_items):
+                raise ValidationError('Predictions must be a list of dicts')
 
             # Extract task IDs for this batch
             batch_task_ids = [item.get('task') for item in batch_items]
@@ -551,23 +585,21 @@ class ImportPredictionsAPI(generics.CreateAPIView):
                         model_version=item.get('model_version', 'undefined'),
                     )
                 )
-                all_task_ids.add(task_id)
 
             # Bulk create this batch with the configured batch size
             batch_created = Prediction.objects.bulk_create(batch_predictions, batch_size=settings.BATCH_SIZE)
+            # bulk_create skips Prediction.save(), so project counters are incremented here
+            ProjectCounters.apply_delta(project.id, total_predictions_number=len(batch_created))
+            all_task_ids.update(prediction.task_id for prediction in batch_created)
             total_created += len(batch_created)
 
             logger.debug(
                 f'Processed batch {batch_start}-{batch_end-1}: created {len(batch_created)} predictions '
                 f'(total so far: {total_created})'
             )
+            batch_start = batch_end
 
-        # Update task counters for all affected tasks
-        # Only pass the unique task IDs that were actually processed
-        if all_task_ids:
-            start_job_async_or_sync(update_tasks_counters, Task.objects.filter(id__in=all_task_ids))
-
-        return Response({'created': total_created}, status=status.HTTP_201_CREATED)
+        return total_created
 
     def _create_legacy(self, project):
         """Legacy implementation - kept for safe rollback"""
@@ -636,6 +668,7 @@ class ImportPredictionsAPI(generics.CreateAPIView):
                 logger.error(f'Prediction validation failed ({len(validation_errors)} errors):\n{validation_errors}')
 
         predictions_obj = Prediction.objects.bulk_create(predictions, batch_size=settings.BATCH_SIZE)
+        ProjectCounters.apply_delta(project.id, total_predictions_number=len(predictions_obj))
         start_job_async_or_sync(update_tasks_counters, Task.objects.filter(id__in=tasks_ids))
         return Response({'created': len(predictions_obj)}, status=status.HTTP_201_CREATED)
 
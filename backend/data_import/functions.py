@@ -8,6 +8,7 @@ from core.utils.common import load_func
 from data_import.uploader import load_tasks_for_async_import_streaming
 from django.conf import settings
 from django.db import transaction
+from django.utils import timezone
 from label_studio_sdk.label_interface import LabelInterface
 from projects.models import ProjectImport, ProjectReimport, ProjectSummary
 from rest_framework.exceptions import ValidationError
@@ -101,7 +102,11 @@ def async_import_background(
             summary = ProjectSummary.objects.select_for_update().get(project=project)
 
             # Immediately create project tasks and update project states and counters
-            serializer = ImportApiSerializer(data=tasks, many=True, context={'project': project})
+            serializer = ImportApiSerializer(
+                data=tasks,
+                many=True,
+                context={'project': project, 'skip_duplicates': project_import.skip_duplicates},
+            )
             serializer.is_valid(raise_exception=True)
 
             try:
@@ -293,9 +298,8 @@ def _async_reimport_background_streaming(reimport, project, organization_id, use
         all_data_columns = set()
         all_created_task_ids = []
 
-        # Remove old tasks once before starting
-        with transaction.atomic():
-            project.remove_tasks_by_file_uploads(reimport.file_upload_ids)
+        # Remove old tasks once before starting, tasks are removed in short separate transactions per chunk
+        project.remove_tasks_by_file_uploads(reimport.file_upload_ids)
 
         # Process tasks in batches
         batch_number = 0
@@ -398,6 +402,43 @@ def _async_reimport_background_streaming(reimport, project, organization_id, use
         raise
 
 
+def _finalize_import_batch(project, user, task_ids):
+    """Update counters and emit webhooks for tasks of one committed import batch.
+    Ids are monotonic within a batch, so the tasks are selected by id range instead of a long IN list.
+    """
+    from tasks.functions import update_tasks_counters
+
+    tasks = Task.objects.filter(project=project, id__gte=min(task_ids), id__lte=max(task_ids))
+    update_tasks_counters(tasks)
+    emit_webhooks_for_instance(user.active_organization, project, WebhookAction.TASKS_CREATED, task_ids)
+
+
+def _update_import_progress(
+    project_import, processed_task_count, batch_count, duration, task_count, annotation_count, prediction_count
+):
+    """Store live progress of the streaming import, ProjectImportAPI returns it while the import is running"""
+    project_import.processed_task_count = processed_task_count
+    project_import.processed_batch_count = batch_count
+    project_import.tasks_per_second = processed_task_count / duration if duration > 0 else 0
+    project_import.task_count = task_count
+    project_import.annotation_count = annotation_count
+    project_import.prediction_count = prediction_count
+    project_import.duration = duration
+    project_import.updated_at = timezone.now()
+    project_import.save(
+        update_fields=[
+            'processed_task_count',
+            'processed_batch_count',
+            'tasks_per_second',
+            'task_count',
+            'annotation_count',
+            'prediction_count',
+            'duration',
+            'updated_at',
+        ]
+    )
+
+
 def _async_import_background_streaming(project_import, user):
     try:
         batch_size = settings.IMPORT_BATCH_SIZE
@@ -405,7 +446,10 @@ def _async_import_background_streaming(project_import, user):
         total_task_count = 0
         total_annotation_count = 0
         total_prediction_count = 0
+        processed_task_count = 0
+        # task ids are kept only when they have to be returned, finalization is done per batch
         all_created_task_ids = []
+        has_created_tasks = False
 
         project = project_import.project
         start = time.time()
@@ -483,11 +527,21 @@ def _async_import_background_streaming(project_import, user):
                 with transaction.atomic():
                     summary = ProjectSummary.objects.select_for_update().get(project=project)
 
-                    serializer = ImportApiSerializer(data=batch_tasks, many=True, context={'project': project})
+                    serializer = ImportApiSerializer(
+                        data=batch_tasks,
+                        many=True,
+                        context={
+                            'project': project,
+                            'skip_duplicates': project_import.skip_duplicates,
+                            'fast_validation': settings.IMPORT_FAST_VALIDATION,
+                        },
+                    )
                     serializer.is_valid(raise_exception=True)
                     batch_db_tasks = serializer.save(project_id=project.id)
 
-                    all_created_task_ids.extend([t.id for t in batch_db_tasks])
+                    batch_task_ids = [t.id for t in batch_db_tasks]
+                    if project_import.return_task_ids:
+                        all_created_task_ids.extend(batch_task_ids)
 
                     batch_task_count = len(batch_db_tasks)
                     batch_annotation_count = len(serializer.db_annotations)
@@ -499,21 +553,29 @@ def _async_import_background_streaming(project_import, user):
 
                     summary.update_data_columns(batch_db_tasks)
 
+                if batch_task_ids:
+                    has_created_tasks = True
+                    _finalize_import_batch(project, user, batch_task_ids)
+
             else:
                 total_task_count += len(batch_tasks)
 
+            processed_task_count += len(batch_tasks)
+            _update_import_progress(
+                project_import,
+                processed_task_count,
+                batch_number,
+                time.time() - start,
+                total_task_count,
+                total_annotation_count,
+                total_prediction_count,
+            )
             logger.info(f'Batch {batch_number} processed successfully: {len(batch_tasks)} tasks')
 
         final_data_columns = list(final_data_columns)
 
-        if project_import.commit_to_project and all_created_task_ids:
-            logger.info(
-                f'Finalizing import: emitting webhooks and updating task states for {len(all_created_task_ids)} tasks'
-            )
-
-            emit_webhooks_for_instance(
-                user.active_organization, project, WebhookAction.TASKS_CREATED, all_created_task_ids
-            )
+        if project_import.commit_to_project and has_created_tasks:
+            logger.info(f'Finalizing import: updating task states for {total_task_count} tasks')
 
             recalculate_stats_counts = {
                 'task_count': total_task_count,
@@ -521,9 +583,9 @@ def _async_import_background_streaming(project_import, user):
                 'prediction_count': total_prediction_count,
             }
 
-            all_tasks_queryset = Task.objects.filter(id__in=all_created_task_ids)
+            # task counters were updated per batch, only project wide states and stats are left
             project.update_tasks_counters_and_task_states(
-                tasks_queryset=all_tasks_queryset,
+                tasks_queryset=[],
                 maximum_annotations_changed=False,
                 overlap_cohort_percentage_changed=False,
                 tasks_number_changed=True,
@@ -146,6 +146,101 @@ class FileUpload(models.Model):
         tasks = [{'data': {settings.DATA_UNDEFINED_NAME: line}} for line in lines]
         return tasks
 
+    def _read_tasks_list_from_csv_streaming(self, separator, batch_size=100):
+        """
+        Read tasks from a delimited file in chunks of batch_size rows.
+
+        Column types are inferred per chunk, so only batch_size rows are kept in memory.
+
+        Yields:
+            list: Batch of tasks in the format [{'data': {...}}, ...]
+        """
+        with self.file.open('rb') as file_handle:
+            for chunk in pd.read_csv(file_handle, sep=separator, chunksize=batch_size):
+                # a header-only file produces one empty chunk
+                if not chunk.empty:
+                    yield [{'data': task} for task in chunk.fillna('').to_dict('records')]
+
+    def read_tasks_list_from_csv_streaming(self, batch_size=100):
+        """Streaming version of read_tasks_list_from_csv with the same separator detection"""
+        logger.debug('Read tasks list from CSV file streaming {}'.format(self.filepath))
+        separator = self._detect_csv_separator()
+        yield from self._read_tasks_list_from_csv_streaming(separator, batch_size)
+
+    def read_tasks_list_from_tsv_streaming(self, batch_size=100):
+        """Streaming version of read_tasks_list_from_tsv"""
+        logger.debug('Read tasks list from TSV file streaming {}'.format(self.filepath))
+        yield from self._read_tasks_list_from_csv_streaming('\t', batch_size)
+
+    def _iterate_lines(self):
+        """Iterate over decoded file lines without reading the whole file, lines are split as by str.splitlines()"""
+        with self.file.open('rb') as file_handle:
+            # File.__iter__ reads the file in chunks and splits it by \n, \r and \r\n
+            for raw_line in file_handle:
+                if isinstance(raw_line, bytes):
+                    raw_line = raw_line.decode('utf-8')
+                yield from raw_line.splitlines()
+
+    def read_tasks_list_from_txt_streaming(self, batch_size=100):
+        """Streaming version of read_tasks_list_from_txt"""
+        logger.debug('Read tasks list from text file streaming {}'.format(self.filepath))
+        batch = []
+        for line in self._iterate_lines():
+            batch.append({'data': {settings.DATA_UNDEFINED_NAME: line}})
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def read_tasks_list_from_jsonl_streaming(self, batch_size=100):
+        """Read tasks from a JSON Lines file: one task per line, empty lines are skipped"""
+        logger.debug('Read tasks list from JSONL file streaming {}'.format(self.filepath))
+        batch = []
+        for line_number, line in enumerate(self._iterate_lines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                task = json.loads(line)
+            except ValueError as exc:
+                raise ValidationError(f'Invalid JSON at line {line_number}: {str(exc)}')
+            batch.append(self._format_task_for_json_streaming(task))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def read_tasks_list_from_jsonl(self):
+        return [task for batch in self.read_tasks_list_from_jsonl_streaming() for task in batch]
+
+    def read_tasks_list_from_parquet_streaming(self, batch_size=100):
+        """Read tasks from a Parquet file, row groups are loaded lazily by batch_size rows"""
+        import pyarrow.parquet as pq
+
+        logger.debug('Read tasks list from Parquet file streaming {}'.format(self.filepath))
+        with self.file.open('rb') as file_handle:
+            parquet_file = pq.ParquetFile(file_handle)
+            for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+                yield _tasks_from_record_batch(record_batch, self.project)
+
+    def read_tasks_list_from_arrow_streaming(self, batch_size=100):
+        """Read tasks from an Arrow IPC file (or stream), record batches are loaded lazily"""
+        import pyarrow as pa
+
+        logger.debug('Read tasks list from Arrow file streaming {}'.format(self.filepath))
+        with self.file.open('rb') as file_handle:
+            try:
+                reader = pa.ipc.open_file(file_handle)
+                record_batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+            except pa.ArrowInvalid:
+                file_handle.seek(0)
+                record_batches = pa.ipc.open_stream(file_handle)
+
+            for record_batch in record_batches:
+                for offset in range(0, record_batch.num_rows, batch_size):
+                    yield _tasks_from_record_batch(record_batch.slice(offset, batch_size), self.project)
+
     def read_tasks_list_from_json(self):
         logger.debug('Read tasks list from JSON file {}'.format(self.filepath))
 
@@ -260,6 +355,12 @@ class FileUpload(models.Model):
                 tasks = self.read_tasks_list_from_txt()
             elif file_format == '.json':
                 tasks = self.read_tasks_list_from_json()
+            elif file_format == '.jsonl':
+                tasks = self.read_tasks_list_from_jsonl()
+            elif file_format == '.parquet':
+                tasks = [task for batch in self.read_tasks_list_from_parquet_streaming() for task in batch]
+            elif file_format == '.arrow':
+                tasks = [task for batch in self.read_tasks_list_from_arrow_streaming() for task in batch]
 
             # otherwise - only one object tag should be presented in label config
             elif not self.project.one_object_in_label_config:
@@ -283,21 +384,25 @@ class FileUpload(models.Model):
         file_format = self.format
 
         try:
-            # For JSON files, use streaming JSON parser
+            # For tasks lists, read the file chunk by chunk
             if file_format == '.json':
-                for batch in self.read_tasks_list_from_json_streaming(batch_size):
-                    yield batch
+                yield from self.read_tasks_list_from_json_streaming(batch_size)
+            elif file_format == '.jsonl':
+                yield from self.read_tasks_list_from_jsonl_streaming(batch_size)
+            elif file_format == '.parquet':
+                yield from self.read_tasks_list_from_parquet_streaming(batch_size)
+            elif file_format == '.arrow':
+                yield from self.read_tasks_list_from_arrow_streaming(batch_size)
+            elif file_format == '.csv' and file_as_tasks_list:
+                yield from self.read_tasks_list_from_csv_streaming(batch_size)
+            elif file_format == '.tsv' and file_as_tasks_list:
+                yield from self.read_tasks_list_from_tsv_streaming(batch_size)
+            elif file_format == '.txt' and file_as_tasks_list:
+                yield from self.read_tasks_list_from_txt_streaming(batch_size)
 
-            # For other file types, use existing methods but yield in batches
+            # Single asset files produce one task
             else:
-                # Use existing non-streaming methods for non-JSON files
-                if file_format == '.csv' and file_as_tasks_list:
-                    tasks = self.read_tasks_list_from_csv()
-                elif file_format == '.tsv' and file_as_tasks_list:
-                    tasks = self.read_tasks_list_from_tsv()
-                elif file_format == '.txt' and file_as_tasks_list:
-                    tasks = self.read_tasks_list_from_txt()
-                elif not self.project.one_object_in_label_config:
+                if not self.project.one_object_in_label_config:
                     raise ValidationError(
                         'Your label config has more than one data key and direct file upload supports only '
                         'one data key. To import data with multiple data keys, use a JSON or CSV file.'
@@ -306,11 +411,7 @@ class FileUpload(models.Model):
                     tasks = self.read_task_from_hypertext_body()
                 else:
                     tasks = self.read_task_from_uploaded_file()
-
-                # Yield tasks in batches
-                for i in range(0, len(tasks), batch_size):
-                    batch = tasks[i : i + batch_size]
-                    yield batch
+                yield tasks
 
         except Exception as exc:
             raise ValidationError('Failed to parse input file ' + self.file_name + ': ' + str(exc))
@@ -419,6 +520,160 @@ class FileUpload(models.Model):
             yield [], dict(Counter(fileformats)), common_data_fields
 
 
+def _json_compatible_arrow_type(arrow_type):
+    """Arrow type with temporal, decimal and binary values replaced by strings, so rows can be stored as JSON"""
+    import pyarrow as pa
+
+    if (
+        pa.types.is_timestamp(arrow_type)
+        or pa.types.is_date(arrow_type)
+        or pa.types.is_time(arrow_type)
+        or pa.types.is_decimal(arrow_type)
+        or pa.types.is_binary(arrow_type)
+        or pa.types.is_large_binary(arrow_type)
+    ):
+        return pa.string()
+    if pa.types.is_struct(arrow_type):
+        return pa.struct([field.with_type(_json_compatible_arrow_type(field.type)) for field in arrow_type])
+    if pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type):
+        return pa.list_(_json_compatible_arrow_type(arrow_type.value_type))
+    return arrow_type
+
+
+def _arrow_python_types(arrow_type):
+    """Python types of non-null values of an Arrow column after to_pylist(), None if they are not known"""
+    import pyarrow as pa
+
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return (str,)
+    if pa.types.is_boolean(arrow_type):
+        return (bool,)
+    if pa.types.is_integer(arrow_type):
+        return (int,)
+    if pa.types.is_floating(arrow_type):
+        return (float,)
+    if pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type):
+        return (list,)
+    if pa.types.is_struct(arrow_type):
+        return (dict,)
+    if pa.types.is_null(arrow_type):
+        return ()
+    return None
+
+
+def _is_list_of_results(column, result_is_list):
+    """Check that a column has lists of dicts with "result", as TaskValidator expects of annotations and predictions"""
+    import pyarrow as pa
+
+    if column.null_count or not (pa.types.is_list(column.type) or pa.types.is_large_list(column.type)):
+        return False
+    items = column.flatten()
+    if items.null_count or not pa.types.is_struct(items.type):
+        return False
+    result_index = items.type.get_field_index('result')
+    if result_index == -1:
+        return False
+    if not result_is_list:
+        return True
+    result = items.flatten()[result_index]
+    return not result.null_count and (pa.types.is_list(result.type) or pa.types.is_large_list(result.type))
+
+
+def _is_valid_record_batch(project, columns, data_columns, is_task_root):
+    """
+    Check a record batch once against the rules TaskValidator applies to every task.
+
+    Arrow columns have one type for all rows, so the checks of data keys required by the label config
+    and of annotations, predictions and meta are done on the schema and null counts.
+    Returns False when the batch has to be validated task by task, e.g. to report errors per item.
+    """
+    import pyarrow as pa
+    from tasks.validation import TaskValidator
+
+    # $undefined$ key is replaced with the label config field per task
+    if settings.DATA_UNDEFINED_NAME in data_columns:
+        return False
+
+    for data_key, data_type in project.data_types.items():
+        is_array = '[' in data_key
+        keys = data_key.split('[')[0].split('.')
+        column = data_columns.get(keys[0])
+        for key in keys[1:]:
+            if column is None or not pa.types.is_struct(column.type) or column.null_count:
+                return False
+            field_index = column.type.get_field_index(key)
+            column = column.flatten()[field_index] if field_index != -1 else None
+        if column is None:
+            return False
+
+        python_types = _arrow_python_types(column.type)
+        if python_types is None:
+            return False
+        if column.null_count:
+            # top level nulls are replaced with '', nested ones are kept as None
+            python_types += (str,) if len(keys) == 1 else (type(None),)
+        expected_types = TaskValidator.get_expected_types(data_type, is_array)
+        if not all(issubclass(python_type, expected_types) for python_type in python_types):
+            return False
+
+    if is_task_root:
+        if 'annotations' in columns and not _is_list_of_results(columns['annotations'], result_is_list=True):
+            return False
+        if 'predictions' in columns and not _is_list_of_results(columns['predictions'], result_is_list=False):
+            return False
+        meta = columns.get('meta')
+        if meta is not None and (
+            meta.null_count or not (pa.types.is_struct(meta.type) or pa.types.is_list(meta.type))
+        ):
+            return False
+
+    return True
+
+
+def _tasks_from_record_batch(record_batch, project=None):
+    """
+    Convert an Arrow record batch to tasks.
+
+    Columns are checked and converted once per batch in a vectorized way instead of once per task.
+    A struct column "data" means that rows are complete tasks (data, annotations, predictions, ...),
+    otherwise each row is task data as in CSV import. Nulls in task data columns are replaced with ''
+    as in CSV import. When the project is passed and the batch passes _is_valid_record_batch(),
+    tasks are returned as ValidatedTask and aren't validated again task by task.
+    """
+    import pyarrow as pa
+    from tasks.validation import ValidatedTask
+
+    schema = record_batch.schema
+    target_types = [_json_compatible_arrow_type(field.type) for field in schema]
+    if target_types != schema.types:
+        columns = [column.cast(target_type) for column, target_type in zip(record_batch.columns, target_types)]
+        record_batch = pa.RecordBatch.from_arrays(columns, names=schema.names)
+
+    columns = dict(zip(schema.names, record_batch.columns))
+    data_column = columns.get('data')
+    is_task_root = data_column is not None and pa.types.is_struct(data_column.type)
+    if is_task_root:
+        if data_column.null_count:
+            raise ValidationError('Task item should be dict')
+        data_columns = dict(zip([field.name for field in data_column.type], data_column.flatten()))
+        tasks = record_batch.to_pylist()
+        rows = [task['data'] for task in tasks]
+    else:
+        data_columns = columns
+        rows = record_batch.to_pylist()
+        tasks = [{'data': row} for row in rows]
+
+    null_names = [name for name, column in data_columns.items() if column.null_count]
+    for row in rows:
+        for name in null_names:
+            if row[name] is None:
+                row[name] = ''
+
+    if project is not None and _is_valid_record_batch(project, columns, data_columns, is_task_root):
+        return [ValidatedTask(task) for task in tasks]
+    return tasks
+
+
 def _old_vs_new_data_keys_inconsistency_message(new_data_keys, old_data_keys, current_file):
     new_data_keys_list = ','.join(new_data_keys)
     old_data_keys_list = ','.join(old_data_keys)
@@ -0,0 +1,35 @@
+"""This file and its contents are licensed under the Apache License 2.0. Please see the included NOTICE for copyright information and LICENSE for a copy of the license.
+"""
+import itertools
+
+import ijson
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
+
+
+class StreamingJSONListParser(JSONParser):
+    """JSON parser for views processing big request bodies in batches.
+
+    For views with stream_json_list = True, request.data is a lazy iterator over items
+    of the top-level JSON list parsed incrementally from the request stream, so the whole body
+    is never loaded into memory. For other views the body is parsed as by JSONParser.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        view = (parser_context or {}).get('view')
+        if not getattr(view, 'stream_json_list', False):
+            return super().parse(stream, media_type, parser_context)
+        return self._iterate_list_items(stream)
+
+    @staticmethod
+    def _iterate_list_items(stream):
+        try:
+            events = ijson.parse(stream, use_float=True)
+            first_event = next(events, None)
+            if first_event is None:
+                return
+            if first_event[1] != 'start_array':
+                raise ValidationError('Request body must be a JSON list')
+            yield from ijson.items(itertools.chain([first_event], events), 'item')
+        except ijson.JSONError as exc:
+            raise ValidationError(f'Failed to parse JSON: {str(exc)}')
@@ -16,7 +16,7 @@ class ImportApiSerializer(TaskSerializer):
     class Meta:
         model = Task
         list_serializer_class = TaskSerializerBulk
-        exclude = ('is_labeled', 'project')
+        exclude = ('is_labeled', 'project', 'data_hash')
 
 
 class FileUploadSerializer(serializers.ModelSerializer):
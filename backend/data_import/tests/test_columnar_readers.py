@@ -0,0 +1,130 @@
+import io
+from unittest.mock import patch
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from data_import.models import FileUpload
+from data_import.serializers import ImportApiSerializer
+from django.core.files.uploadedfile import SimpleUploadedFile
+from projects.tests.factories import ProjectFactory
+from tasks.validation import TaskValidator, ValidatedTask
+
+pytestmark = pytest.mark.django_db
+
+LABEL_CONFIG = """
+<View>
+  <Text name="text" value="$text"/>
+  <Choices name="label" toName="text">
+    <Choice value="pos"/>
+    <Choice value="neg"/>
+  </Choices>
+</View>
+"""
+
+
+def make_file_upload(name, content):
+    project = ProjectFactory(label_config=LABEL_CONFIG)
+    return FileUpload.objects.create(user=project.created_by, project=project, file=SimpleUploadedFile(name, content))
+
+
+def parquet_bytes(table, row_group_size):
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, row_group_size=row_group_size)
+    return buffer.getvalue()
+
+
+def arrow_bytes(table, stream=False):
+    sink = pa.BufferOutputStream()
+    new_writer = pa.ipc.new_stream if stream else pa.ipc.new_file
+    with new_writer(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def make_flat_table():
+    return pa.table(
+        {
+            'text': ['a', None, 'c'],
+            'score': [1, None, 3],
+            'tags': [['x', 'y'], [], None],
+            'info': [{'size': 1, 'label': None}, None, {'size': 3, 'label': 'z'}],
+        }
+    )
+
+
+FLAT_TASKS = [
+    {'data': {'text': 'a', 'score': 1, 'tags': ['x', 'y'], 'info': {'size': 1, 'label': None}}},
+    {'data': {'text': '', 'score': '', 'tags': [], 'info': ''}},
+    {'data': {'text': 'c', 'score': 3, 'tags': '', 'info': {'size': 3, 'label': 'z'}}},
+]
+
+
+@pytest.mark.parametrize(
+    'name, content',
+    [
+        ('tasks.parquet', parquet_bytes(make_flat_table(), row_group_size=2)),
+        ('tasks.arrow', arrow_bytes(make_flat_table())),
+        ('tasks.arrow', arrow_bytes(make_flat_table(), stream=True)),
+    ],
+)
+def test_columnar_streaming_nested_columns_and_nulls(name, content):
+    """Parquet and Arrow rows become task data with nested values kept and nulls replaced as in CSV import"""
+    file_upload = make_file_upload(name, content)
+
+    batches = list(file_upload.read_tasks_streaming(batch_size=2))
+
+    assert batches == [FLAT_TASKS[:2], FLAT_TASKS[2:]]
+    assert all(isinstance(task, ValidatedTask) for batch in batches for task in batch)
+
+
+def test_parquet_streaming_task_root_is_validated_per_batch():
+    """Rows with a struct "data" column are full tasks validated once per row group"""
+    table = pa.Table.from_pylist(
+        [
+            {
+                'data': {'text': f'text {i}', 'meta': {'index': i}},
+                'annotations': [{'result': []}],
+                'predictions': [{'result': [], 'score': 0.5}],
+            }
+            for i in range(3)
+        ]
+    )
+    file_upload = make_file_upload('tasks.parquet', parquet_bytes(table, row_group_size=2))
+
+    batches = list(file_upload.read_tasks_streaming(batch_size=2))
+    tasks = [task for batch in batches for task in batch]
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert tasks[2] == {
+        'data': {'text': 'text 2', 'meta': {'index': 2}},
+        'annotations': [{'result': []}],
+        'predictions': [{'result': [], 'score': 0.5}],
+    }
+    assert all(isinstance(task, ValidatedTask) for task in tasks)
+
+    serializer = ImportApiSerializer(data=tasks, many=True, context={'project': file_upload.project})
+    with patch.object(TaskValidator, 'validate', autospec=True, side_effect=TaskValidator.validate) as validate:
+        assert serializer.is_valid(), serializer.errors
+    assert validate.call_count == 0
+
+
+@pytest.mark.parametrize(
+    'table',
+    [
+        pa.table({'other': ['a', 'b']}),
+        pa.table({'text': [{'value': 1}, {'value': 2}]}),
+        pa.Table.from_pylist([{'data': {'text': 'a'}, 'annotations': [{'lead_time': 1.0}]}] * 2),
+    ],
+)
+def test_parquet_streaming_invalid_batch_is_validated_per_task(table):
+    """Batches that fail the per-batch check are validated task by task to report errors per item"""
+    file_upload = make_file_upload('tasks.parquet', parquet_bytes(table, row_group_size=2))
+
+    tasks = [task for batch in file_upload.read_tasks_streaming(batch_size=2) for task in batch]
+    assert len(tasks) == 2
+    assert not any(isinstance(task, ValidatedTask) for task in tasks)
+
+    serializer = ImportApiSerializer(data=tasks, many=True, context={'project': file_upload.project})
+    assert not serializer.is_valid()
+    assert len(serializer.errors) == 2
@@ -0,0 +1,116 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from projects.models import Project, ProjectCounters
+from projects.tests.factories import ProjectFactory
+from rest_framework.test import APIClient
+from tasks.models import Prediction, Task
+from tasks.tests.factories import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def memory_efficient_flag(enabled):
+    def flag_set(name, *args, **kwargs):
+        return enabled and name.startswith('fflag_fix_back_4620_memory_efficient_predictions_import')
+
+    return patch('data_import.api.flag_set', side_effect=flag_set)
+
+
+def setup_import(settings):
+    settings.PREDICTION_IMPORT_BATCH_SIZE = 2
+    project = ProjectFactory()
+    tasks = [TaskFactory(project=project) for _ in range(3)]
+    client = APIClient()
+    client.force_authenticate(user=project.created_by)
+    url = reverse('data_import:api-projects:project-import-predictions', kwargs={'pk': project.id})
+    predictions = [{'task': task.id, 'result': [], 'score': 0.5, 'model_version': 'v1'} for task in tasks]
+    return client, url, tasks, predictions
+
+
+def total_predictions(tasks):
+    tasks = Task.objects.filter(id__in=[task.id for task in tasks]).order_by('id')
+    return list(tasks.values_list('total_predictions', flat=True))
+
+
+def test_import_predictions_streamed_list(settings):
+    """Predictions from a JSON list are created in batches and task counters are updated"""
+    client, url, tasks, predictions = setup_import(settings)
+
+    with memory_efficient_flag(True):
+        response = client.post(url, data=json.dumps(predictions), content_type='application/json')
+
+    assert response.status_code == 201, response.content
+    assert response.json() == {'created': 3}
+    assert Prediction.objects.filter(task__in=tasks, model_version='v1').count() == 3
+    assert total_predictions(tasks) == [1, 1, 1]
+
+
+def test_import_predictions_legacy_parses_whole_body(settings):
+    """Without the memory-efficient flag the JSON body is parsed at once as by JSONParser"""
+    client, url, tasks, predictions = setup_import(settings)
+
+    with memory_efficient_flag(False), patch('data_import.api.logger') as logger:
+        response = client.post(url, data=json.dumps(predictions), content_type='application/json')
+
+    assert response.status_code == 201, response.content
+    assert response.json()['created'] == Prediction.objects.filter(task__in=tasks).count()
+    assert 'Importing 3 predictions' in logger.debug.call_args_list[0].args[0]
+
+
+def test_import_predictions_not_a_list(settings):
+    """A top-level JSON value that is not a list is rejected"""
+    client, url, tasks, predictions = setup_import(settings)
+
+    with memory_efficient_flag(True):
+        response = client.post(url, data=json.dumps(predictions[0]), content_type='application/json')
+
+    assert response.status_code == 400
+    assert 'must be a JSON list' in str(response.content)
+    assert not Prediction.objects.filter(task__in=tasks).exists()
+
+
+def test_import_predictions_truncated_json_updates_counters(settings):
+    """Predictions of batches committed before a parse error are counted in task counters"""
+    client, url, tasks, predictions = setup_import(settings)
+    body = json.dumps(predictions)
+    body = body[: body.rindex('{') + 5]
+
+    with memory_efficient_flag(True):
+        response = client.post(url, data=body, content_type='application/json')
+
+    assert response.status_code == 400
+    assert 'Failed to parse JSON' in str(response.content)
+    assert Prediction.objects.filter(task__in=tasks).count() == 2
+    assert total_predictions(tasks) == [1, 1, 0]
+
+
+def test_import_predictions_form_data(settings):
+    """Form data bodies are parsed by DRF form parsers and rejected as they are not a list of predictions"""
+    client, url, tasks, predictions = setup_import(settings)
+
+    with memory_efficient_flag(True):
+        response = client.post(url, data={'task': tasks[0].id, 'score': 0.5}, format='multipart')
+
+    assert response.status_code == 400
+    assert 'must be a list of dicts' in str(response.content)
+    assert not Prediction.objects.filter(task__in=tasks).exists()
+
+
+@pytest.mark.parametrize('memory_efficient', [True, False])
+def test_import_predictions_updates_project_counters(settings, memory_efficient):
+    """Materialized project counters include bulk created predictions"""
+    client, url, tasks, predictions = setup_import(settings)
+    project = tasks[0].project
+    ProjectCounters.reconcile([project.id])
+
+    with memory_efficient_flag(memory_efficient):
+        response = client.post(url, data=json.dumps(predictions), content_type='application/json')
+
+    assert response.status_code == 201, response.content
+    assert ProjectCounters.objects.get(project=project).total_predictions_number == 3
+    counts = Project.objects.with_counts().get(id=project.id).get_counters()
+    assert counts['total_predictions_number'] == 3
+    assert counts == Project.objects.with_counts(materialized=False).get(id=project.id).get_counters()
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import pytest
+from data_import.functions import _async_import_background_streaming
+from projects.models import ProjectImport
+from projects.tests.factories import ProjectFactory
+from tasks.models import Task
+from webhooks.models import WebhookAction
+
+pytestmark = pytest.mark.django_db
+
+BATCHES = [
+    [{'data': {'text': 'a'}, 'annotations': [{'result': []}]}, {'data': {'text': 'b'}}],
+    [{'data': {'text': 'c'}, 'annotations': [{'result': []}, {'result': []}]}],
+]
+
+
+def run_streaming_import(return_task_ids):
+    project = ProjectFactory()
+    # AutoOneToOneField creates the summary on first access
+    project.summary
+    project_import = ProjectImport.objects.create(
+        project=project, commit_to_project=True, return_task_ids=return_task_ids
+    )
+    batches = [(batch, [], {'.json': 1}, {'text'}) for batch in BATCHES]
+
+    with patch('data_import.functions.load_tasks_for_async_import_streaming', return_value=iter(batches)), patch(
+        'data_import.functions.emit_webhooks_for_instance'
+    ) as emit_webhooks:
+        _async_import_background_streaming(project_import, project.created_by)
+
+    project_import.refresh_from_db()
+    return project, project_import, emit_webhooks
+
+
+@pytest.mark.parametrize('return_task_ids', [True, False])
+def test_streaming_import_finalizes_every_batch(return_task_ids):
+    """Streaming import stores progress, emits TASKS_CREATED and updates task counters per batch"""
+    project, project_import, emit_webhooks = run_streaming_import(return_task_ids)
+
+    tasks = list(Task.objects.filter(project=project).order_by('id'))
+    assert [task.data['text'] for task in tasks] == ['a', 'b', 'c']
+    assert [task.total_annotations for task in tasks] == [1, 0, 2]
+
+    assert project_import.status == ProjectImport.Status.COMPLETED
+    assert project_import.task_count == 3
+    assert project_import.annotation_count == 3
+    assert project_import.processed_task_count == 3
+    assert project_import.processed_batch_count == 2
+    assert project_import.tasks_per_second > 0
+    assert project_import.task_ids == ([task.id for task in tasks] if return_task_ids else [])
+
+    webhooks = [call.args for call in emit_webhooks.call_args_list]
+    assert [(args[1], args[2]) for args in webhooks] == [(project, WebhookAction.TASKS_CREATED)] * 2
+    assert [args[3] for args in webhooks] == [[tasks[0].id, tasks[1].id], [tasks[2].id]]
@@ -0,0 +1,86 @@
+import pytest
+from data_import.models import FileUpload
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from projects.tests.factories import ProjectFactory
+from rest_framework.exceptions import ValidationError
+
+pytestmark = pytest.mark.django_db
+
+
+def make_file_upload(name, content):
+    project = ProjectFactory()
+    return FileUpload.objects.create(
+        user=project.created_by, project=project, file=SimpleUploadedFile(name, content.encode('utf-8'))
+    )
+
+
+@pytest.mark.parametrize(
+    'name, content',
+    [
+        ('tasks.csv', 'text,score\n' + ''.join(f'text {i},{i}\n' for i in range(5))),
+        ('tasks.csv', 'text;score\n' + ''.join(f'text {i};{i}\n' for i in range(5))),
+        ('tasks.tsv', 'text\tscore\n' + ''.join(f'text {i}\t{i}\n' for i in range(5))),
+    ],
+)
+def test_csv_tsv_streaming_chunk_boundaries(name, content):
+    """Chunked CSV/TSV readers yield batches of batch_size rows with the same tasks as the full readers"""
+    file_upload = make_file_upload(name, content)
+    expected = file_upload.read_tasks()
+
+    batches = list(file_upload.read_tasks_streaming(batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [task for batch in batches for task in batch] == expected
+    assert batches[0][0] == {'data': {'text': 'text 0', 'score': 0}}
+
+
+@pytest.mark.parametrize('name, content', [('tasks.csv', 'text,score\n'), ('tasks.tsv', 'text\tscore\n')])
+def test_csv_tsv_streaming_header_only(name, content):
+    """A file with a header only produces no tasks"""
+    file_upload = make_file_upload(name, content)
+
+    assert list(file_upload.read_tasks_streaming(batch_size=2)) == []
+
+
+def test_csv_streaming_quoted_multiline_fields():
+    """Quoted fields with line breaks and separators are parsed as one value across chunk boundaries"""
+    file_upload = make_file_upload('tasks.csv', 'text,label\n"line 1\nline 2",a\n"b, c",\nd,e\n')
+
+    batches = list(file_upload.read_tasks_streaming(batch_size=1))
+
+    assert batches == [
+        [{'data': {'text': 'line 1\nline 2', 'label': 'a'}}],
+        [{'data': {'text': 'b, c', 'label': ''}}],
+        [{'data': {'text': 'd', 'label': 'e'}}],
+    ]
+
+
+def test_txt_streaming_chunk_boundaries():
+    """Text file lines are streamed as tasks in batches of batch_size lines"""
+    file_upload = make_file_upload('tasks.txt', 'line 0\nline 1\r\nline 2\nline 3\nline 4\n')
+    expected = file_upload.read_tasks()
+
+    batches = list(file_upload.read_tasks_streaming(batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [task for batch in batches for task in batch] == expected
+    assert batches[0][1] == {'data': {settings.DATA_UNDEFINED_NAME: 'line 1'}}
+
+
+def test_jsonl_streaming_skips_blank_lines():
+    """Blank lines of a JSONL file are skipped and don't shift chunk boundaries or line numbers"""
+    file_upload = make_file_upload(
+        'tasks.jsonl', '{"text": "a"}\n\n   \n{"data": {"text": "b"}, "meta": {"m": 1}}\n{"text": "c"}\n\n'
+    )
+
+    batches = list(file_upload.read_tasks_streaming(batch_size=2))
+
+    assert batches == [
+        [{'data': {'text': 'a'}}, {'data': {'text': 'b'}, 'meta': {'m': 1}}],
+        [{'data': {'text': 'c'}}],
+    ]
+
+    file_upload = make_file_upload('tasks.jsonl', '{"text": "a"}\n\n{"text": \n')
+    with pytest.raises(ValidationError, match='line 3'):
+        list(file_upload.read_tasks_streaming(batch_size=2))
@@ -2,15 +2,23 @@
 """
 import logging
 from datetime import datetime
+from uuid import uuid4
 
+import ujson as json
 from core.feature_flags import flag_set
 from core.permissions import AllPermissions
-from core.redis import start_job_async_or_sync
+from core.redis import (
+    _redis,
+    is_job_cancel_requested,
+    redis_connected,
+    start_job_async_or_sync,
+    update_job_progress,
+)
 from core.utils.common import load_func
 from data_manager.actions import DataManagerAction
 from data_manager.functions import evaluate_predictions
 from django.conf import settings
-from projects.models import Project
+from projects.models import Project, ProjectCounters
 from tasks.functions import update_tasks_counters
 from tasks.models import Annotation, AnnotationDraft, Prediction, Task
 from users.models import User
@@ -20,6 +28,8 @@ from webhooks.utils import emit_webhooks_for_instance
 all_permissions = AllPermissions()
 logger = logging.getLogger(__name__)
 
+DELETE_TASKS_IDS_KEY = 'delete_tasks_ids'
+
 
 def retrieve_tasks_predictions(project, queryset, **kwargs):
     """Retrieve predictions by tasks ids
@@ -34,43 +44,49 @@ def retrieve_tasks_predictions(project, queryset, **kwargs):
 def delete_tasks(project, queryset, **kwargs):
     """Delete tasks by ids
 
+    Tasks are unlinked from the project immediately, so they disappear from all project queries,
+    the real deletion, webhooks and after delete actions are performed in the background by delete_tasks_job()
+
     :param project: project instance
     :param queryset: filtered tasks db queryset
     """
-    tasks_ids = list(queryset.values('id'))
-    count = len(tasks_ids)
-    tasks_ids_list = [task['id'] for task in tasks_ids]
+    tasks_ids_list = list(queryset.order_by('id').values_list('id', flat=True))
+    count = len(tasks_ids_list)
     project_count = project.tasks.count()
     # unlink tasks from project
-    queryset = Task.objects.filter(id__in=tasks_ids_list)
-    queryset.update(project=None)
-    # delete all project tasks
-    if count == project_count:
-        start_job_async_or_sync(Task.delete_tasks_without_signals_from_task_ids, tasks_ids_list)
+    Task.objects.filter(id__in=tasks_ids_list).update(project=None)
+
+    # delete all project tasks: summary can be reset at once instead of per chunk updates
+    reset_summary = count == project_count
+    if reset_summary:
         logger.info(f'calling reset project_id={project.id} delete_tasks()')
         project.summary.reset()
 
-    # delete only specific tasks
-    else:
-        # update project summary and delete tasks
-        start_job_async_or_sync(async_project_summary_recalculation, tasks_ids_list, project.id)
-
-    project.update_tasks_states(
-        maximum_annotations_changed=False, overlap_cohort_percentage_changed=False, tasks_number_changed=True
+    # with redis the ids are passed to the job by a key instead of job arguments
+    tasks_ids_key = None
+    if redis_connected():
+        tasks_ids_key = f'{DELETE_TASKS_IDS_KEY}:{project.id}:{uuid4().hex}'
+        _redis.set(tasks_ids_key, json.dumps(tasks_ids_list), ex=settings.RQ_LONG_JOB_TIMEOUT)
+
+    job = start_job_async_or_sync(
+        delete_tasks_job,
+        project.id,
+        None if tasks_ids_key else tasks_ids_list,
+        reset_summary=reset_summary,
+        tasks_ids_key=tasks_ids_key,
+        job_timeout=settings.RQ_LONG_JOB_TIMEOUT,
+        meta={'project_id': project.id, 'action': 'delete_tasks'},
     )
-    # emit webhooks for project
-    emit_webhooks_for_instance(project.organization, project, WebhookAction.TASKS_DELETED, tasks_ids)
 
-    # remove all tabs if there are no tasks in project
-    reload = False
-    if not project.tasks.exists():
-        project.views.all().delete()
-        reload = True
-
-    # Execute actions after delete tasks
-    Task.after_bulk_delete_actions(tasks_ids_list, project)
-
-    return {'processed_items': count, 'reload': reload, 'detail': 'Deleted ' + str(count) + ' tasks'}
+    response = {'processed_items': count, 'detail': 'Deleted ' + str(count) + ' tasks'}
+    # tabs are removed by the job when there are no tasks left in project, the frontend reloads them then
+    if hasattr(job, 'id'):
+        # job is started in redis, its progress can be checked via actions jobs API
+        response['job_id'] = job.id
+        response['reload'] = reset_summary
+    else:
+        response['reload'] = job['views_deleted']
+    return response
 
 
 def delete_tasks_annotations(project, queryset, **kwargs):
@@ -158,17 +174,90 @@ def delete_tasks_predictions(project, queryset, **kwargs):
         real_task_ids = set(list(predictions.values_list('task_id', flat=True)))
 
     count = predictions.count()
-    predictions.delete()
+    _, deleted_map = predictions.delete()
+    ProjectCounters.apply_delta(project.id, total_predictions_number=-deleted_map.get('tasks.Prediction', 0))
     start_job_async_or_sync(update_tasks_counters, Task.objects.filter(id__in=real_task_ids))
     return {'processed_items': count, 'detail': 'Deleted ' + str(count) + ' predictions'}
 
 
-def async_project_summary_recalculation(tasks_ids_list, project_id):
-    queryset = Task.objects.filter(id__in=tasks_ids_list)
+def delete_tasks_job(project_id, tasks_ids_list=None, reset_summary=False, tasks_ids_key=None, **kwargs):
+    """Delete tasks unlinked from the project in id ordered chunks.
+    Project summary, TASKS_DELETED webhooks and after delete actions are processed per deleted chunk,
+    so the job can be cancelled between chunks: the remaining tasks are returned back to the project in this case.
+
+    :param project_id: project id
+    :param tasks_ids_list: ids of tasks to delete
+    :param reset_summary: project summary has been already reset, skip summary updates
+    :param tasks_ids_key: redis key with ids of tasks to delete, it's used instead of tasks_ids_list
+    """
     project = Project.objects.get(id=project_id)
-    project.summary.remove_created_annotations_and_labels(Annotation.objects.filter(task__in=queryset))
-    project.summary.remove_data_columns(queryset)
-    Task.delete_tasks_without_signals(queryset)
+    if tasks_ids_key:
+        tasks_ids_list = json.loads(_redis.get(tasks_ids_key) or '[]')
+    tasks_ids_list = sorted(tasks_ids_list)
+    total, deleted = len(tasks_ids_list), 0
+    cancelled = False
+
+    for i in range(0, total, settings.BATCH_SIZE):
+        if is_job_cancel_requested():
+            restore_unlinked_tasks(project, tasks_ids_list[i:], reset_summary)
+            cancelled = True
+            break
+
+        chunk_ids = tasks_ids_list[i : i + settings.BATCH_SIZE]
+        chunk = Task.objects.filter(id__in=chunk_ids)
+        if not reset_summary:
+            project.summary.remove_created_annotations_and_labels(
+                Annotation.objects.filter(task__in=chunk).only('id', 'result')
+            )
+            project.summary.remove_data_columns(chunk.only('id', 'data'))
+        Task.delete_tasks_without_signals(chunk)
+
+        emit_webhooks_for_instance(
+            project.organization, project, WebhookAction.TASKS_DELETED, [{'id': task_id} for task_id in chunk_ids]
+        )
+        Task.after_bulk_delete_actions(chunk_ids, project)
+
+        deleted += len(chunk_ids)
+        update_job_progress(deleted, total)
+
+    if tasks_ids_key:
+        _redis.delete(tasks_ids_key)
+
+    if cancelled:
+        # restore_unlinked_tasks() has already updated tasks states
+        update_job_progress(deleted, total, cancelled=True)
+        logger.info(f'Delete tasks job for project {project_id} cancelled: {deleted}/{total} tasks deleted')
+        return {'processed_items': deleted, 'cancelled': True, 'views_deleted': False}
+
+    project.update_tasks_states(
+        maximum_annotations_changed=False, overlap_cohort_percentage_changed=False, tasks_number_changed=True
+    )
+    # remove all tabs if there are no tasks in project
+    views_deleted = not project.tasks.exists()
+    if views_deleted:
+        project.views.all().delete()
+
+    logger.info(f'Delete tasks job for project {project_id} finished: {total} tasks deleted')
+    return {'processed_items': total, 'cancelled': False, 'views_deleted': views_deleted}
+
+
+def restore_unlinked_tasks(project, tasks_ids_list, reset_summary=False):
+    """Return tasks unlinked by delete_tasks() back to the project
+
+    :param project: project instance
+    :param tasks_ids_list: ids of tasks to restore
+    :param reset_summary: project summary was reset, so restored tasks should be added to it again
+    """
+    tasks = Task.objects.filter(id__in=tasks_ids_list)
+    tasks.update(project=project)
+    if reset_summary:
+        project.summary.update_data_columns(tasks.only('id', 'data').iterator(chunk_size=settings.BATCH_SIZE))
+        project.summary.update_created_annotations_and_labels(
+            Annotation.objects.filter(task__in=tasks).only('id', 'result').iterator(chunk_size=settings.BATCH_SIZE)
+        )
+    project.update_tasks_states(
+        maximum_annotations_changed=False, overlap_cohort_percentage_changed=False, tasks_number_changed=True
+    )
 
 
 actions: list[DataManagerAction] = [
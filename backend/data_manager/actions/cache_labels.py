@@ -2,10 +2,12 @@
 """
 
 import logging
+from collections import Counter, defaultdict
 
 from core.permissions import AllPermissions
-from core.redis import start_job_async_or_sync
+from core.redis import start_job_async_or_sync, update_job_progress
 from data_manager.actions import DataManagerAction
+from django.conf import settings
 from label_studio_sdk.label_interface import LabelInterface
 from tasks.models import Annotation, Prediction, Task
 
@@ -35,30 +37,44 @@ def cache_labels_job(project, queryset, **kwargs):
     else:
         column_name = f'{column_name}_{control_tag}'
 
-    tasks = list(queryset.only('data'))
-    logger.info(f'Cache labels for {len(tasks)} tasks and control tag {control_tag}')
-
-    for task in tasks:
-        task_labels = []
-        annotations = source_class.objects.filter(task=task).only('result')
-        for annotation in annotations:
-            labels = extract_labels(annotation, control_tag, label_interface_tags)
-            task_labels.extend(labels)
-
-        # cache labels in separate data column
-        # with counters
-        if with_counters:
-            task.data[column_name] = ', '.join(
-                sorted([f'{label}: {task_labels.count(label)}' for label in set(task_labels)])
-            )
-        # no counters
-        else:
-            task.data[column_name] = ', '.join(sorted(list(set(task_labels))))
-
-    Task.objects.bulk_update(tasks, fields=['data'], batch_size=1000)
-    first_task = Task.objects.get(id=queryset.first().id)
-    project.summary.update_data_columns([first_task])
-    return {'response_code': 200, 'detail': f'Updated {len(tasks)} tasks'}
+    # stream tasks by id chunks to keep memory bounded on large projects
+    task_ids = list(queryset.order_by('id').values_list('id', flat=True).distinct())
+    total = len(task_ids)
+    logger.info(f'Cache labels for {total} tasks and control tag {control_tag}')
+
+    first_task = None
+    for i in range(0, total, settings.BATCH_SIZE):
+        chunk_ids = task_ids[i : i + settings.BATCH_SIZE]
+
+        # one query for all annotations (or predictions) of the chunk
+        task_labels = defaultdict(Counter)
+        for annotation in source_class.objects.filter(task_id__in=chunk_ids).only('task_id', 'result'):
+            task_labels[annotation.task_id].update(extract_labels(annotation, control_tag, label_interface_tags))
+
+        tasks = list(Task.objects.filter(id__in=chunk_ids).only('id', 'data').order_by('id'))
+        for task in tasks:
+            labels = task_labels[task.id]
+            # cache labels in separate data column
+            # with counters
+            if with_counters:
+                task.data[column_name] = ', '.join(sorted(f'{label}: {count}' for label, count in labels.items()))
+            # no counters
+            else:
+                task.data[column_name] = ', '.join(sorted(labels))
+            # data is changed, hash will be recalculated on demand
+            task.data_hash = None
+
+        Task.objects.bulk_update(tasks, fields=['data', 'data_hash'], batch_size=settings.BATCH_SIZE)
+        if first_task is None and tasks:
+            first_task = tasks[0]
+
+        processed = min(i + settings.BATCH_SIZE, total)
+        update_job_progress(processed, total)
+        logger.info(f'Cached labels for {processed}/{total} tasks')
+
+    if first_task is not None:
+        project.summary.update_data_columns([first_task])
+    return {'response_code': 200, 'detail': f'Updated {total} tasks'}
 
 
 def extract_labels(annotation, control_tag, label_interface_tags=None):
@@ -97,15 +113,20 @@ def extract_labels(annotation, control_tag, label_interface_tags=None):
 
 def cache_labels(project, queryset, request, **kwargs):
     """Cache labels from annotations to a new column in tasks"""
-    start_job_async_or_sync(
+    job = start_job_async_or_sync(
         cache_labels_job,
         project,
         queryset,
         organization_id=project.organization_id,
         request_data=request.data,
         job_timeout=60 * 60 * 5,  # max allowed duration is 5 hours
+        meta={'project_id': project.id, 'action': 'cache_labels'},
     )
-    return {'response_code': 200}
+    response = {'response_code': 200}
+    # job is started in redis, its progress can be checked via actions jobs API
+    if hasattr(job, 'id'):
+        response['job_id'] = job.id
+    return response
 
 
 def cache_labels_form(user, project):
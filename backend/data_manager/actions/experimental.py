@@ -179,7 +179,9 @@ def add_data_field(project, queryset, **kwargs):
             tasks = list(queryset.only('data'))
             for task in tasks:
                 task.data[value_name] = value
-            Task.objects.bulk_update(tasks, fields=['data'], batch_size=1000)
+                # data hash will be recalculated on demand, e.g. in remove duplicates action
+                task.data_hash = None
+            Task.objects.bulk_update(tasks, fields=['data', 'data_hash'], batch_size=1000)
 
         # postgres and other DB
         else:
@@ -189,7 +191,8 @@ def add_data_field(project, queryset, **kwargs):
                     Value([value_name]),
                     Value(value, JSONField()),
                     function='jsonb_set',
-                )
+                ),
+                data_hash=None,
             )
 
     project.summary.update_data_columns([queryset.first()])
@@ -269,7 +272,9 @@ def add_expression(queryset, size, value, value_name):
     else:
         raise ValidationError('Undefined expression, you can use: ' + add_data_field_examples)
 
-    Task.objects.bulk_update(tasks, fields=['data'], batch_size=1000)
+    for task in tasks:
+        task.data_hash = None
+    Task.objects.bulk_update(tasks, fields=['data', 'data_hash'], batch_size=1000)
 
 
 def add_data_field_form(user, project):
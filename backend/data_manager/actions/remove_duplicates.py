@@ -4,18 +4,18 @@
 import logging
 from collections import defaultdict
 
-import ujson as json
-from core.label_config import replace_task_data_undefined_with_config_field
 from core.permissions import AllPermissions
 from core.redis import start_job_async_or_sync
 from data_manager.actions import DataManagerAction
 from data_manager.actions.basic import delete_tasks
+from django.db.models import Count
 from io_storages.azure_blob.models import AzureBlobImportStorageLink
 from io_storages.gcs.models import GCSImportStorageLink
 from io_storages.localfiles.models import LocalFilesImportStorageLink
 from io_storages.redis.models import RedisImportStorageLink
 from io_storages.s3.models import S3ImportStorageLink
 from rest_framework.exceptions import ValidationError
+from tasks.functions import fill_tasks_data_hash
 from tasks.models import Task
 
 logger = logging.getLogger(__name__)
@@ -188,7 +188,10 @@ def restore_storage_links_for_duplicated_tasks(duplicates) -> None:
 
 
 def find_duplicated_tasks_by_data(project, queryset):
-    """Find duplicated tasks by `task.data` and return them as a dict"""
+    """Find duplicated tasks by `task.data` and return them as a dict
+
+    Tasks are grouped by indexed `task.data_hash`, so only tasks from duplicated groups are loaded from DB
+    """
 
     # get io_storage_* links for tasks, we need to copy them
     storages = []
@@ -196,17 +199,27 @@ def find_duplicated_tasks_by_data(project, queryset):
         if field.startswith('io_storages_'):
             storages += [field]
 
-    groups = defaultdict(list)
-    tasks = list(queryset.values('data', 'id', 'total_annotations', 'cancelled_annotations', *storages))
-    logger.info(f'Retrieved {len(tasks)} tasks from queryset')
+    # tasks created before data_hash was introduced or updated with raw SQL don't have the hash
+    fill_tasks_data_hash(project, queryset)
 
-    for task in list(tasks):
-        replace_task_data_undefined_with_config_field(task['data'], project)
-        task['data'] = json.dumps(task['data'])
-        groups[task['data']].append(task)
+    duplicated_hashes = (
+        Task.objects.filter(id__in=queryset.order_by().values('id'))
+        .exclude(data_hash=None)
+        .values('data_hash')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .values('data_hash')
+    )
+
+    duplicates = defaultdict(list)
+    tasks = queryset.filter(data_hash__in=duplicated_hashes).values(
+        'data_hash', 'id', 'total_annotations', 'cancelled_annotations', *storages
+    )
+    for task in tasks:
+        duplicates[task['data_hash']].append(task)
+    duplicates = dict(duplicates)
 
     # make groups of duplicated ids for info print
-    duplicates = {d: groups[d] for d in groups if len(groups[d]) > 1}
     info = {d: [task['id'] for task in duplicates[d]] for d in duplicates}
 
     logger.info(f'Found {len(duplicates)} duplicated tasks')
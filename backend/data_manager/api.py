@@ -5,13 +5,19 @@ import logging
 from asgiref.sync import async_to_sync, sync_to_async
 from core.feature_flags import flag_set
 from core.permissions import ViewClassPermission, all_permissions
+from core.redis import fetch_job, is_job_cancel_requested, request_job_cancel
 from core.utils.common import int_from_request, load_func
 from core.utils.params import bool_from_request
 from data_manager.actions import get_action_form, get_all_actions, perform_action
-from data_manager.functions import evaluate_predictions, get_prepare_params
+from data_manager.functions import (
+    get_prepare_params,
+    schedule_filtered_predictions_evaluation,
+    schedule_predictions_evaluation,
+)
 from data_manager.managers import get_fields_for_evaluation
 from data_manager.models import View
 from data_manager.prepare_params import filters_schema, ordering_schema, prepare_params_schema
+from data_manager.renderers import FastJSONRenderer
 from data_manager.serializers import (
     DataManagerTaskSerializer,
     ViewOrderSerializer,
@@ -21,6 +27,7 @@ from data_manager.serializers import (
 from django.conf import settings
 from django.db.models import Sum
 from django.db.models.functions import Coalesce
+from django.http import Http404
 from django.utils.decorators import method_decorator
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.types import OpenApiTypes
@@ -317,6 +324,7 @@ class TaskListAPI(generics.ListCreateAPIView):
         DELETE=all_permissions.tasks_delete,
     )
     pagination_class = TaskPagination
+    renderer_classes = [FastJSONRenderer]
 
     def get_task_serializer_context(self, request, project, queryset):
         all_fields = request.GET.get('fields', None) == 'all'  # false by default
@@ -339,6 +347,7 @@ class TaskListAPI(generics.ListCreateAPIView):
             'annotations',
             'predictions',
             'annotations__completed_by',
+            'comment_authors',
             'project',
             'io_storages_azureblobimportstoragelink',
             'io_storages_gcsimportstoragelink',
@@ -378,12 +387,19 @@ class TaskListAPI(generics.ListCreateAPIView):
             all_fields = None
         if page is not None:
             ids = [task.id for task in page]  # page is a list already
+
+            # retrieve ML predictions if tasks don't have them, it runs in the background,
+            # so new predictions are visible on the next page load
+            if not review and project.evaluate_predictions_automatically:
+                schedule_predictions_evaluation(project, Task.objects.filter(id__in=ids))
+
             tasks = self.prefetch(
                 Task.prepared.annotate_queryset(
                     Task.objects.filter(id__in=ids),
                     fields_for_evaluation=fields_for_evaluation,
                     all_fields=all_fields,
                     request=request,
+                    project=project,
                 )
             )
 
@@ -391,24 +407,18 @@ class TaskListAPI(generics.ListCreateAPIView):
             # keep ids ordering
             page = [tasks_by_ids[_id] for _id in ids]
 
-            # retrieve ML predictions if tasks don't have them
-            if not review and project.evaluate_predictions_automatically:
-                # TODO MM TODO this needs a discussion, because I'd expect
-                # people to retrieve manually instead on DM load, plus it
-                # will slow down initial DM load
-                # if project.retrieve_predictions_automatically is deprecated now and no longer used
-                tasks_for_predictions = Task.objects.filter(id__in=ids, predictions__isnull=True)
-                evaluate_predictions(tasks_for_predictions)
-                [tasks_by_ids[_id].refresh_from_db() for _id in ids]
-
             context = self.get_task_serializer_context(self.request, project, tasks)
             serializer = self.task_serializer_class(page, many=True, context=context)
             return self.get_paginated_response(serializer.data)
         # all tasks
         if project.evaluate_predictions_automatically:
-            evaluate_predictions(queryset.filter(predictions__isnull=True))
+            schedule_filtered_predictions_evaluation(project, prepare_params)
         queryset = Task.prepared.annotate_queryset(
-            queryset, fields_for_evaluation=fields_for_evaluation, all_fields=all_fields, request=request
+            queryset,
+            fields_for_evaluation=fields_for_evaluation,
+            all_fields=all_fields,
+            request=request,
+            project=project,
         )
         context = self.get_task_serializer_context(self.request, project, queryset)
         serializer = self.task_serializer_class(queryset, many=True, context=context)
@@ -749,3 +759,83 @@ class ProjectActionsFormAPI(APIView):
 
         form = get_action_form(action_id, project, request.user)
         return Response(form)
+
+
+@method_decorator(
+    name='get',
+    decorator=extend_schema(
+        tags=['Data Manager'],
+        summary='Get action job status',
+        description='Get status and progress of a background job started by a Data Manager action.',
+        parameters=[
+            OpenApiParameter(
+                name='project',
+                type=OpenApiTypes.INT,
+                location='query',
+                description='Project ID',
+                required=True,
+            )
+        ],
+        responses={200: OpenApiResponse(description='Job status and progress')},
+        extensions={
+            'x-fern-audiences': ['internal'],
+        },
+    ),
+)
+@method_decorator(
+    name='delete',
+    decorator=extend_schema(
+        tags=['Data Manager'],
+        summary='Cancel action job',
+        description='Request cancellation of a background job started by a Data Manager action. '
+        'The job stops after the current chunk is processed.',
+        parameters=[
+            OpenApiParameter(
+                name='project',
+                type=OpenApiTypes.INT,
+                location='query',
+                description='Project ID',
+                required=True,
+            )
+        ],
+        responses={200: OpenApiResponse(description='Cancellation requested')},
+        extensions={
+            'x-fern-audiences': ['internal'],
+        },
+    ),
+)
+class ProjectActionsJobAPI(APIView):
+    permission_required = ViewClassPermission(
+        GET=all_permissions.projects_view,
+        DELETE=all_permissions.projects_change,
+    )
+
+    def get_job(self, request, job_id):
+        pk = int_from_request(request.GET, 'project', 0)
+        project = generics.get_object_or_404(Project, pk=pk)
+        self.check_object_permissions(request, project)
+
+        job = fetch_job(job_id)
+        # jobs from other projects are not visible
+        if job is None or job.meta.get('project_id') != project.id:
+            raise Http404(f'Job {job_id} not found')
+        return job
+
+    @staticmethod
+    def job_response(job):
+        return {
+            'id': job.id,
+            'action': job.meta.get('action'),
+            'status': job.get_status(),
+            'progress': job.meta.get('progress'),
+            'cancel_requested': is_job_cancel_requested(job),
+        }
+
+    def get(self, request, job_id):
+        job = self.get_job(request, job_id)
+        return Response(self.job_response(job))
+
+    def delete(self, request, job_id):
+        job = self.get_job(request, job_id)
+        request_job_cancel(job)
+        return Response(self.job_response(job))
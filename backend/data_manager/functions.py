@@ -1,5 +1,6 @@
 """This file and its contents are licensed under the Apache License 2.0. Please see the included NOTICE for copyright information and LICENSE for a copy of the license.
 """
+import hashlib
 import logging
 from collections import OrderedDict
 from typing import Any, Iterable, Tuple
@@ -7,7 +8,8 @@ from urllib.parse import unquote
 
 import ujson as json
 from core.feature_flags import flag_set
-from core.utils.common import int_from_request
+from core.redis import _redis, redis_connected, start_job_async_or_sync
+from core.utils.common import batched_iterator, int_from_request
 from data_manager.models import View
 from data_manager.prepare_params import PrepareParams
 from django.conf import settings
@@ -349,6 +351,74 @@ def evaluate_predictions(tasks):
         return backend.predict_tasks(tasks=tasks)
 
 
+PREDICTIONS_EVALUATION_KEY = 'data_manager:evaluate_predictions:{project_id}:{digest}'
+
+
+def _predictions_evaluation_started(project, job_args):
+    """Set the deduplication key of a predictions evaluation job with these arguments,
+    return True if the same job was already started within EVALUATE_PREDICTIONS_DEDUP_TTL seconds
+    """
+    if not redis_connected():
+        return False
+    digest = hashlib.md5(job_args.encode('utf-8')).hexdigest()   # nosec
+    key = PREDICTIONS_EVALUATION_KEY.format(project_id=project.id, digest=digest)
+    return not _redis.set(key, 1, ex=max(settings.EVALUATE_PREDICTIONS_DEDUP_TTL, 1), nx=True)
+
+
+def schedule_predictions_evaluation(project, tasks):
+    """Retrieve ML predictions for tasks without predictions in a background job,
+    so Data Manager page loads don't wait for ML backend. Predictions become visible on the next page load.
+    Jobs for the same tasks are deduplicated within EVALUATE_PREDICTIONS_DEDUP_TTL seconds,
+    without redis predictions are retrieved synchronously.
+
+    :param project: project instance
+    :param tasks: tasks queryset of a Data Manager page
+    """
+    task_ids = list(tasks.filter(predictions__isnull=True).order_by('id').values_list('id', flat=True))
+    if not task_ids:
+        return
+
+    if _predictions_evaluation_started(project, json.dumps(task_ids)):
+        logger.debug(f'Predictions evaluation for {len(task_ids)} tasks of project {project.id} is already started')
+        return
+
+    start_job_async_or_sync(evaluate_predictions_job, project.id, task_ids, queue_name='low')
+
+
+def schedule_filtered_predictions_evaluation(project, prepare_params):
+    """Same as schedule_predictions_evaluation() for all tasks matching prepare params,
+    task ids aren't loaded in the request: the job finds tasks without predictions itself
+
+    :param project: project instance
+    :param prepare_params: PrepareParams of the Data Manager request
+    """
+    prepare_params_json = prepare_params.model_dump_json(exclude={'request'})
+    if _predictions_evaluation_started(project, prepare_params_json):
+        logger.debug(f'Predictions evaluation for filtered tasks of project {project.id} is already started')
+        return
+
+    start_job_async_or_sync(filtered_predictions_evaluation_job, project.id, prepare_params_json, queue_name='low')
+
+
+def evaluate_predictions_job(project_id, task_ids, **kwargs):
+    """Retrieve ML predictions for tasks which still don't have predictions, tasks are loaded in one query"""
+    tasks = list(
+        Task.objects.filter(project_id=project_id, id__in=task_ids, predictions__isnull=True).select_related('project')
+    )
+    evaluate_predictions(tasks)
+
+
+def filtered_predictions_evaluation_job(project_id, prepare_params_json, **kwargs):
+    """Retrieve ML predictions for tasks matching prepare params which don't have predictions,
+    tasks are found and processed in chunks of settings.BATCH_SIZE
+    """
+    prepare_params = PrepareParams.model_validate_json(prepare_params_json)
+    queryset = Task.prepared.only_filtered(prepare_params=prepare_params).filter(predictions__isnull=True)
+    task_ids = queryset.order_by('id').values_list('id', flat=True)
+    for chunk_ids in batched_iterator(task_ids.iterator(chunk_size=settings.BATCH_SIZE), settings.BATCH_SIZE):
+        evaluate_predictions_job(project_id, chunk_ids)
+
+
 def filters_ordering_selected_items_exist(data):
     return data.get('filters') or data.get('ordering') or data.get('selectedItems')
 
@@ -1,10 +1,14 @@
 """This file and its contents are licensed under the Apache License 2.0. Please see the included NOTICE for copyright information and LICENSE for a copy of the license.
 """
+import hashlib
 import logging
 import re
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from functools import reduce
-from typing import ClassVar
+from typing import ClassVar, Union
 
 import ujson as json
 from core.feature_flags import flag_set
@@ -42,6 +46,10 @@ logger = logging.getLogger(__name__)
 
 DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
 
+# compiled filters cache: key => (expiration monotonic time, CompiledFilters)
+_compiled_filters_cache: OrderedDict = OrderedDict()
+_compiled_filters_lock = threading.Lock()
+
 
 class _Operator(BaseModel):
     EQUAL: ClassVar[str] = 'equal'
@@ -268,18 +276,100 @@ def add_user_filter(enabled, key, _filter, filter_expressions):
         return 'continue'
 
 
-def apply_filters(queryset, filters, project, request):
-    if not filters:
+class CustomFilterExpression:
+    """Placeholder for a custom filter expression in compiled filters,
+    the expression can depend on request user, so it's built for every request
+    """
+
+    def __init__(self, _filter, field_name, is_child_filter):
+        self.filter = _filter.model_copy(deep=True)
+        self.field_name = field_name
+        self.is_child_filter = is_child_filter
+
+    def bind(self, custom_filter_expressions, project, request):
+        return custom_filter_expressions(
+            self.filter.model_copy(deep=True),
+            self.field_name,
+            project,
+            request=request,
+            is_child_filter=self.is_child_filter,
+        )
+
+
+class CompiledFilters:
+    """Data Manager filters compiled to ORM expressions.
+    They depend only on filters and project schema, so they are reused across requests,
+    per request cost is binding of custom expressions and applying expressions to queryset.
+    """
+
+    def __init__(self, conjunction):
+        self.conjunction = conjunction
+        # annotations required by expressions, e.g. task data fields casted to numbers
+        self.annotations = {}
+        # filter lines: parent filter expressions combined with child filter expressions
+        self.lines: list[list[Union[Q, CustomFilterExpression]]] = []
+        # filters can't match any task, e.g. incorrect regex
+        self.matches_nothing = False
+        # value types of task fields were resolved with existing tasks
+        self.cacheable = True
+
+    def apply(self, queryset, project, request):
+        """Apply compiled filters to queryset
+
+        :return: Filtered queryset or None if custom expressions aren't applicable to the request
+        """
+        if self.matches_nothing:
+            return queryset.none()
+
+        custom_filter_expressions = load_func(settings.DATA_MANAGER_CUSTOM_FILTER_EXPRESSIONS)
+        filter_line_expressions: list[list[Q]] = []
+        for line in self.lines:
+            filter_expressions = []
+            for filter_expression in line:
+                if isinstance(filter_expression, CustomFilterExpression):
+                    filter_expression = filter_expression.bind(custom_filter_expressions, project, request)
+                    if not filter_expression:
+                        return None
+                filter_expressions.append(filter_expression)
+            filter_line_expressions.append(filter_expressions)
+
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+
+        resolved_filter_lines = [reduce(lambda x, y: x & y, fle) for fle in filter_line_expressions]
+
+        """WARNING: Stringifying filter_expressions will evaluate the (sub)queryset.
+            Do not use a log in the following manner:
+            logger.debug(f'Apply filter: {filter_expressions}')
+            Even in DEBUG mode, a subqueryset that has OuterRef will raise an error
+            if evaluated outside a parent queryset.
+        """
+        if self.conjunction == ConjunctionEnum.OR:
+            result_filter = Q()
+            for resolved_filter in resolved_filter_lines:
+                result_filter.add(resolved_filter, Q.OR)
+            queryset = queryset.filter(result_filter)
+        else:
+            for resolved_filter in resolved_filter_lines:
+                queryset = queryset.filter(resolved_filter)
         return queryset
 
-    # convert conjunction to orm statement
+
+def compile_filters(queryset, filters, project, request):
+    """Compile filters to ORM expressions, custom expressions are left as placeholders bound per request.
+    Value types of task fields are resolved with the passed queryset.
+
+    :return: CompiledFilters
+    """
+    compiled = CompiledFilters(filters.conjunction)
     custom_filter_expressions = load_func(settings.DATA_MANAGER_CUSTOM_FILTER_EXPRESSIONS)
+    preprocess_field_name = load_func(settings.PREPROCESS_FIELD_NAME)
+    preprocess_filter = load_func(settings.DATA_MANAGER_PREPROCESS_FILTER)
 
     # combine child filters with their parent in the same filter expression
-    filter_line_expressions: list[list[Q]] = []
     for parent_filter in filters.items:
         filter_line = [parent_filter, parent_filter.child_filter] if parent_filter.child_filter else [parent_filter]
-        filter_expressions: list[Q] = []
+        filter_expressions: list[Union[Q, CustomFilterExpression]] = []
 
         for _filter in filter_line:
             is_child_filter = parent_filter.child_filter is not None and _filter is parent_filter.child_filter
@@ -289,14 +379,12 @@ def apply_filters(queryset, filters, project, request):
                 continue
 
             # django orm loop expression attached to column name
-            preprocess_field_name = load_func(settings.PREPROCESS_FIELD_NAME)
             field_name, _ = preprocess_field_name(_filter.filter, project)
 
             # filter pre-processing, value type conversion, etc..
-            preprocess_filter = load_func(settings.DATA_MANAGER_PREPROCESS_FILTER)
             _filter = preprocess_filter(_filter, field_name)
 
-            # custom expressions for enterprise
+            # custom expressions for enterprise, they can depend on request user, so they are bound per request
             filter_expression = custom_filter_expressions(
                 _filter,
                 field_name,
@@ -305,7 +393,7 @@ def apply_filters(queryset, filters, project, request):
                 is_child_filter=is_child_filter,
             )
             if filter_expression:
-                filter_expressions.append(filter_expression)
+                filter_expressions.append(CustomFilterExpression(_filter, field_name, is_child_filter))
                 continue
 
             # annotators
@@ -324,7 +412,8 @@ def apply_filters(queryset, filters, project, request):
             if field_name in ['annotations_results', 'predictions_results']:
                 result = add_result_filter(field_name, _filter, filter_expressions, project)
                 if result == 'exit':
-                    return queryset.none()
+                    compiled.matches_nothing = True
+                    return compiled
                 elif result == 'continue':
                     continue
 
@@ -366,12 +455,8 @@ def apply_filters(queryset, filters, project, request):
             # annotate with cast to number if need
             if _filter.type == 'Number' and field_name.startswith('data__'):
                 json_field = field_name.replace('data__', '')
-                queryset = queryset.annotate(
-                    **{
-                        f'filter_{json_field.replace("$undefined$", "undefined")}': Cast(
-                            KeyTextTransform(json_field, 'data'), output_field=FloatField()
-                        )
-                    }
+                compiled.annotations[f'filter_{json_field.replace("$undefined$", "undefined")}'] = Cast(
+                    KeyTextTransform(json_field, 'data'), output_field=FloatField()
                 )
                 clean_field_name = f'filter_{json_field.replace("$undefined$", "undefined")}'
             else:
@@ -389,6 +474,9 @@ def apply_filters(queryset, filters, project, request):
             value_type = 'str'
             if queryset.exists():
                 value_type = type(queryset.values_list(field_name, flat=True)[0]).__name__
+            else:
+                # value type can't be resolved without tasks, don't reuse these compiled filters
+                compiled.cacheable = False
 
             if (value_type == 'list' or value_type == 'tuple') and 'equal' in _filter.operator:
                 raise ValidationError('Not supported filter type')
@@ -419,7 +507,8 @@ def apply_filters(queryset, filters, project, request):
                     re.compile(pattern=str(_filter.value))
                 except Exception as e:
                     logger.info('Incorrect regex for filter: %s: %s', _filter.value, str(e))
-                    return queryset.none()
+                    compiled.matches_nothing = True
+                    return compiled
 
             # append operator
             field_name = f"{clean_field_name}{operators.get(_filter.operator, '')}"
@@ -477,34 +566,71 @@ def apply_filters(queryset, filters, project, request):
                 cast_value(_filter)
                 filter_expressions.append(Q(**{field_name: _filter.value}))
 
-        filter_line_expressions.append(filter_expressions)
+        compiled.lines.append(filter_expressions)
+
+    return compiled
 
-    resolved_filter_lines = [reduce(lambda x, y: x & y, fle) for fle in filter_line_expressions]
 
-    """WARNING: Stringifying filter_expressions will evaluate the (sub)queryset.
-        Do not use a log in the following manner:
-        logger.debug(f'Apply filter: {filter_expressions}')
-        Even in DEBUG mode, a subqueryset that has OuterRef will raise an error
-        if evaluated outside a parent queryset.
+def get_filters_schema_version(project):
+    """Compiled filters depend on the project labeling config and settings, the version changes with them"""
+    label_config_hash = hashlib.md5((project.label_config or '').encode('utf-8')).hexdigest()   # nosec
+    updated_at = project.updated_at.isoformat() if project.updated_at else ''
+    return f'{label_config_hash}:{updated_at}'
+
+
+def get_compiled_filters(queryset, filters, project, request):
+    """Get compiled filters from the in-process cache or compile them.
+    Cache key includes the filters themselves, so changed view filters never hit outdated entries,
+    and the project schema version, so labeling config changes invalidate compiled filters.
+    With custom filter expressions the key also includes the request user, because the expressions
+    can exist only for some users.
+
+    :return: CompiledFilters
     """
-    if filters.conjunction == ConjunctionEnum.OR:
-        result_filter = Q()
-        for resolved_filter in resolved_filter_lines:
-            result_filter.add(resolved_filter, Q.OR)
-        queryset = queryset.filter(result_filter)
-    else:
-        for resolved_filter in resolved_filter_lines:
-            queryset = queryset.filter(resolved_filter)
-    return queryset
+    from data_manager.functions import custom_filter_expressions
+
+    ttl = settings.DATA_MANAGER_COMPILED_FILTERS_CACHE_TTL
+    if ttl <= 0:
+        return compile_filters(queryset, filters, project, request)
+
+    key = (project.id, get_filters_schema_version(project), filters.model_dump_json())
+    if load_func(settings.DATA_MANAGER_CUSTOM_FILTER_EXPRESSIONS) is not custom_filter_expressions:
+        key += (getattr(getattr(request, 'user', None), 'id', None),)
+    with _compiled_filters_lock:
+        cached = _compiled_filters_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            _compiled_filters_cache.move_to_end(key)
+            return cached[1]
+
+    compiled = compile_filters(queryset, filters, project, request)
+    if compiled.cacheable:
+        with _compiled_filters_lock:
+            _compiled_filters_cache[key] = (time.monotonic() + ttl, compiled)
+            _compiled_filters_cache.move_to_end(key)
+            while len(_compiled_filters_cache) > settings.DATA_MANAGER_COMPILED_FILTERS_CACHE_SIZE:
+                _compiled_filters_cache.popitem(last=False)
+    return compiled
+
+
+def apply_filters(queryset, filters, project, request):
+    if not filters:
+        return queryset
+
+    filtered = get_compiled_filters(queryset, filters, project, request).apply(queryset, project, request)
+    if filtered is None:
+        # custom expressions of cached filters aren't applicable to this request, compile filters for it
+        filtered = compile_filters(queryset, filters, project, request).apply(queryset, project, request)
+    return filtered
 
 
 class TaskQuerySet(FSMStateQuerySetMixin, models.QuerySet):
     """QuerySet for Task model with Data Manager filters and ordering support."""
 
-    def prepared(self, prepare_params=None):
+    def prepared(self, prepare_params=None, project=None):
         """Apply filters, ordering and selected items to queryset
 
         :param prepare_params: prepare params with project, filters, orderings, etc
+        :param project: already loaded project for filter/ordering configuration
         :return: ordered and filtered queryset
 
         Note: For multi-project queries, filters and ordering will use the first project's
@@ -520,11 +646,12 @@ class TaskQuerySet(FSMStateQuerySetMixin, models.QuerySet):
 
         # Get the project for filter/ordering configuration
         # For multi-project queries, use the first project's configuration
-        if prepare_params.is_multi_project:
-            project = Project.objects.get(pk=prepare_params.projects[0])
-        else:
-            # Backwards compatible: prepare_params.project is an int
-            project = Project.objects.get(pk=prepare_params.project)
+        if project is None:
+            if prepare_params.is_multi_project:
+                project = Project.objects.get(pk=prepare_params.projects[0])
+            else:
+                # Backwards compatible: prepare_params.project is an int
+                project = Project.objects.get(pk=prepare_params.project)
 
         request = prepare_params.request
         queryset = apply_filters(queryset, prepare_params.filters, project, request)
@@ -678,15 +805,14 @@ def annotate_annotators(queryset):
 
 
 def annotate_predictions_score(queryset):
-    first_task = queryset.first()
-    if not first_task:
-        return queryset
+    # project is attached by PreparedTaskManager.annotate_queryset, tasks aren't probed to get it
+    project = getattr(queryset, 'project', None)
+    if project is None:
+        return queryset.annotate(predictions_score=Avg('predictions__score'))
 
     # new approach with each ML backend contains it's version
-    if flag_set('ff_front_dev_1682_model_version_dropdown_070622_short', first_task.project.organization.created_by):
-        model_versions = list(
-            first_task.project.ml_backends.filter(project=first_task.project).values_list('model_version', flat=True)
-        )
+    if flag_set('ff_front_dev_1682_model_version_dropdown_070622_short', project.organization.created_by):
+        model_versions = list(project.ml_backends.filter(project=project).values_list('model_version', flat=True))
         if len(model_versions) == 0:
             return queryset.annotate(predictions_score=Avg('predictions__score'))
 
@@ -695,7 +821,7 @@ def annotate_predictions_score(queryset):
                 predictions_score=Avg('predictions__score', filter=Q(predictions__model_version__in=model_versions))
             )
     else:
-        model_version = first_task.project.model_version
+        model_version = project.model_version
         if model_version is None:
             return queryset.annotate(predictions_score=Avg('predictions__score'))
         else:
@@ -801,8 +927,18 @@ class PreparedTaskManager(models.Manager):
 
     @staticmethod
     def annotate_queryset(
-        queryset, fields_for_evaluation=None, all_fields=False, excluded_fields_for_evaluation=None, request=None
+        queryset,
+        fields_for_evaluation=None,
+        all_fields=False,
+        excluded_fields_for_evaluation=None,
+        request=None,
+        project=None,
     ):
+        """Attach Data Manager annotations to queryset.
+        Annotations are chosen by requested fields and project, so the queryset isn't evaluated here.
+
+        :param project: project of tasks, queryset.project is used if it's not passed
+        """
         annotations_map = get_annotations_map()
 
         if fields_for_evaluation is None:
@@ -811,8 +947,8 @@ class PreparedTaskManager(models.Manager):
         if excluded_fields_for_evaluation is None:
             excluded_fields_for_evaluation = []
 
-        first_task = queryset.first()
-        project = None if first_task is None else first_task.project
+        if project is None:
+            project = getattr(queryset, 'project', None)
 
         # db annotations applied only if we need them in ordering or filters
         for field in annotations_map.keys():
@@ -857,16 +993,30 @@ class PreparedTaskManager(models.Manager):
             request=prepare_params.request,
         )
 
-    def only_filtered(self, prepare_params=None):
+    @staticmethod
+    def get_project(prepare_params):
+        """Project used for filters, ordering and annotations, the first one for multi-project queries"""
+        from projects.models import Project
+
+        return Project.objects.get(pk=prepare_params.projects[0])
+
+    def only_filtered(self, prepare_params=None, project=None):
         request = prepare_params.request
+        if project is None:
+            project = self.get_project(prepare_params)
         # Support both single and multiple projects
         if prepare_params.is_multi_project:
             queryset = TaskQuerySet(self.model).filter(project__in=prepare_params.projects)
         else:
             queryset = TaskQuerySet(self.model).filter(project=prepare_params.project)
         fields_for_filter_ordering = get_fields_for_filter_ordering(prepare_params)
-        queryset = self.annotate_queryset(queryset, fields_for_evaluation=fields_for_filter_ordering, request=request)
-        return queryset.prepared(prepare_params=prepare_params)
+        queryset = self.annotate_queryset(
+            queryset, fields_for_evaluation=fields_for_filter_ordering, request=request, project=project
+        )
+        queryset = queryset.prepared(prepare_params=prepare_params, project=project)
+        # annotate_queryset() takes the project from here, so tasks aren't probed to find it
+        queryset.project = project
+        return queryset
 
 
 class TaskManager(models.Manager):
@@ -0,0 +1,69 @@
+"""This file and its contents are licensed under the Apache License 2.0. Please see the included NOTICE for copyright information and LICENSE for a copy of the license.
+"""
+import logging
+import math
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional dependency, the regular JSON renderer is used without it
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _has_non_orjson_floats(data):
+    """Check if data has floats which orjson renders differently from the stdlib json module:
+    non-finite values (orjson renders them as null, strict JSONRenderer raises an error)
+    and values which repr() writes with an exponent (orjson writes 1e-05 as 0.00001 and 1e+16 as 1e16)
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value) or (value and not 1e-4 <= abs(value) < 1e16):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer for large Data Manager responses, it encodes data with orjson when it's installed.
+
+    Output is byte-identical to rest_framework JSONRenderer with default settings: compact separators, UTF-8,
+    U+2028 and U+2029 escaped. Objects unknown to orjson (datetimes, decimals, lazy strings, etc.)
+    are converted by the DRF encoder. Data which orjson renders differently (integers larger than 64 bits,
+    non-finite floats, floats written with an exponent) falls back to JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+            or _has_non_orjson_floats(data)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder_default = self.encoder_class().default
+
+        def default(obj):
+            value = encoder_default(obj)
+            if _has_non_orjson_floats(value):
+                raise TypeError(f'{type(obj).__name__} is converted to floats rendered differently by orjson')
+            return value
+
+        try:
+            ret = orjson.dumps(data, default=default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError as e:
+            # orjson.JSONEncodeError is a subclass of TypeError
+            logger.debug(f'orjson failed to render data, fallback to JSONRenderer: {e}')
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
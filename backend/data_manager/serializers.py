@@ -466,7 +466,7 @@ class DataManagerTaskSerializer(TaskSerializer):
     class Meta:
         model = Task
         ref_name = 'data_manager_task_serializer'
-        exclude = ('precomputed_agreement',)
+        exclude = ('precomputed_agreement', 'data_hash')
         expandable_fields = {'annotations': (AnnotationSerializer, {'many': True})}
 
     def to_representation(self, obj):
@@ -477,11 +477,7 @@ class DataManagerTaskSerializer(TaskSerializer):
         if not self.context.get('predictions'):
             ret.pop('predictions', None)
         # Remove state field if feature flags are disabled
-        user = CurrentContext.get_user()
-        if not (
-            flag_set('fflag_feat_fit_568_finite_state_management', user=user)
-            and flag_set('fflag_feat_fit_710_fsm_state_fields', user=user)
-        ):
+        if not self._fsm_state_enabled():
             ret.pop('state', None)
         # Ensure allow_skip is always present in the response, even if None
         # This is important for frontend logic that checks allow_skip !== false
@@ -489,6 +485,15 @@ class DataManagerTaskSerializer(TaskSerializer):
             ret['allow_skip'] = obj.allow_skip
         return ret
 
+    def _fsm_state_enabled(self):
+        """Feature flags are checked once per request, context is shared by all tasks of the list"""
+        if '_fsm_state_enabled' not in self.context:
+            user = CurrentContext.get_user()
+            self.context['_fsm_state_enabled'] = flag_set(
+                'fflag_feat_fit_568_finite_state_management', user=user
+            ) and flag_set('fflag_feat_fit_710_fsm_state_fields', user=user)
+        return self.context['_fsm_state_enabled']
+
     def _pretty_results(self, task, field, unique=False):
         if not hasattr(task, field) or getattr(task, field) is None:
             return ''
@@ -506,8 +511,15 @@ class DataManagerTaskSerializer(TaskSerializer):
             result = [r for r in result if r is not None]
             if unique:
                 result = list(set(result))
-            result = round_floats(result)
-            output = json.dumps(result, ensure_ascii=False)[1:-1]  # remove brackets [ ]
+            # dump items one by one and stop when the output is long enough to be cut by CHAR_LIMITS
+            items, length = [], 0
+            for item in result:
+                item = json.dumps(round_floats(item), ensure_ascii=False)
+                items.append(item)
+                length += len(item) + 1
+                if length > self.CHAR_LIMITS:
+                    break
+            output = ','.join(items)
 
         return output[: self.CHAR_LIMITS].replace(',"', ', "').replace('],[', '] [').replace('"', '')
 
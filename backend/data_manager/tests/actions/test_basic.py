@@ -1,6 +1,15 @@
-from data_manager.actions.basic import delete_tasks_annotations, delete_tasks_annotations_form
+from unittest.mock import Mock, call, patch
+
+from data_manager.actions.basic import (
+    delete_tasks,
+    delete_tasks_annotations,
+    delete_tasks_annotations_form,
+    delete_tasks_job,
+    restore_unlinked_tasks,
+)
+from data_manager.models import View
 from django.http import HttpRequest
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from projects.tests.factories import ProjectFactory
 from tasks.models import Annotation, AnnotationDraft, Task
 from tasks.tests.factories import AnnotationDraftFactory, AnnotationFactory, TaskFactory
@@ -80,3 +89,80 @@ class TestDeleteTasksAnnotations(TestCase):
         assert Annotation.objects.count() == 2
         assert AnnotationDraft.objects.count() == 1
         assert not Annotation.objects.filter(task=self.task_1, completed_by=self.user_1).exists()
+
+
+class TestDeleteTasks(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = ProjectFactory()
+        cls.task_1 = TaskFactory(project=cls.project, data={'text': 'a', 'extra': 1})
+        cls.task_2 = TaskFactory(project=cls.project, data={'text': 'b'})
+        cls.task_3 = TaskFactory(project=cls.project, data={'text': 'c'})
+
+    def test_delete_some_tasks(self):
+        result = delete_tasks(self.project, Task.objects.filter(id__in=[self.task_1.id, self.task_2.id]))
+
+        assert result['processed_items'] == 2
+        assert not result['reload']
+        assert list(Task.objects.values_list('id', flat=True)) == [self.task_3.id]
+        self.project.summary.refresh_from_db()
+        assert self.project.summary.all_data_columns == {'text': 1}
+
+    def test_delete_all_tasks(self):
+        result = delete_tasks(self.project, self.project.tasks.all())
+
+        assert result['processed_items'] == 3
+        assert result['reload']
+        assert not Task.objects.exists()
+
+    def test_delete_tasks_reload_with_async_job(self):
+        with patch('data_manager.actions.basic.start_job_async_or_sync', return_value=Mock(id='job-id')):
+            some_tasks = delete_tasks(self.project, Task.objects.filter(id=self.task_1.id))
+            all_tasks = delete_tasks(self.project, self.project.tasks.all())
+
+        assert some_tasks['job_id'] == 'job-id'
+        assert not some_tasks['reload']
+        assert all_tasks['reload']
+
+    def test_restore_unlinked_tasks(self):
+        Task.objects.filter(id=self.task_1.id).update(project=None)
+
+        restore_unlinked_tasks(self.project, [self.task_1.id])
+
+        assert self.project.tasks.count() == 3
+
+    @override_settings(BATCH_SIZE=2)
+    def test_delete_tasks_in_chunks(self):
+        View.objects.create(project=self.project)
+
+        with patch('data_manager.actions.basic.emit_webhooks_for_instance') as emit_webhooks, patch(
+            'data_manager.actions.basic.update_job_progress'
+        ) as update_progress:
+            result = delete_tasks(self.project, self.project.tasks.all())
+
+        assert result['processed_items'] == 3
+        assert not Task.objects.exists()
+        assert [c.args[3] for c in emit_webhooks.call_args_list] == [
+            [{'id': self.task_1.id}, {'id': self.task_2.id}],
+            [{'id': self.task_3.id}],
+        ]
+        assert update_progress.call_args_list == [call(2, 3), call(3, 3)]
+        assert not self.project.views.exists()
+
+    @override_settings(BATCH_SIZE=1)
+    def test_cancel_delete_tasks_job(self):
+        View.objects.create(project=self.project)
+        tasks_ids = [self.task_1.id, self.task_2.id, self.task_3.id]
+        Task.objects.filter(id__in=tasks_ids).update(project=None)
+
+        with patch('data_manager.actions.basic.is_job_cancel_requested', side_effect=[False, True]), patch(
+            'data_manager.actions.basic.emit_webhooks_for_instance'
+        ) as emit_webhooks:
+            result = delete_tasks_job(self.project.id, tasks_ids)
+
+        assert result == {'processed_items': 1, 'cancelled': True, 'views_deleted': False}
+        assert not Task.objects.filter(id=self.task_1.id).exists()
+        assert set(self.project.tasks.values_list('id', flat=True)) == {self.task_2.id, self.task_3.id}
+        # webhooks are sent only for deleted tasks, tabs are kept because tasks were restored
+        assert [c.args[3] for c in emit_webhooks.call_args_list] == [[{'id': self.task_1.id}]]
+        assert self.project.views.exists()
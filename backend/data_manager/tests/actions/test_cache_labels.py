@@ -0,0 +1,51 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from core.redis import update_job_progress
+from data_manager.actions.cache_labels import cache_labels_job
+from projects.tests.factories import ProjectFactory
+from tasks.models import Task
+from tasks.tests.factories import AnnotationFactory, TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def make_result(*choices):
+    return [
+        {'from_name': 'label', 'to_name': 'text', 'type': 'choices', 'value': {'choices': [choice]}}
+        for choice in choices
+    ]
+
+
+def test_cache_labels_job_processes_tasks_in_chunks(settings):
+    """Labels are cached for every task when tasks are processed in several chunks"""
+    settings.BATCH_SIZE = 2
+    project = ProjectFactory()
+    task_1, task_2, task_3 = [TaskFactory(project=project, data={'text': 'a'}) for _ in range(3)]
+    AnnotationFactory(task=task_1, project=project, result=make_result('Cat', 'Dog'))
+    AnnotationFactory(task=task_1, project=project, result=make_result('Cat'))
+    AnnotationFactory(task=task_2, project=project, result=make_result('Dog'))
+
+    with patch('data_manager.actions.cache_labels.update_job_progress') as update_progress:
+        result = cache_labels_job(
+            project,
+            Task.objects.filter(project=project),
+            request_data={'control_tag': 'ALL', 'with_counters': 'Yes', 'source': 'annotations'},
+        )
+
+    assert result == {'response_code': 200, 'detail': 'Updated 3 tasks'}
+    assert [call.args for call in update_progress.call_args_list] == [(2, 3), (3, 3)]
+    cached = dict(Task.objects.filter(project=project).values_list('id', 'data__cache_all'))
+    assert cached == {task_1.id: 'Cat: 2, Dog: 1', task_2.id: 'Dog: 1', task_3.id: ''}
+
+
+def test_update_job_progress():
+    """Progress is saved to the meta of the current RQ job and ignored without a job"""
+    job = Mock(meta={})
+    with patch('core.redis.get_current_job', return_value=job):
+        update_job_progress(5, 10, step='test')
+    assert job.meta['progress'] == {'processed': 5, 'total': 10, 'step': 'test'}
+    job.save_meta.assert_called_once()
+
+    with patch('core.redis.get_current_job', return_value=None):
+        update_job_progress(5, 10)
@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+from data_manager.actions.remove_duplicates import find_duplicated_tasks_by_data
+from django.test import TestCase
+from projects.tests.factories import ProjectFactory
+from tasks.models import Task, get_task_data_hash
+from tasks.tests.factories import TaskFactory
+
+
+class TestFindDuplicatedTasksByData(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = ProjectFactory()
+        cls.task_1 = TaskFactory(project=cls.project, data={'text': 'a', 'meta': 1})
+        cls.task_2 = TaskFactory(project=cls.project, data={'meta': 1, 'text': 'a'})
+        cls.task_3 = TaskFactory(project=cls.project, data={'text': 'b'})
+
+    def test_hash_ignores_key_order(self):
+        assert self.task_1.data_hash == self.task_2.data_hash
+        assert self.task_1.data_hash != self.task_3.data_hash
+        assert self.task_1.data_hash == get_task_data_hash({'meta': 1, 'text': 'a'})
+
+    def test_hash_is_recalculated_only_for_changed_data(self):
+        task = Task.objects.get(id=self.task_3.id)
+        with patch('tasks.models.get_task_data_hash', wraps=get_task_data_hash) as data_hash:
+            task.save()
+            data_hash.assert_not_called()
+
+            task.data['text'] = 'c'
+            task.save()
+            assert data_hash.call_count == 1
+            task.save()
+            assert data_hash.call_count == 1
+
+            task.save(update_fields=['data'])
+            assert data_hash.call_count == 2
+
+        assert Task.objects.get(id=task.id).data_hash == get_task_data_hash({'text': 'c'})
+
+    def test_find_duplicates(self):
+        duplicates = find_duplicated_tasks_by_data(self.project, self.project.tasks.order_by('id'))
+        assert list(duplicates.keys()) == [self.task_1.data_hash]
+        assert [task['id'] for task in duplicates[self.task_1.data_hash]] == [self.task_1.id, self.task_2.id]
+
+    def test_find_duplicates_fills_missing_hash(self):
+        Task.objects.filter(id=self.task_2.id).update(data_hash=None)
+
+        duplicates = find_duplicated_tasks_by_data(self.project, self.project.tasks.order_by('id'))
+        assert [task['id'] for task in duplicates[self.task_1.data_hash]] == [self.task_1.id, self.task_2.id]
+        assert Task.objects.get(id=self.task_2.id).data_hash == self.task_1.data_hash
@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from data_manager import managers
+from data_manager.managers import apply_filters
+from data_manager.prepare_params import Filters
+from django.db.models import Q
+from projects.tests.factories import ProjectFactory
+from tasks.models import Task
+from tasks.tests.factories import TaskFactory
+from users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def make_filters(value):
+    return Filters(
+        conjunction='and',
+        items=[{'filter': 'filter:tasks:total_annotations', 'operator': 'equal', 'type': 'Number', 'value': value}],
+    )
+
+
+def staff_only_filter_expressions(_filter, field_name, project, request=None, **kwargs):
+    # custom expression exists only for staff users and hides all tasks from them
+    if request.user.is_staff:
+        return Q(pk__in=[])
+
+
+@pytest.fixture(autouse=True)
+def clear_compiled_filters_cache():
+    managers._compiled_filters_cache.clear()
+    yield
+    managers._compiled_filters_cache.clear()
+
+
+def test_compiled_filters_are_reused():
+    """Identical filters are compiled once and give the same result"""
+    project = ProjectFactory()
+    task = TaskFactory(project=project)
+    TaskFactory(project=project)
+    Task.objects.filter(id=task.id).update(total_annotations=1)
+    queryset = Task.objects.filter(project=project)
+
+    with patch.object(managers, 'compile_filters', wraps=managers.compile_filters) as compile_filters:
+        assert list(apply_filters(queryset, make_filters(1), project, None)) == [task]
+        assert list(apply_filters(queryset, make_filters(1), project, None)) == [task]
+        assert task not in apply_filters(queryset, make_filters(0), project, None)
+
+    assert compile_filters.call_count == 2
+
+
+def test_compiled_filters_invalidated_by_label_config_change():
+    """Changing the labeling config invalidates compiled filters"""
+    project = ProjectFactory()
+    TaskFactory(project=project)
+    queryset = Task.objects.filter(project=project)
+
+    with patch.object(managers, 'compile_filters', wraps=managers.compile_filters) as compile_filters:
+        apply_filters(queryset, make_filters(0), project, None)
+        project.label_config = f'{project.label_config} '
+        apply_filters(queryset, make_filters(0), project, None)
+
+    assert compile_filters.call_count == 2
+
+
+def test_compiled_filters_not_cached_without_tasks():
+    """Filters resolved without tasks aren't cached because field types are unknown"""
+    project = ProjectFactory()
+    queryset = Task.objects.filter(project=project)
+
+    with patch.object(managers, 'compile_filters', wraps=managers.compile_filters) as compile_filters:
+        apply_filters(queryset, make_filters(0), project, None)
+        apply_filters(queryset, make_filters(0), project, None)
+
+    assert compile_filters.call_count == 2
+
+
+def test_compiled_filters_with_custom_expressions_are_cached_per_user(settings):
+    """Filters compiled without a custom expression for one user aren't reused for users having it"""
+    settings.DATA_MANAGER_CUSTOM_FILTER_EXPRESSIONS = (
+        'data_manager.tests.test_compiled_filters.staff_only_filter_expressions'
+    )
+    project = ProjectFactory()
+    task = TaskFactory(project=project)
+    queryset = Task.objects.filter(project=project)
+    user = SimpleNamespace(user=UserFactory(is_staff=False))
+    staff = SimpleNamespace(user=UserFactory(is_staff=True))
+
+    with patch.object(managers, 'compile_filters', wraps=managers.compile_filters) as compile_filters:
+        assert list(apply_filters(queryset, make_filters(0), project, user)) == [task]
+        assert list(apply_filters(queryset, make_filters(0), project, staff)) == []
+        assert list(apply_filters(queryset, make_filters(0), project, user)) == [task]
+        assert list(apply_filters(queryset, make_filters(0), project, staff)) == []
+
+    assert compile_filters.call_count == 2
@@ -397,3 +397,33 @@ class TestGetQuerysetParameterPassing(TestCase):
                 call_kwargs.get('excluded_fields_for_evaluation'),
                 'excluded_fields_for_evaluation should default to None',
             )
+
+
+class TestAnnotateQuerysetProject(TestCase):
+    """Test that annotate_queryset takes the project from metadata instead of probing tasks."""
+
+    def test_annotate_queryset_uses_passed_project(self):
+        """Test annotate_queryset attaches the passed project without queryset.first().
+
+        This test validates step by step:
+        - Passing a project to annotate_queryset
+        - Verifying annotation functions receive it as queryset.project
+        - Ensuring the queryset isn't evaluated to find the project
+
+        Critical validation: No probe query is made before the page query.
+        """
+        from data_manager.managers import PreparedTaskManager
+
+        mock_queryset = Mock()
+        project = Mock()
+        received_projects = []
+
+        def annotation_function(queryset):
+            received_projects.append(queryset.project)
+            return queryset
+
+        with patch('data_manager.managers.get_annotations_map', return_value={'completed_at': annotation_function}):
+            PreparedTaskManager.annotate_queryset(mock_queryset, all_fields=True, project=project)
+
+        self.assertEqual(received_projects, [project])
+        mock_queryset.first.assert_not_called()
@@ -0,0 +1,65 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from data_manager.functions import schedule_filtered_predictions_evaluation, schedule_predictions_evaluation
+from data_manager.prepare_params import PrepareParams
+from projects.tests.factories import ProjectFactory
+from tasks.models import Task
+from tasks.tests.factories import PredictionFactory, TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_schedule_predictions_evaluation_loads_tasks_without_predictions():
+    """Predictions are retrieved only for tasks without predictions, tasks are loaded at once"""
+    project = ProjectFactory()
+    tasks = [TaskFactory(project=project) for _ in range(3)]
+    PredictionFactory(task=tasks[2], project=project)
+
+    with patch('data_manager.functions.redis_connected', return_value=False), patch(
+        'core.redis.redis_connected', return_value=False
+    ), patch('data_manager.functions.evaluate_predictions') as evaluate_predictions:
+        schedule_predictions_evaluation(project, Task.objects.filter(project=project))
+
+    evaluate_predictions.assert_called_once()
+    assert sorted(task.id for task in evaluate_predictions.call_args[0][0]) == [tasks[0].id, tasks[1].id]
+
+
+def test_schedule_predictions_evaluation_is_deduplicated():
+    """A job for the same tasks isn't started again while the previous one is deduplicated"""
+    project = ProjectFactory()
+    TaskFactory(project=project)
+    redis = Mock()
+    redis.set.return_value = False
+
+    with patch('data_manager.functions.redis_connected', return_value=True), patch(
+        'data_manager.functions._redis', redis
+    ), patch('data_manager.functions.start_job_async_or_sync') as start_job:
+        schedule_predictions_evaluation(project, Task.objects.filter(project=project))
+
+    redis.set.assert_called_once()
+    start_job.assert_not_called()
+
+
+def test_schedule_filtered_predictions_evaluation_finds_tasks_in_job(settings):
+    """All-tasks Data Manager requests pass prepare params to the job instead of task ids"""
+    settings.BATCH_SIZE = 2
+    project = ProjectFactory()
+    tasks = [TaskFactory(project=project) for _ in range(5)]
+    PredictionFactory(task=tasks[1], project=project)
+    prepare_params = PrepareParams(
+        project=project.id, selectedItems={'all': True, 'excluded': [tasks[4].id]}, request=Mock()
+    )
+
+    with patch('data_manager.functions.redis_connected', return_value=False), patch(
+        'core.redis.redis_connected', return_value=False
+    ), patch('data_manager.functions.evaluate_predictions') as evaluate_predictions, patch(
+        'data_manager.functions.start_job_async_or_sync', side_effect=lambda job, *args, **kwargs: job(*args)
+    ) as start_job:
+        schedule_filtered_predictions_evaluation(project, prepare_params)
+
+    assert start_job.call_args[0][1] == project.id
+    assert isinstance(start_job.call_args[0][2], str)
+    assert [len(call[0][0]) for call in evaluate_predictions.call_args_list] == [2, 1]
+    evaluated_ids = [task.id for call in evaluate_predictions.call_args_list for task in call[0][0]]
+    assert sorted(evaluated_ids) == [tasks[0].id, tasks[2].id, tasks[3].id]
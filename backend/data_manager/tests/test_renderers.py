@@ -0,0 +1,66 @@
+import datetime
+import json
+import math
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from data_manager.renderers import FastJSONRenderer
+from rest_framework.renderers import JSONRenderer
+
+
+def make_tasks():
+    return {
+        'total': 2,
+        'tasks': [
+            {
+                'id': 1,
+                'data': {'text': 'line\u2028separator\u2029paragraph', 'unicode': 'текст', 1: 'int key'},
+                'created_at': datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+                'predictions_score': 0.25,
+                'annotations_results': '',
+                'cost': Decimal('1.50'),
+            },
+            {'id': 2, 'data': {'image': '/data/upload/1.jpg'}, 'created_at': None, 'predictions_score': None},
+        ],
+    }
+
+
+def test_fast_json_renderer_matches_json_renderer():
+    """FastJSONRenderer renders the same bytes as rest_framework JSONRenderer"""
+    with patch.object(JSONRenderer, 'render', side_effect=AssertionError('fallback to JSONRenderer')):
+        fast = FastJSONRenderer().render(make_tasks())
+    regular = JSONRenderer().render(make_tasks())
+
+    assert fast == regular
+    assert b'\\u2028' in fast and b'\\u2029' in fast
+
+
+def test_fast_json_renderer_fallback():
+    """FastJSONRenderer falls back to JSONRenderer for data and options orjson can't handle"""
+    data = {'id': 2**70}
+    assert json.loads(FastJSONRenderer().render(data)) == data
+    assert FastJSONRenderer().render(None) == b''
+
+    media_type = 'application/json; indent=2'
+    assert FastJSONRenderer().render(make_tasks(), media_type) == JSONRenderer().render(make_tasks(), media_type)
+
+
+@pytest.mark.parametrize(
+    'value',
+    [0.0001, 1e-05, -2.5e-07, 9999999999999998.0, 1e16, -1.5e20, Decimal('0.00001'), [[3.2e-07]]],
+)
+def test_fast_json_renderer_float_notation(value):
+    """Floats are rendered in the same notation as by the stdlib json module"""
+    data = {'id': 1, 'score': value}
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+@pytest.mark.parametrize('value', [math.nan, math.inf, -math.inf])
+def test_fast_json_renderer_non_finite_floats(value):
+    """Non-finite floats raise the same error as rest_framework JSONRenderer instead of being rendered as null"""
+    data = {'tasks': [{'id': 1, 'predictions_score': value}]}
+    with pytest.raises(ValueError):
+        JSONRenderer().render(data)
+    with pytest.raises(ValueError):
+        FastJSONRenderer().render(data)
@@ -14,6 +14,7 @@ urlpatterns = [
     path('api/dm/project/', api.ProjectStateAPI.as_view(), name='dm-project'),
     path('api/dm/actions/', api.ProjectActionsAPI.as_view(), name='dm-actions'),
     path('api/dm/actions/<str:action_id>/form/', api.ProjectActionsFormAPI.as_view(), name='dm-actions-form'),
+    path('api/dm/actions/jobs/<str:job_id>/', api.ProjectActionsJobAPI.as_view(), name='dm-actions-job'),
     # path("api/dm/tasks/", api.TaskListAPI.as_view()),
     # path("api/dm/tasks/<int:pk>", api.TaskAPI.as_view()),
     path('projects/<int:pk>/', views.task_page, name='project-data'),
@@ -76,7 +76,12 @@ class AnnotationSubmittedTransition(ModelChangeTransition):
 
 
 @register_state_transition(
-    'annotation', 'annotation_updated', triggers_on_create=False, triggers_on_update=True, force_state_record=True
+    'annotation',
+    'annotation_updated',
+    triggers_on_create=False,
+    triggers_on_update=True,
+    force_state_record=True,
+    tracked_fields=['result', 'was_cancelled', 'ground_truth', 'lead_time', 'updated_by', 'last_action'],
 )
 class AnnotationUpdatedTransition(ModelChangeTransition):
     """
@@ -85,6 +90,8 @@ class AnnotationUpdatedTransition(ModelChangeTransition):
     Updates keep the annotation in SUBMITTED state but create audit trail records.
 
     Trigger: On update (triggers_on_create=False, triggers_on_update=True, force_state_record=True)
+    Tracked fields: changes of these fields are recorded in the audit trail,
+    changed_fields of the state record lists only tracked fields (e.g. updated_at is not listed)
     """
 
     def get_target_state(self, context: Optional[TransitionContext] = None) -> str:
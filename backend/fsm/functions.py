@@ -8,9 +8,10 @@ used across different parts of the codebase.
 import logging
 
 from core.current_request import CurrentContext
+from core.utils.common import batched_iterator
 from core.utils.iterators import iterate_queryset
-from fsm.state_inference import get_or_infer_state
-from fsm.utils import get_or_initialize_state, is_fsm_enabled
+from django.conf import settings
+from fsm.utils import is_fsm_enabled
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +35,7 @@ def backfill_fsm_states_for_tasks(storage_id, tasks_created, link_class):
         - Failures are logged but don't propagate to prevent breaking storage sync
         - FSM feature flag is checked before processing
         - Tasks are processed in chunks via iterate_queryset to avoid OOM issues
+        - State records are created by StateManager.bulk_initialize_states() per chunk
     """
     if tasks_created <= 0:
         return
@@ -43,6 +45,7 @@ def backfill_fsm_states_for_tasks(storage_id, tasks_created, link_class):
         return
 
     try:
+        from fsm.state_manager import get_state_manager
         from tasks.models import Task
 
         # Get task IDs created in this sync
@@ -57,13 +60,16 @@ def backfill_fsm_states_for_tasks(storage_id, tasks_created, link_class):
 
         logger.info(f'Storage sync: creating initial FSM states for {len(task_ids)} tasks')
 
-        # Use iterate_queryset to process tasks in chunks, avoiding OOM issues
+        # Use iterate_queryset to process tasks in chunks, avoiding OOM issues,
+        # states for each chunk are created by one bulk insert.
+        # data is loaded with the chunk because task_created transition stores data keys in context_data,
+        # a deferred field would cost one query per task
         user = CurrentContext.get_user()
-        tasks_qs = Task.objects.filter(id__in=task_ids)
+        StateManager = get_state_manager()
+        tasks_qs = Task.objects.filter(id__in=task_ids).only('id', 'project_id', 'is_labeled', 'data')
 
-        for task in iterate_queryset(tasks_qs):
-            inferred_state = get_or_infer_state(task)
-            get_or_initialize_state(task, user=user, inferred_state=inferred_state)
+        for tasks_chunk in batched_iterator(iterate_queryset(tasks_qs), settings.BATCH_SIZE):
+            StateManager.bulk_initialize_states(tasks_chunk, user=user, reason='Task created by storage sync')
 
         logger.info(f'Storage sync: FSM states created for {len(task_ids)} tasks')
     except Exception as e:
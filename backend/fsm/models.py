@@ -7,9 +7,12 @@ to avoid registration issues in LSE.
 """
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, FrozenSet, Optional
 
+from core.current_request import CurrentContext
+from django.core.exceptions import FieldDoesNotExist
 from django.db import models
+from fsm.registry import transition_registry
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +31,9 @@ class FsmHistoryStateModel(models.Model):
 
     Key features:
     - Intercepts save operations to trigger FSM transitions
-    - Tracks field changes for transition logic
+    - Tracks changes of the fields that registered transitions depend on
+      (see TransitionRegistry.get_tracked_fields), tracking can be turned off
+      for read-only iterations with fsm.utils.fsm_change_tracking_disabled()
     - Maintains CurrentContext for user/org tracking
     - Provides explicit transition determination
     - Fails gracefully - FSM errors don't break saves
@@ -72,15 +77,77 @@ class FsmHistoryStateModel(models.Model):
 
         PERFORMANCE: We store the raw field values here without processing them.
         This avoids accessing any ForeignKey fields (which would trigger queries).
-        We only process these values into _original_values in save() when we actually
-        need them for change detection.
+        Only tracked fields are stored, so models without update-triggered transitions
+        (e.g. Task with its large data field) don't keep a copy of every loaded row.
         """
         instance = super().from_db(db, field_names, values)
-        # Initialize as empty dict for safe access
-        instance._original_values = dict(zip(field_names, values))
+        if CurrentContext.is_fsm_change_tracking_disabled():
+            return instance
+
+        tracked_attnames = cls._get_fsm_tracked_attnames()
+        if tracked_attnames is None:
+            instance._original_values = dict(zip(field_names, values))
+        elif tracked_attnames:
+            instance._original_values = {
+                name: value for name, value in zip(field_names, values) if name in tracked_attnames
+            }
 
         return instance
 
+    @classmethod
+    def _get_fsm_tracked_attnames(cls) -> Optional[FrozenSet[str]]:
+        """
+        Get attnames of the fields snapshotted for change detection.
+
+        Field names declared on the transition registry are converted to attnames
+        (e.g. 'updated_by' -> 'updated_by_id') to match the from_db() format.
+
+        Returns:
+            Frozen set of attnames, or None if all fields are tracked
+        """
+        tracked_fields = transition_registry.get_tracked_fields(cls._meta.model_name)
+
+        # the registry returns the same object until transitions of the entity change
+        cached = cls.__dict__.get('_fsm_tracked_attnames')
+        if cached is not None and cached[0] is tracked_fields:
+            return cached[1]
+
+        tracked_attnames = None
+        if tracked_fields is not None:
+            tracked_attnames = frozenset(cls._get_fsm_field_attname(name) for name in tracked_fields)
+        cls._fsm_tracked_attnames = (tracked_fields, tracked_attnames)
+        return tracked_attnames
+
+    @classmethod
+    def _get_fsm_field_attname(cls, field_name: str) -> str:
+        try:
+            return cls._meta.get_field(field_name).attname
+        except FieldDoesNotExist:
+            return field_name
+
+    def _get_fsm_tracked_values(self) -> Dict[str, Any]:
+        """
+        Snapshot current values of the tracked fields.
+
+        Deferred fields are skipped, reading them would trigger a query per field.
+        """
+        if CurrentContext.is_fsm_change_tracking_disabled():
+            return {}
+
+        tracked_attnames = self._get_fsm_tracked_attnames()
+        if tracked_attnames is not None and not tracked_attnames:
+            return {}
+
+        deferred_fields = self.get_deferred_fields()
+        values = {}
+        for field in self._meta.concrete_fields:
+            if field.attname in deferred_fields:
+                continue
+            if tracked_attnames is not None and field.attname not in tracked_attnames:
+                continue
+            values[field.attname] = getattr(self, field.attname, None)
+        return values
+
     def __reduce_ex__(self, protocol):
         """
         Override serialization to exclude internal FSM tracking fields.
@@ -124,21 +191,13 @@ class FsmHistoryStateModel(models.Model):
         if not hasattr(self, '_original_values') or not self._original_values:
             return {}
 
+        # Only fields captured in _original_values are checked,
+        # deferred and untracked fields are considered unchanged
         changed = {}
-        for field in self._meta.fields:
-            # Only check fields that were captured in _original_values
-            # Fields that were deferred during capture won't be in _original_values
-            # and should be considered unchanged
-            if field.attname not in self._original_values:
-                continue
-            if field.is_relation and field.many_to_many:
-                continue
-
-            old_value = self._original_values[field.attname]
-            new_value = getattr(self, field.attname, None)
-
+        for attname, old_value in self._original_values.items():
+            new_value = getattr(self, attname, None)
             if old_value != new_value:
-                changed[field.attname] = (old_value, new_value)
+                changed[attname] = (old_value, new_value)
         return changed
 
     def _determine_fsm_transitions(self, is_creating: bool = None, changed_fields: dict = None) -> list:
@@ -389,11 +448,7 @@ class FsmHistoryStateModel(models.Model):
         # After successful save, update _original_values to current values
         # This ensures subsequent saves can detect changes correctly
         # Store attname values (raw PK for ForeignKey fields) to match from_db() format
-        self._original_values = {}
-        for field in self._meta.fields:
-            if field.is_relation and field.many_to_many:
-                continue
-            self._original_values[field.attname] = getattr(self, field.attname, None)
+        self._original_values = self._get_fsm_tracked_values()
 
         # After successful save, trigger FSM transitions if enabled and not skipped
         should_execute = not skip_fsm and self._should_execute_fsm()
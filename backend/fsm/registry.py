@@ -7,7 +7,7 @@ allowing the FSM to be decoupled from concrete implementations.
 
 import logging
 import typing
-from typing import Dict, Optional, Type
+from typing import Dict, FrozenSet, Optional, Type
 
 from django.db.models import Model, TextChoices
 
@@ -243,6 +243,7 @@ class TransitionRegistry:
 
     def __init__(self):
         self._transitions: Dict[str, Dict[str, 'BaseTransition']] = {}
+        self._tracked_fields_cache: Dict[str, Optional[FrozenSet[str]]] = {}
 
     def register(self, entity_name: str, transition_name: str, transition_class: 'BaseTransition'):
         """
@@ -257,6 +258,7 @@ class TransitionRegistry:
             self._transitions[entity_name] = {}
 
         self._transitions[entity_name][transition_name] = transition_class
+        self._tracked_fields_cache.pop(entity_name, None)
 
     def get_transition(self, entity_name: str, transition_name: str) -> Optional['BaseTransition']:
         """
@@ -283,6 +285,40 @@ class TransitionRegistry:
         """
         return self._transitions.get(entity_name, {}).copy()
 
+    def get_tracked_fields(self, entity_name: str) -> Optional[FrozenSet[str]]:
+        """
+        Get fields whose changes the transitions of an entity type depend on.
+
+        FsmHistoryStateModel snapshots only these fields for change detection.
+        The set is built from trigger fields and tracked fields of transitions
+        triggered on update. A transition triggered on any update without declared
+        tracked fields requires all fields to be tracked.
+
+        Args:
+            entity_name: Name of the entity type
+
+        Returns:
+            Frozen set of field names, or None if all fields must be tracked
+        """
+        if entity_name in self._tracked_fields_cache:
+            return self._tracked_fields_cache[entity_name]
+
+        tracked_fields = set()
+        for transition_class in self._transitions.get(entity_name, {}).values():
+            if not getattr(transition_class, '_triggers_on_update', True):
+                continue
+            trigger_fields = getattr(transition_class, '_trigger_fields', None) or []
+            declared_fields = getattr(transition_class, '_tracked_fields', None)
+            if not trigger_fields and declared_fields is None:
+                tracked_fields = None
+                break
+            tracked_fields.update(trigger_fields)
+            tracked_fields.update(declared_fields or [])
+
+        result = frozenset(tracked_fields) if tracked_fields is not None else None
+        self._tracked_fields_cache[entity_name] = result
+        return result
+
     def list_entities(self) -> list[str]:
         """Get a list of all registered entity types."""
         return list(self._transitions.keys())
@@ -294,6 +330,7 @@ class TransitionRegistry:
         Useful for testing to ensure clean state between tests.
         """
         self._transitions.clear()
+        self._tracked_fields_cache.clear()
 
 
 # Global transition registry instance
@@ -307,6 +344,7 @@ def register_state_transition(
     triggers_on_update: bool = True,
     triggers_on: list = None,
     force_state_record: bool = False,
+    tracked_fields: list = None,
 ):
     """
     Decorator to register a state transition class with trigger metadata.
@@ -321,6 +359,9 @@ def register_state_transition(
         triggers_on_update: If True, can trigger on updates (default: True)
         triggers_on: List of field names that trigger this transition
         force_state_record: If True, creates state record even if state doesn't change (for audit trails)
+        tracked_fields: Fields the transition reads from changed_fields in addition to triggers_on.
+            Transitions triggered on any update should declare them, otherwise all model
+            fields are tracked for change detection
 
     Example:
         # Trigger only on creation
@@ -338,6 +379,11 @@ def register_state_transition(
                                    triggers_on=['maximum_annotations', 'overlap_cohort_percentage'])
         class ProjectSettingsChangedTransition(ModelChangeTransition):
             pass
+
+        # Trigger on any update, only record changes of specific fields
+        @register_state_transition('annotation', 'annotation_updated', tracked_fields=['result'])
+        class AnnotationUpdatedTransition(ModelChangeTransition):
+            pass
     """
 
     def decorator(transition_class: 'BaseTransition') -> 'BaseTransition':
@@ -347,6 +393,7 @@ def register_state_transition(
         transition_class._trigger_fields = triggers_on or []
         transition_class._transition_name = transition_name  # Store the registered transition name
         transition_class._force_state_record = force_state_record  # Store whether to force state record creation
+        transition_class._tracked_fields = tracked_fields  # Store fields needed for change detection
 
         transition_registry.register(entity_name, transition_name, transition_class)
         return transition_class
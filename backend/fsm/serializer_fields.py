@@ -26,6 +26,7 @@ Note:
 
 from core.current_request import CurrentContext
 from core.feature_flags import flag_set
+from django.db.models import Manager
 from fsm.state_manager import StateManager
 from rest_framework import serializers
 
@@ -66,6 +67,11 @@ class FSMStateField(serializers.ReadOnlyField):
 
         # Result: Calls StateManager.get_current_state_value()
         # Still efficient due to StateManager caching
+
+    Example with a list serializer without annotations:
+        serializer = TaskSerializer(page, many=True)
+
+        # Result: Calls StateManager.get_current_state_values() once for the whole page
     """
 
     def __init__(self, **kwargs):
@@ -73,6 +79,42 @@ class FSMStateField(serializers.ReadOnlyField):
         # instead of a specific attribute, since we check multiple possible attributes
         kwargs.setdefault('source', '*')
         super().__init__(**kwargs)
+        # states resolved for the page of the parent list serializer, {pk: state}
+        self._page_states = {}
+
+    def _get_page(self):
+        """Get already fetched instances of the parent list serializer if there is one"""
+        list_serializer = getattr(self.parent, 'parent', None)
+        if not isinstance(list_serializer, serializers.ListSerializer):
+            return None
+        page = list_serializer.instance
+        # a manager would be re-evaluated by iteration, so it doesn't help to avoid queries
+        if page is None or isinstance(page, Manager):
+            return None
+        return page
+
+    def _get_state(self, instance):
+        """
+        Get state from the state manager, the whole page is resolved at once
+        when the field is used by a list serializer.
+        """
+        page = self._get_page()
+        if page is None:
+            return StateManager.get_current_state_value(instance)
+
+        if instance.pk not in self._page_states:
+            entities = [
+                item
+                for item in page
+                if type(item) is type(instance)
+                and item.pk not in self._page_states
+                and not hasattr(item, 'state')
+                and not hasattr(item, 'current_state')
+            ]
+            if instance not in entities:
+                entities = [instance]
+            self._page_states.update(StateManager.get_current_state_values(entities))
+        return self._page_states.get(instance.pk)
 
     def to_representation(self, instance):
         """
@@ -108,9 +150,9 @@ class FSMStateField(serializers.ReadOnlyField):
 
         # Fallback: Query the state manager
         # This happens when the queryset wasn't annotated
-        # StateManager has its own caching, so this is still efficient
+        # StateManager has its own caching, and list serializers resolve the whole page at once
         try:
-            return StateManager.get_current_state_value(instance)
+            return self._get_state(instance)
         except Exception:
             # If FSM is disabled or state model not found, return None
             return None
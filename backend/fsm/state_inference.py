@@ -1,8 +1,9 @@
 import logging
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
 
 from core.utils.common import load_func
 from django.conf import settings
+from django.db.models import Exists, Model, OuterRef
 
 logger = logging.getLogger(__name__)
 
@@ -43,20 +44,14 @@ def _get_or_infer_state(entity) -> Optional[str]:
         # If no tasks exist, project is CREATED
         # If any tasks are completed, project is at least IN_PROGRESS
         # If all tasks are completed, project is COMPLETED
-        tasks = entity.tasks.all()
-        if not tasks.exists():
-            return ProjectStateChoices.CREATED
-
-        # Count labeled tasks to determine project state
-        total_tasks = tasks.count()
-        labeled_tasks = tasks.filter(is_labeled=True).count()
-
-        if labeled_tasks == 0:
-            return ProjectStateChoices.CREATED
-        elif labeled_tasks == total_tasks:
-            return ProjectStateChoices.COMPLETED
-        else:
-            return ProjectStateChoices.IN_PROGRESS
+        task_number = getattr(entity, 'task_number', None)
+        finished_task_number = getattr(entity, 'finished_task_number', None)
+        if task_number is not None and finished_task_number is not None:
+            # Counters are already annotated by Project.objects.with_counts(), no query needed
+            return _infer_project_state(
+                has_labeled_tasks=finished_task_number > 0, has_unlabeled_tasks=finished_task_number < task_number
+            )
+        return infer_projects_states([entity.pk]).get(entity.pk, ProjectStateChoices.CREATED)
     elif entity_type == 'annotation':
         # Annotations are SUBMITTED when created
         return AnnotationStateChoices.SUBMITTED
@@ -72,6 +67,75 @@ def _get_or_infer_state(entity) -> Optional[str]:
         return None
 
 
+def _infer_project_state(has_labeled_tasks: bool, has_unlabeled_tasks: bool) -> str:
+    from fsm.state_choices import ProjectStateChoices
+
+    if not has_labeled_tasks:
+        return ProjectStateChoices.CREATED
+    elif not has_unlabeled_tasks:
+        return ProjectStateChoices.COMPLETED
+    else:
+        return ProjectStateChoices.IN_PROGRESS
+
+
+def infer_projects_states(project_ids: Iterable[int]) -> Dict[int, str]:
+    """
+    Infer states for many projects with one query.
+
+    Project state only depends on whether the project has labeled and unlabeled tasks,
+    so instead of counting tasks two EXISTS subqueries per project are used, both are
+    served by the (project, is_labeled) index of tasks and stop at the first found row.
+
+    Args:
+        project_ids: Ids of projects to infer states for
+
+    Returns:
+        Mapping of project id to inferred state, missing projects are omitted
+    """
+    from projects.models import Project
+    from tasks.models import Task
+
+    project_ids = list(project_ids)
+    if not project_ids:
+        return {}
+
+    rows = (
+        Project._base_manager.filter(id__in=project_ids)
+        .annotate(
+            has_labeled_tasks=Exists(Task.objects.filter(project_id=OuterRef('pk'), is_labeled=True)),
+            has_unlabeled_tasks=Exists(Task.objects.filter(project_id=OuterRef('pk'), is_labeled=False)),
+        )
+        .values_list('id', 'has_labeled_tasks', 'has_unlabeled_tasks')
+    )
+    return {
+        project_id: _infer_project_state(has_labeled_tasks, has_unlabeled_tasks)
+        for project_id, has_labeled_tasks, has_unlabeled_tasks in rows
+    }
+
+
+def _bulk_infer_states(entities: List[Model]) -> Dict[int, Optional[str]]:
+    """
+    Infer states for many entities of the same type.
+
+    Projects are inferred by one query (see infer_projects_states), other entities
+    are inferred in memory by get_or_infer_state().
+
+    Returns:
+        Mapping of entity pk to inferred state
+    """
+    if not entities:
+        return {}
+
+    if entities[0]._meta.model_name.lower() == 'project':
+        return infer_projects_states([entity.pk for entity in entities])
+    return {entity.pk: get_or_infer_state(entity) for entity in entities}
+
+
 def get_or_infer_state(entity) -> Optional[str]:
     func = load_func(settings.FSM_INFERENCE_FUNCTION)
     return func(entity)
+
+
+def get_or_infer_states(entities: List[Model]) -> Dict[int, Optional[str]]:
+    func = load_func(settings.FSM_BULK_INFERENCE_FUNCTION)
+    return func(entities)
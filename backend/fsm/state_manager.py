@@ -14,9 +14,12 @@ from core.feature_flags import flag_set
 from django.conf import settings
 from django.core.cache import cache, caches
 from django.db.models import Model, QuerySet
-from fsm.registry import get_state_model_for_entity
+from fsm.registry import get_state_model_for_entity, transition_registry
+from fsm.state_inference import get_or_infer_states
 from fsm.state_models import BaseState
 from fsm.transition_executor import execute_transition_with_state_manager
+from fsm.transitions import TransitionContext
+from fsm.utils import _get_initialization_transition_name, generate_uuid7, resolve_organization_id
 
 logger = logging.getLogger(__name__)
 
@@ -485,34 +488,216 @@ class StateManager:
             },
         )
 
+    @classmethod
+    def get_current_state_values(cls, entities: List[Model]) -> Dict[Any, Optional[str]]:
+        """
+        Get current states for many entities of the same type.
+
+        Cached states are read by one get_many(), all cache misses are resolved
+        by one query against the state model (see BaseState.get_current_state_values)
+        and written back with set_many().
+
+        Args:
+            entities: Entities of the same model to get current states for
+
+        Returns:
+            Mapping of entity pk to current state (None if the entity has no state)
+
+        Raises:
+            StateManagerError: If no state model found
+        """
+        if not entities or not cls._is_fsm_enabled():
+            return {}
+
+        state_model = get_state_model_for_entity(entities[0])
+        if not state_model:
+            raise StateManagerError(
+                f'No state model found for {entities[0]._meta.model_name} when getting current states'
+            )
+
+        fsm_cache = get_fsm_cache()
+        cache_keys = {entity.pk: cls.get_cache_key(entity) for entity in entities}
+        cached_states = fsm_cache.get_many(list(cache_keys.values()))
+
+        states, missed_ids = {}, []
+        for pk, cache_key in cache_keys.items():
+            cached_state = cached_states.get(cache_key)
+            if cached_state is None:
+                missed_ids.append(pk)
+            states[pk] = cached_state
+
+        if missed_ids:
+            try:
+                db_states = state_model.get_current_state_values(missed_ids)
+            except Exception as e:
+                logger.error(
+                    'FSM: Error getting current states',
+                    extra={
+                        'event': 'fsm.get_states_error',
+                        'entity_type': entities[0]._meta.label_lower,
+                        'entity_count': len(missed_ids),
+                        'organization_id': CurrentContext.get_organization_id(),
+                        'error': str(e),
+                    },
+                    exc_info=True,
+                )
+                raise StateManagerError(f'Error getting current states: {e}') from e
+
+            states.update(db_states)
+            if db_states:
+                fsm_cache.set_many({cache_keys[pk]: state for pk, state in db_states.items()}, cls.CACHE_TTL)
+
+        logger.info(
+            'FSM: Current states fetched in bulk',
+            extra={
+                'event': 'fsm.bulk_get_states',
+                'entity_type': entities[0]._meta.label_lower,
+                'entity_count': len(cache_keys),
+                'cache_miss_count': len(missed_ids),
+                'organization_id': CurrentContext.get_organization_id(),
+            },
+        )
+        return states
+
     @classmethod
     def warm_cache(cls, entities: List[Model]):
         """
         Warm cache with current states for a list of entities.
 
-        Basic implementation that can be optimized by Enterprise with
-        bulk queries and advanced caching strategies.
+        Cache misses are resolved by one query and written back with set_many(),
+        see get_current_state_values().
         """
-        cache_updates = {}
-        organization_id = CurrentContext.get_organization_id()
-        for entity in entities:
-            current_state = cls.get_current_state_value(entity)
-            if current_state:
-                cache_key = cls.get_cache_key(entity)
-                cache_updates[cache_key] = current_state
-
-        if cache_updates:
-            fsm_cache = get_fsm_cache()
-            fsm_cache.set_many(cache_updates, cls.CACHE_TTL)
+        states = cls.get_current_state_values(entities)
+        warmed_count = sum(1 for state in states.values() if state)
+        if warmed_count:
+            organization_id = CurrentContext.get_organization_id()
             logger.info(
                 'FSM: Cache warmed',
                 extra={
                     'event': 'fsm.cache_warmed',
-                    'entity_count': len(cache_updates),
+                    'entity_count': warmed_count,
                     **{'organization_id': organization_id if organization_id else None},
                 },
             )
 
+    @classmethod
+    def bulk_initialize_states(cls, entities: List[Model], user=None, organization_id=None, reason: str = '') -> int:
+        """
+        Create initial state records for many entities of the same type at once.
+
+        Used after bulk_create() (imports, storage syncs) instead of per entity
+        get_or_initialize_state() calls: states are inferred in memory, entities with
+        existing state records are found by one query, new records are inserted by one
+        bulk_create() with pre-generated UUID7 ids and the cache is filled by set_many().
+
+        Args:
+            entities: Entities of the same model to initialize states for
+            user: User triggering the initialization
+            organization_id: Organization ID, resolved from the first entity if not passed
+            reason: Human-readable reason for the state records
+
+        Returns:
+            Number of created state records
+        """
+        if not entities or not cls._is_fsm_enabled(user=user):
+            return 0
+
+        # Skip if FSM is temporarily disabled (e.g., during cleanup or bulk operations)
+        if CurrentContext.is_fsm_disabled():
+            return 0
+
+        state_model = get_state_model_for_entity(entities[0])
+        if not state_model:
+            raise StateManagerError(
+                f'No state model found for {entities[0]._meta.model_name} when initializing states in bulk'
+            )
+
+        entity_type = entities[0]._meta.model_name.lower()
+        entity_field_name = state_model._get_entity_field_name()
+        if organization_id is None:
+            organization_id = resolve_organization_id(entities[0], user)
+
+        # entities which already have state records are not touched
+        existing_ids = set(
+            state_model.objects.filter(**{f'{entity_field_name}_id__in': [entity.pk for entity in entities]})
+            .order_by()
+            .values_list(f'{entity_field_name}_id', flat=True)
+            .distinct()
+        )
+
+        new_entities = [entity for entity in entities if entity.pk not in existing_ids]
+        inferred_states = get_or_infer_states(new_entities)
+
+        state_records, cache_updates = [], {}
+        for entity in new_entities:
+            new_state = inferred_states.get(entity.pk)
+            transition_name = _get_initialization_transition_name(entity_type, new_state) if new_state else None
+            if transition_name is None:
+                continue
+
+            context_data, record_reason = cls._prepare_initialization_transition(
+                entity, entity_type, transition_name, new_state, user, organization_id, reason
+            )
+            state_records.append(
+                state_model(
+                    id=generate_uuid7(),
+                    **{entity_field_name: entity},
+                    state=new_state,
+                    previous_state=None,
+                    transition_name=transition_name,
+                    triggered_by=user,
+                    context_data=context_data,
+                    reason=record_reason,
+                    organization_id=organization_id,
+                    **state_model.get_denormalized_fields(entity),
+                )
+            )
+            cache_updates[cls.get_cache_key(entity)] = new_state
+
+        if not state_records:
+            return 0
+
+        state_model.objects.bulk_create(state_records, batch_size=settings.BATCH_SIZE)
+        get_fsm_cache().set_many(cache_updates, cls.CACHE_TTL)
+
+        logger.info(
+            'FSM: States initialized in bulk',
+            extra={
+                'event': 'fsm.bulk_initialize_states',
+                'entity_type': entities[0]._meta.label_lower,
+                'entity_count': len(state_records),
+                'skipped_count': len(entities) - len(state_records),
+                'organization_id': organization_id,
+            },
+        )
+        return len(state_records)
+
+    @classmethod
+    def _prepare_initialization_transition(
+        cls, entity: Model, entity_type: str, transition_name: str, new_state: str, user, organization_id, reason: str
+    ):
+        """
+        Build context_data and reason of an initial state record the same way execute_transition() does:
+        the registered transition is instantiated with the entity transition data and prepared
+        against a context without current state. Post transition hooks are not executed.
+        """
+        transition_class = transition_registry.get_transition(entity_type, transition_name)
+        if not transition_class:
+            return {}, reason
+
+        transition_data = entity._get_fsm_transition_data() if hasattr(entity, '_get_fsm_transition_data') else {}
+        transition = transition_class(**{**transition_data, 'is_creating': True, 'changed_fields': {}})
+        context = TransitionContext(
+            entity=entity,
+            current_user=user,
+            current_state_object=None,
+            current_state=None,
+            target_state=new_state,
+            organization_id=organization_id,
+        )
+        context_data = transition.prepare_and_validate(context)
+        return context_data, reason or transition.get_reason(context)
+
     @classmethod
     def execute_transition(
         cls, entity: Model, transition_name: str, transition_data: Dict[str, Any] = None, user=None, **context_kwargs
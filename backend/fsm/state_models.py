@@ -11,11 +11,12 @@ imported and registered, allowing LSE to register its own extended versions.
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 from django.conf import settings
-from django.db import models
-from django.db.models import QuerySet, UUIDField
+from django.db import connection, models
+from django.db.models import F, QuerySet, UUIDField, Window
+from django.db.models.functions import RowNumber
 from fsm.registry import register_state_model
 from fsm.state_choices import (
     AnnotationStateChoices,
@@ -156,6 +157,35 @@ class BaseState(models.Model):
         current_state = cls.objects.filter(**{entity_field: entity}).order_by('-id').first()
         return current_state.state if current_state else None
 
+    @classmethod
+    def get_current_state_values(cls, entity_ids: Iterable[int]) -> Dict[int, str]:
+        """
+        Get current state values for many entities with one query.
+
+        Uses DISTINCT ON (entity_id) with UUID7 ordering on PostgreSQL and
+        a ROW_NUMBER() window over the same ordering on other databases.
+
+        Returns:
+            Mapping of entity id to its current state, entities without states are omitted
+        """
+        entity_ids = list(entity_ids)
+        if not entity_ids:
+            return {}
+
+        entity_field_id = f'{cls._get_entity_field_name()}_id'
+        queryset = cls.objects.filter(**{f'{entity_field_id}__in': entity_ids})
+        if connection.vendor == 'postgresql':
+            queryset = queryset.order_by(entity_field_id, '-id').distinct(entity_field_id)
+        else:
+            queryset = (
+                queryset.order_by()
+                .annotate(
+                    row_number=Window(RowNumber(), partition_by=[F(entity_field_id)], order_by=F('id').desc())
+                )
+                .filter(row_number=1)
+            )
+        return dict(queryset.values_list(entity_field_id, 'state'))
+
     @classmethod
     def get_state_history(cls, entity) -> QuerySet['BaseState']:
         """Get complete state history for an entity"""
@@ -7,7 +7,9 @@ and API endpoints.
 from datetime import datetime
 from unittest.mock import patch
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from fsm.state_manager import get_state_manager
 from fsm.state_models import AnnotationState, ProjectState, TaskState
 from projects.tests.factories import ProjectFactory
@@ -432,3 +434,60 @@ class TestStateManager(TestCase):
         # Verify state is still CREATED
         current_state = self.StateManager.get_current_state_value(self.task)
         assert current_state == 'CREATED'
+
+    @patch('fsm.state_manager.flag_set')
+    def test_bulk_initialize_states(self, mock_flag_set):
+        """Test bulk state initialization skips entities with existing states"""
+        from django.core.cache import cache
+        from tasks.models import Task
+
+        mock_flag_set.return_value = True
+
+        # bulk_create doesn't trigger state creation on save
+        tasks = Task.objects.bulk_create([Task(project=self.project, data={'text': str(i)}) for i in range(3)])
+        cache.clear()
+
+        created = self.StateManager.bulk_initialize_states(tasks + [self.task], user=self.user)
+
+        assert created == 3
+        assert TaskState.objects.filter(task__in=tasks, state='CREATED').count() == 3
+        assert TaskState.objects.filter(task=self.task).count() == 1
+        assert self.StateManager.get_current_state_value(tasks[0]) == 'CREATED'
+
+        # Records have the same context data and reason as created by the registered transition
+        state = TaskState.objects.get(task=tasks[0])
+        assert state.transition_name == 'task_created'
+        assert state.context_data == {'project_id': self.project.id, 'data_keys': ['text']}
+        assert state.reason == 'Task created in the system'
+
+        # Second call is a no-op
+        assert self.StateManager.bulk_initialize_states(tasks, user=self.user) == 0
+        assert TaskState.objects.filter(task__in=tasks).count() == 3
+
+    @patch('fsm.functions.is_fsm_enabled', return_value=True)
+    @patch('fsm.state_manager.flag_set', return_value=True)
+    def test_backfill_fsm_states_for_tasks_query_count(self, mock_flag_set, mock_is_fsm_enabled):
+        """Test storage sync state backfill runs the same number of queries for any chunk size"""
+        from django.core.cache import cache
+        from fsm.functions import backfill_fsm_states_for_tasks
+        from io_storages.s3.models import S3ImportStorageLink
+        from io_storages.tests.factories import S3ImportStorageFactory
+        from tasks.models import Task
+
+        storage = S3ImportStorageFactory(project=self.project)
+
+        def backfill_queries(tasks_number):
+            tasks = Task.objects.bulk_create(
+                [Task(project=self.project, data={'text': str(i)}) for i in range(tasks_number)]
+            )
+            S3ImportStorageLink.objects.bulk_create(
+                [S3ImportStorageLink(task=task, key=str(task.id), storage=storage) for task in tasks]
+            )
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                backfill_fsm_states_for_tasks(storage.id, tasks_number, S3ImportStorageLink)
+            assert TaskState.objects.filter(task__in=tasks, state='CREATED').count() == tasks_number
+            assert TaskState.objects.get(task=tasks[0]).context_data['data_keys'] == ['text']
+            return len(queries.captured_queries)
+
+        assert backfill_queries(2) == backfill_queries(10)
@@ -13,7 +13,10 @@ import pytest
 from core.current_request import CurrentContext
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from fsm.state_choices import AnnotationStateChoices, ProjectStateChoices, TaskStateChoices
+from fsm.state_inference import get_or_infer_state, infer_projects_states
 from fsm.state_manager import StateManager, StateManagerError
 from fsm.state_models import AnnotationState, ProjectState, TaskState
 from fsm.utils import get_current_state_safe, is_fsm_enabled, resolve_organization_id
@@ -293,6 +296,31 @@ class TestLSOFSMIntegration:
         state = StateManager.get_current_state_value(annotation)
         assert state == AnnotationStateChoices.SUBMITTED
 
+    def test_annotation_update_records_tracked_changed_fields(self):
+        """
+        Test annotation update audit record lists changes of tracked fields only.
+
+        Validates:
+        - annotation_updated record is created on update
+        - changed_fields contains changed fields declared by the transition
+        - Changes of untracked fields (import_id, updated_at) are not listed
+        """
+        project = ProjectFactory(organization=self.org)
+        task = TaskFactory(project=project)
+        annotation = AnnotationFactory(task=task, project=project, completed_by=self.user, lead_time=1.0)
+
+        annotation = Annotation.objects.get(pk=annotation.pk)
+        annotation.result = [{'test': 'updated'}]
+        annotation.lead_time = 2.0
+        annotation.import_id = 100
+        annotation.save()
+
+        state = StateManager.get_current_state_object(annotation)
+        assert state.transition_name == 'annotation_updated'
+        assert {'result', 'lead_time'} <= set(state.context_data['changed_fields'])
+        assert 'import_id' not in state.context_data['changed_fields']
+        assert 'updated_at' not in state.context_data['changed_fields']
+
     def test_state_manager_with_multiple_transitions(self):
         """
         Test that multiple state transitions are recorded correctly.
@@ -513,6 +541,70 @@ class TestLSOFSMUtilities:
             state = StateManager.get_current_state_value(project)
             assert state == ProjectStateChoices.CREATED
 
+    def test_get_current_state_values_bulk(self):
+        """
+        Test bulk current state retrieval for a page of entities.
+
+        Validates:
+        - Latest state is returned for each entity
+        - Cache misses are resolved by one state query
+        - Resolved states are written back to the cache
+        """
+        project = ProjectFactory(organization=self.org)
+        tasks = [TaskFactory(project=project) for _ in range(3)]
+        StateManager.transition_state(
+            entity=tasks[0], new_state=TaskStateChoices.IN_PROGRESS, transition_name='test', user=self.user
+        )
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            states = StateManager.get_current_state_values(tasks)
+        state_queries = [query for query in queries.captured_queries if 'fsm_taskstate' in query['sql']]
+
+        assert states == {
+            tasks[0].pk: TaskStateChoices.IN_PROGRESS,
+            tasks[1].pk: TaskStateChoices.CREATED,
+            tasks[2].pk: TaskStateChoices.CREATED,
+        }
+        assert len(state_queries) == 1
+
+        with CaptureQueriesContext(connection) as queries:
+            assert StateManager.get_current_state_values(tasks) == states
+        assert not [query for query in queries.captured_queries if 'fsm_taskstate' in query['sql']]
+
+    def test_infer_projects_states_bulk(self):
+        """
+        Test project state inference for many projects with one query.
+
+        Validates:
+        - Project without labeled tasks is CREATED
+        - Project with some labeled tasks is IN_PROGRESS
+        - Project with all tasks labeled is COMPLETED
+        - Single project inference gives the same result
+        """
+        created = ProjectFactory(organization=self.org)
+        TaskFactory(project=created)
+        in_progress = ProjectFactory(organization=self.org)
+        TaskFactory(project=in_progress, is_labeled=True)
+        TaskFactory(project=in_progress, is_labeled=False)
+        completed = ProjectFactory(organization=self.org)
+        TaskFactory(project=completed, is_labeled=True)
+        empty = ProjectFactory(organization=self.org)
+        projects = [created, in_progress, completed, empty]
+
+        with CaptureQueriesContext(connection) as queries:
+            states = infer_projects_states([project.id for project in projects])
+
+        assert len(queries.captured_queries) == 1
+        assert states == {
+            created.id: ProjectStateChoices.CREATED,
+            in_progress.id: ProjectStateChoices.IN_PROGRESS,
+            completed.id: ProjectStateChoices.COMPLETED,
+            empty.id: ProjectStateChoices.CREATED,
+        }
+        for project in projects:
+            assert get_or_infer_state(project) == states[project.id]
+
     def test_fsm_disabled_via_current_context(self):
         """
         Test CurrentContext.set_fsm_disabled() directly.
@@ -11,7 +11,7 @@ import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Any, Dict, Optional
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from django.test import TestCase, TransactionTestCase
 from fsm.registry import transition_registry
@@ -313,6 +313,71 @@ class PerformanceTests(TestCase):
         assert complex_transitions[0].context is None
 
 
+class ChangeTrackingPerformanceTests(TestCase):
+    """
+    Benchmark of FsmHistoryStateModel change tracking overhead per loaded instance.
+
+    Compares tracking of all fields (previous behavior) with tracking of the fields
+    declared on the transition registry, and with tracking disabled.
+    """
+
+    TASKS_NUMBER = 200
+
+    @classmethod
+    def setUpTestData(cls):
+        from projects.tests.factories import ProjectFactory
+        from tasks.models import Task
+
+        cls.project = ProjectFactory()
+        Task.objects.bulk_create(
+            [Task(project=cls.project, data={'text': 'x' * 10000, 'index': i}) for i in range(cls.TASKS_NUMBER)]
+        )
+
+    def _measure_loading(self):
+        import tracemalloc
+
+        from tasks.models import Task
+
+        queryset = Task.objects.filter(project=self.project)
+        list(queryset)  # warm up
+
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        tasks = list(queryset.all())
+        duration = time.perf_counter() - start_time
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        snapshot_entries = sum(len(task._original_values) for task in tasks)
+        return memory / len(tasks), duration / len(tasks), snapshot_entries
+
+    def test_change_tracking_overhead(self):
+        """
+        PERFORMANCE TEST: Per-instance memory and CPU cost of change tracking
+
+        Validates that Task instances don't snapshot fields when no transition depends on them.
+        """
+        from fsm.utils import fsm_change_tracking_disabled
+        from tasks.models import Task
+
+        # Previous behavior: all loaded fields are snapshotted
+        with patch.object(transition_registry, 'get_tracked_fields', return_value=None):
+            all_fields_memory, _, all_fields_entries = self._measure_loading()
+
+        tracked_fields = transition_registry.get_tracked_fields('task')
+        tracked_memory, _, tracked_entries = self._measure_loading()
+
+        with fsm_change_tracking_disabled():
+            disabled_memory, _, disabled_entries = self._measure_loading()
+
+        assert all_fields_entries >= self.TASKS_NUMBER * len(Task._meta.concrete_fields)
+        assert tracked_fields is not None
+        assert tracked_entries == len(tracked_fields) * self.TASKS_NUMBER
+        assert disabled_entries == 0
+        assert tracked_memory < all_fields_memory
+        assert disabled_memory < all_fields_memory
+
+
 class ConcurrencyTests(TransactionTestCase):
     """
     Concurrency tests for the declarative transition system.
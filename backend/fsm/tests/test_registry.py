@@ -157,3 +157,46 @@ class RegistryTests(TestCase):
         transitions = transition_registry.get_transitions_for_entity('decorated_entity')
         assert 'decorated_transition' in transitions
         assert transitions['decorated_transition'] == DecoratedTransition
+
+    def test_registry_tracked_fields(self):
+        """Test tracked fields are collected from transitions triggered on update"""
+
+        @register_state_transition('tracked_entity', 'created', triggers_on_create=True, triggers_on_update=False)
+        class CreatedTransition(BaseTransition):
+            def get_target_state(self, context: Optional[TransitionContext] = None) -> str:
+                return 'CREATED'
+
+            def transition(self, context):
+                return {}
+
+        # Nothing depends on field changes
+        assert transition_registry.get_tracked_fields('tracked_entity') == frozenset()
+
+        @register_state_transition('tracked_entity', 'labeled', triggers_on=['is_labeled'])
+        class LabeledTransition(BaseTransition):
+            def get_target_state(self, context: Optional[TransitionContext] = None) -> str:
+                return 'LABELED'
+
+            def transition(self, context):
+                return {}
+
+        @register_state_transition('tracked_entity', 'updated', tracked_fields=['result'])
+        class UpdatedTransition(BaseTransition):
+            def get_target_state(self, context: Optional[TransitionContext] = None) -> str:
+                return 'UPDATED'
+
+            def transition(self, context):
+                return {}
+
+        assert transition_registry.get_tracked_fields('tracked_entity') == frozenset({'is_labeled', 'result'})
+
+        # Transition triggered on any update without declared fields requires all fields
+        @register_state_transition('tracked_entity', 'any_update')
+        class AnyUpdateTransition(BaseTransition):
+            def get_target_state(self, context: Optional[TransitionContext] = None) -> str:
+                return 'UPDATED'
+
+            def transition(self, context):
+                return {}
+
+        assert transition_registry.get_tracked_fields('tracked_entity') is None
@@ -11,6 +11,7 @@ for INSERT-only architectures with millions of records.
 
 import logging
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Optional, Tuple
 
@@ -276,6 +277,26 @@ def is_fsm_enabled(user=None) -> bool:
     return CurrentContext.is_fsm_enabled()
 
 
+@contextmanager
+def fsm_change_tracking_disabled():
+    """
+    Don't snapshot field values for FSM change detection of models loaded inside the block.
+
+    Use it for read-only iterations: instances loaded here report no changed fields,
+    so saving them won't trigger FSM transitions that depend on field changes.
+
+    Example:
+        with fsm_change_tracking_disabled():
+            tasks = list(project.tasks.all())
+    """
+    previous = CurrentContext.is_fsm_change_tracking_disabled()
+    CurrentContext.set_fsm_change_tracking_disabled(True)
+    try:
+        yield
+    finally:
+        CurrentContext.set_fsm_change_tracking_disabled(previous)
+
+
 def get_current_state_safe(entity, user=None) -> Optional[str]:
     """
     Safely get current state with error handling.
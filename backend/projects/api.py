@@ -30,7 +30,14 @@ from ml.serializers import MLBackendSerializer
 from projects.functions.next_task import get_next_task
 from projects.functions.stream_history import get_label_stream_history
 from projects.functions.utils import recalculate_created_annotations_and_labels_from_scratch
-from projects.models import Project, ProjectImport, ProjectManager, ProjectReimport, ProjectSummary
+from projects.models import (
+    Project,
+    ProjectCounters,
+    ProjectImport,
+    ProjectManager,
+    ProjectReimport,
+    ProjectSummary,
+)
 from projects.serializers import (
     GetFieldsSerializer,
     ProjectCountsSerializer,
@@ -247,8 +254,10 @@ class ProjectCountsListAPI(generics.ListAPIView):
         serializer = GetFieldsSerializer(data=self.request.query_params)
         serializer.is_valid(raise_exception=True)
         fields = serializer.validated_data.get('include')
-        projects = Project.objects.with_counts(fields=fields).filter(
-            organization=self.request.user.active_organization
+        projects = (
+            Project.objects.with_counts(fields=fields)
+            .filter(organization=self.request.user.active_organization)
+            .annotate(counters_reconciled_at=F('materialized_counters__reconciled_at'))
         )
 
         # Only annotate FSM state for UI/API consumption when both feature flags are enabled
@@ -259,6 +268,15 @@ class ProjectCountsListAPI(generics.ListAPIView):
 
         return projects
 
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            # counters of the listed projects fall back to live aggregation, refresh them in background
+            ProjectCounters.schedule_reconcile(
+                [project.id for project in page if ProjectCounters.is_stale(project.counters_reconciled_at)]
+            )
+        return page
+
 
 @method_decorator(
     name='get',
@@ -760,6 +778,7 @@ class ProjectTaskListAPI(GetParentObjectMixin, generics.ListCreateAPIView, gener
         Task.delete_tasks_without_signals(Task.objects.filter(project=project))
         logger.info(f'calling reset project_id={project.id} ProjectTaskListAPI.delete()')
         project.summary.reset()
+        ProjectCounters.invalidate([project.id])
         emit_webhooks_for_instance(request.user.active_organization, None, WebhookAction.TASKS_DELETED, task_ids)
         return Response(status=204)
 
@@ -1,33 +1,63 @@
+from datetime import timedelta
+
 from core.feature_flags import flag_set
 from core.utils.db import SQCount
-from django.db.models import Count, OuterRef, Q
+from django.conf import settings
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, When
+from django.utils import timezone
 from tasks.models import Annotation, Prediction, Task
 
 
-def annotate_task_number(queryset):
+def annotate_counter(queryset, field, expression, materialized=True):
+    """Annotate a project counter, reading it from ProjectCounters while the row is fresh enough.
+
+    The live expression is used as a fallback when the counters row is missing, invalidated
+    or older than PROJECT_COUNTERS_MAX_STALENESS[field] seconds.
+    """
+    max_staleness = settings.PROJECT_COUNTERS_MAX_STALENESS.get(field) if materialized else None
+    if max_staleness is None:
+        return queryset.annotate(**{field: expression})
+
+    fresh_after = timezone.now() - timedelta(seconds=max_staleness)
+    return queryset.annotate(
+        **{
+            field: Case(
+                When(
+                    Q(materialized_counters__reconciled_at__gte=fresh_after),
+                    then=F(f'materialized_counters__{field}'),
+                ),
+                default=expression,
+                output_field=IntegerField(),
+            )
+        }
+    )
+
+
+def annotate_task_number(queryset, materialized=True):
     tasks = Task.objects.filter(project=OuterRef('id')).values_list('id')
-    return queryset.annotate(task_number=SQCount(tasks))
+    return annotate_counter(queryset, 'task_number', SQCount(tasks), materialized)
 
 
-def annotate_finished_task_number(queryset):
-    if flag_set('fflag_fix_back_plt_811_finished_task_number_01072025_short', user='auto'):
+def annotate_finished_task_number(queryset, materialized=True):
+    # the aggregate variant can't be mixed with the materialized counter in one CASE expression
+    if not materialized and flag_set('fflag_fix_back_plt_811_finished_task_number_01072025_short', user='auto'):
         return queryset.annotate(finished_task_number=Count('tasks', filter=Q(tasks__is_labeled=True)))
     else:
         tasks = Task.objects.filter(project=OuterRef('id'), is_labeled=True).values_list('id')
-        return queryset.annotate(finished_task_number=SQCount(tasks))
+        return annotate_counter(queryset, 'finished_task_number', SQCount(tasks), materialized)
 
 
-def annotate_total_predictions_number(queryset):
+def annotate_total_predictions_number(queryset, materialized=True):
     predictions = Prediction.objects.filter(project=OuterRef('id')).values('id')
-    return queryset.annotate(total_predictions_number=SQCount(predictions))
+    return annotate_counter(queryset, 'total_predictions_number', SQCount(predictions), materialized)
 
 
-def annotate_total_annotations_number(queryset):
+def annotate_total_annotations_number(queryset, materialized=True):
     subquery = Annotation.objects.filter(Q(project=OuterRef('pk')) & Q(was_cancelled=False)).values('id')
-    return queryset.annotate(total_annotations_number=SQCount(subquery))
+    return annotate_counter(queryset, 'total_annotations_number', SQCount(subquery), materialized)
 
 
-def annotate_num_tasks_with_annotations(queryset):
+def annotate_num_tasks_with_annotations(queryset, materialized=True):
     # @todo: check do we really need this counter?
     # this function is very slow because of tasks__id and distinct
     subquery = (
@@ -37,21 +67,21 @@ def annotate_num_tasks_with_annotations(queryset):
         .values('task__id')
         .distinct()
     )
-    return queryset.annotate(num_tasks_with_annotations=SQCount(subquery))
+    return annotate_counter(queryset, 'num_tasks_with_annotations', SQCount(subquery), materialized)
 
 
-def annotate_useful_annotation_number(queryset):
+def annotate_useful_annotation_number(queryset, materialized=True):
     subquery = Annotation.objects.filter(
         Q(project=OuterRef('pk')) & Q(was_cancelled=False) & Q(ground_truth=False) & Q(result__isnull=False)
     ).values('id')
-    return queryset.annotate(useful_annotation_number=SQCount(subquery))
+    return annotate_counter(queryset, 'useful_annotation_number', SQCount(subquery), materialized)
 
 
-def annotate_ground_truth_number(queryset):
+def annotate_ground_truth_number(queryset, materialized=True):
     subquery = Annotation.objects.filter(Q(project=OuterRef('pk')) & Q(ground_truth=True)).values('id')
-    return queryset.annotate(ground_truth_number=SQCount(subquery))
+    return annotate_counter(queryset, 'ground_truth_number', SQCount(subquery), materialized)
 
 
-def annotate_skipped_annotations_number(queryset):
+def annotate_skipped_annotations_number(queryset, materialized=True):
     subquery = Annotation.objects.filter(Q(project=OuterRef('pk')) & Q(was_cancelled=True)).values('id')
-    return queryset.annotate(skipped_annotations_number=SQCount(subquery))
+    return annotate_counter(queryset, 'skipped_annotations_number', SQCount(subquery), materialized)
@@ -0,0 +1,18 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from projects.models import ProjectCounters
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Recalculate materialized project counters used by project lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, default=None, help='project id, all projects by default')
+
+    def handle(self, *args, **options):
+        project_ids = [options['project']] if options['project'] else None
+        reconciled = ProjectCounters.reconcile(project_ids)
+        logger.debug(f'Project counters were reconciled for {reconciled} projects.')
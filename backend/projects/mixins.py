@@ -71,6 +71,18 @@ class ProjectMixin:
             tasks_number_changed,
         )
 
+    def update_tasks_stats_after_skip_queue_change(self):
+        """
+        Async start updating tasks stats (is_labeled) after skip_queue change
+        """
+        start_job_async_or_sync(self._update_tasks_stats_after_skip_queue_change)
+
+    def reconcile_summary(self):
+        """
+        Async start making project summary consistent with current tasks and annotations
+        """
+        start_job_async_or_sync(self._reconcile_summary)
+
     def has_permission(self, user):
         """
         Dummy stub for has_permission
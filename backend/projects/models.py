@@ -2,10 +2,12 @@
 """
 import json
 import logging
+from datetime import timedelta
 from typing import Any, Mapping, Optional
 
 from annoying.fields import AutoOneToOneField
 from core.current_request import CurrentContext
+from core.feature_flags import flag_set
 from core.label_config import (
     check_control_in_config_by_regex,
     check_toname_in_config_by_regex,
@@ -20,19 +22,22 @@ from core.label_config import (
     get_sample_task,
     validate_label_config,
 )
+from core.redis import _redis, redis_connected, start_job_async_or_sync, update_job_progress
 from core.utils.common import (
+    batched_iterator,
     create_hash,
     get_attr_or_item,
     load_func,
     merge_labels_counters,
 )
-from core.utils.db import batch_update_with_retry, fast_first, has_column_cached
+from core.utils.db import batch_update_with_retry, fast_first, has_column_cached, raw_cascade_delete
 from django.conf import settings
 from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxLengthValidator, MinLengthValidator
 from django.db import connection, models, transaction
-from django.db.models import Avg, BooleanField, Case, Count, GeneratedField, JSONField, Max, Q, Sum, Value, When
+from django.db.models import Avg, BooleanField, Case, Count, F, GeneratedField, JSONField, Max, Q, Sum, Value, When
 from django.db.models.expressions import RawSQL
+from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from fsm.models import FsmHistoryStateModel
@@ -123,11 +128,12 @@ class ProjectManager(models.Manager):
         """
         return self.get_queryset().with_state()
 
-    def with_counts(self, fields=None):
-        return self.with_counts_annotate(self.get_queryset(), fields=fields)
+    def with_counts(self, fields=None, materialized=True):
+        return self.with_counts_annotate(self.get_queryset(), fields=fields, materialized=materialized)
 
     @staticmethod
-    def with_counts_annotate(queryset, fields=None, exclude=None):
+    def with_counts_annotate(queryset, fields=None, exclude=None, materialized=True):
+        """Annotate counters, materialized=False forces live aggregation and ignores ProjectCounters"""
         available_fields = ProjectManager.ANNOTATED_FIELDS
         if fields is None:
             to_annotate = available_fields
@@ -138,7 +144,7 @@ class ProjectManager(models.Manager):
             to_annotate = {field: func for field, func in to_annotate.items() if field not in exclude}
 
         for _, annotate_func in to_annotate.items():  # noqa: F402
-            queryset = annotate_func(queryset)
+            queryset = annotate_func(queryset, materialized=materialized)
 
         return queryset
 
@@ -546,6 +552,55 @@ class Project(ProjectMixin, FsmHistoryStateModel):
             user = CurrentContext.get_user()
             update_project_state_after_task_change(self, user=user)
 
+        # tasks or their is_labeled were changed in bulk
+        ProjectCounters.invalidate([self.id])
+
+    def _get_changed_task_settings(self, update_fields=None):
+        """
+        Get settings affecting tasks states, counters and summary which are changed since the project was loaded
+        :param update_fields: Fields passed to save(), other fields are not written to DB
+        :return: Set of changed field names
+        """
+        original = {
+            'label_config': self.__original_label_config,
+            'maximum_annotations': self.__maximum_annotations,
+            'overlap_cohort_percentage': self.__overlap_cohort_percentage,
+            'skip_queue': self.__skip_queue,
+        }
+        # deferred fields are not loaded and not assigned, so they can't be changed
+        deferred_fields = self.get_deferred_fields()
+        changed = {
+            field
+            for field, value in original.items()
+            if field not in deferred_fields and getattr(self, field) != value
+        }
+        if update_fields is not None:
+            changed &= set(update_fields)
+        return changed
+
+    def _update_tasks_stats_after_skip_queue_change(self):
+        """
+        Update tasks stats (is_labeled) after skip_queue change
+        """
+        bulk_update_stats_project_tasks(
+            self.tasks.filter(Q(annotations__isnull=False) & Q(annotations__ground_truth=False))
+        )
+
+    def _reconcile_summary(self):
+        """
+        Ensure project.summary is consistent with current tasks / annotations
+        """
+        with transaction.atomic():
+            # Lock summary for update to avoid race conditions
+            summary = ProjectSummary.objects.select_for_update().get(project=self)
+            if not self.tasks.exists():
+                summary.reset()
+            elif (
+                not Annotation.objects.filter(project=self).exists()
+                and not AnnotationDraft.objects.filter(task__project=self).exists()
+            ):
+                summary.reset(tasks_data_based=False)
+
     def _batch_update_with_retry(self, queryset, batch_size=500, max_retries=3, **update_fields):
         batch_update_with_retry(queryset, batch_size, max_retries, **update_fields)
 
@@ -553,13 +608,24 @@ class Project(ProjectMixin, FsmHistoryStateModel):
         """
         Rearrange overlap depending on annotation count in tasks
         """
-        all_project_tasks = Task.objects.filter(project=self)
         max_annotations = self.maximum_annotations
         must_tasks = int(self.tasks.count() * self.overlap_cohort_percentage / 100 + 0.5)
         logger.info(
             f'Starting _rearrange_overlap_cohort with params: Project {str(self)} maximum_annotations '
             f'{max_annotations} and percentage {self.overlap_cohort_percentage}'
         )
+        if connection.vendor == 'postgresql':
+            self._rearrange_overlap_cohort_sql(must_tasks)
+        else:
+            self._rearrange_overlap_cohort_orm(must_tasks)
+
+    def _rearrange_overlap_cohort_orm(self, must_tasks):
+        """
+        Rearrange overlap using Django ORM, it's used for SQLite
+        :param must_tasks: Number of tasks which must have overlap = maximum_annotations
+        """
+        all_project_tasks = Task.objects.filter(project=self)
+        max_annotations = self.maximum_annotations
         tasks_with_max_annotations = all_project_tasks.annotate(
             anno=Count('annotations', filter=Q_task_finished_annotations & Q(annotations__ground_truth=False))
         ).filter(anno__gte=max_annotations)
@@ -594,8 +660,165 @@ class Project(ProjectMixin, FsmHistoryStateModel):
         # update is labeled after tasks rearrange overlap
         bulk_update_stats_project_tasks(all_project_tasks, project=self)
 
+    @staticmethod
+    def _is_labeled_in_overlap_sql():
+        """is_labeled can be calculated in the overlap UPDATE only when bulk_update_stats_project_tasks
+        would use the default bulk_update_is_labeled_by_overlap logic with total annotation counters
+        """
+        return (
+            settings.BULK_UPDATE_IS_LABELED == 'tasks.functions.bulk_update_is_labeled_by_overlap'
+            and flag_set('fflag_fix_back_plt_802_update_is_labeled_20062025_short', user='auto')
+            and not flag_set('fflag_fix_fit_1082_overlap_use_distinct_annotators', user='auto')
+        )
+
+    def _rearrange_overlap_cohort_sql(self, must_tasks):
+        """
+        Set-based overlap rearrangement for PostgreSQL.
+        Finished annotations are counted once into a temporary table where tasks are ranked with a window function:
+        tasks with count >= maximum_annotations keep maximum_annotations, then the most annotated tasks
+        fill the rest of the cohort, other tasks get overlap = 1.
+        Tasks are updated in id ordered batches, each batch is a short separate transaction.
+        :param must_tasks: Number of tasks which must have overlap = maximum_annotations
+        """
+        max_annotations = self.maximum_annotations
+        task_table, annotation_table = Task._meta.db_table, Annotation._meta.db_table
+        tmp_table = f'tmp_overlap_cohort_{self.id}'
+
+        is_labeled_in_sql = self._is_labeled_in_overlap_sql()
+        completed_sql = f'{task_table}.total_annotations'
+        if self.skip_queue == self.SkipQueue.IGNORE_SKIPPED:
+            completed_sql += f' + {task_table}.cancelled_annotations'
+        is_labeled_sql = f', is_labeled = ({completed_sql} >= t.new_overlap)' if is_labeled_in_sql else ''
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {tmp_table}')
+            try:
+                cursor.execute(
+                    f"""
+                    CREATE TEMPORARY TABLE {tmp_table} AS
+                    WITH counts AS (
+                        SELECT t.id,
+                               COUNT(a.id) FILTER (
+                                   WHERE a.was_cancelled = false AND a.result IS NOT NULL AND a.ground_truth = false
+                               ) AS finished,
+                               COUNT(a.id) AS total
+                        FROM {task_table} t
+                        LEFT JOIN {annotation_table} a ON a.task_id = t.id
+                        WHERE t.project_id = %(project_id)s
+                        GROUP BY t.id
+                    ),
+                    ranked AS (
+                        SELECT id,
+                               finished >= %(max_annotations)s AS is_max,
+                               SUM(CASE WHEN finished >= %(max_annotations)s THEN 1 ELSE 0 END) OVER () AS max_count,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY finished >= %(max_annotations)s ORDER BY total DESC, id
+                               ) AS rank
+                        FROM counts
+                    )
+                    SELECT id,
+                           CASE
+                               WHEN is_max THEN %(max_annotations)s
+                               WHEN rank <= GREATEST(%(must_tasks)s - max_count, 0) THEN %(max_annotations)s
+                               ELSE 1
+                           END AS new_overlap
+                    FROM ranked
+                    """,
+                    {'project_id': self.id, 'max_annotations': max_annotations, 'must_tasks': must_tasks},
+                )
+                cursor.execute(f'CREATE INDEX ON {tmp_table} (id)')
+                cursor.execute(f'SELECT COUNT(*) FROM {tmp_table}')
+                total = cursor.fetchone()[0]
+
+                last_id, processed = 0, 0
+                while True:
+                    cursor.execute(
+                        f'SELECT MAX(id), COUNT(*) FROM '
+                        f'(SELECT id FROM {tmp_table} WHERE id > %s ORDER BY id LIMIT %s) AS batch',
+                        [last_id, settings.BATCH_SIZE],
+                    )
+                    upper_id, batch_count = cursor.fetchone()
+                    if upper_id is None:
+                        break
+
+                    cursor.execute(
+                        f"""
+                        UPDATE {task_table} SET overlap = t.new_overlap{is_labeled_sql}
+                        FROM {tmp_table} t
+                        WHERE {task_table}.id = t.id AND t.id > %s AND t.id <= %s
+                        """,
+                        [last_id, upper_id],
+                    )
+                    last_id = upper_id
+                    processed += batch_count
+                    update_job_progress(processed, total, step='rearrange_overlap_cohort')
+            finally:
+                cursor.execute(f'DROP TABLE IF EXISTS {tmp_table}')
+
+        logger.info(f'Project {self.id}: overlap rearranged for {total} tasks, {must_tasks} tasks in cohort')
+        if not is_labeled_in_sql:
+            # update is labeled after tasks rearrange overlap
+            bulk_update_stats_project_tasks(Task.objects.filter(project=self), project=self)
+
     def remove_tasks_by_file_uploads(self, file_upload_ids):
-        self.tasks.filter(file_upload_id__in=file_upload_ids).delete()
+        """
+        Delete tasks created from file uploads together with their annotations, predictions, drafts,
+        locks, storage links and other dependent rows.
+        Tasks are deleted with raw deletes in id ordered chunks, each chunk is a short separate transaction,
+        so objects aren't collected in memory and locks are held briefly.
+        Project summary is recalculated once at the end, callers update tasks counters and states.
+        :param file_upload_ids: ids of file uploads
+        :return: Count of deleted tasks
+        """
+        tasks = self.tasks.filter(file_upload_id__in=file_upload_ids).order_by('id')
+        # exported annotations are removed from target storages by pre_delete signals, keep them for such projects
+        delete_exported_annotations = self._has_export_storages_with_deletion()
+
+        deleted, last_id = 0, 0
+        while task_ids := list(tasks.filter(id__gt=last_id).values_list('id', flat=True)[: settings.BATCH_SIZE]):
+            with transaction.atomic():
+                if delete_exported_annotations:
+                    Annotation.objects.filter(task_id__in=task_ids).delete()
+                deleted += raw_cascade_delete(Task, task_ids, batch_size=settings.BATCH_SIZE)
+            Task.after_bulk_delete_actions(task_ids, self)
+            last_id = task_ids[-1]
+
+        if deleted:
+            logger.info(f'Project {self.id}: {deleted} tasks removed by file uploads {file_upload_ids}')
+            self._recalculate_summary()
+        return deleted
+
+    def _has_export_storages_with_deletion(self):
+        """Check if annotations deletion must be propagated to export storages"""
+        from io_storages.localfiles.models import LocalFilesExportStorage
+        from io_storages.models import get_storage_classes
+
+        for storage_class in get_storage_classes('export') + [LocalFilesExportStorage]:
+            if storage_class.objects.filter(project=self, can_delete_objects=True).exists():
+                return True
+        return False
+
+    def _recalculate_summary(self):
+        """
+        Recalculate project.summary from scratch using current tasks, annotations and drafts,
+        objects are iterated in chunks to keep memory usage bounded
+        """
+        with transaction.atomic():
+            # Lock summary for update to avoid race conditions
+            summary = ProjectSummary.objects.select_for_update().get(project=self)
+            summary.reset()
+            if not self.tasks.exists():
+                return
+
+            summary.update_data_columns(self.tasks.only('id', 'data').iterator(chunk_size=settings.BATCH_SIZE))
+            summary.update_created_annotations_and_labels(
+                Annotation.objects.filter(project=self).only('id', 'result').iterator(chunk_size=settings.BATCH_SIZE)
+            )
+            summary.update_created_labels_drafts(
+                AnnotationDraft.objects.filter(task__project=self)
+                .only('id', 'result')
+                .iterator(chunk_size=settings.BATCH_SIZE)
+            )
 
     def advance_onboarding(self):
         """Move project to next onboarding step"""
@@ -810,6 +1033,7 @@ class Project(ProjectMixin, FsmHistoryStateModel):
             _, deleted_map = predictions.delete()
 
         count = deleted_map.get('tasks.Prediction', 0)
+        ProjectCounters.apply_delta(self.id, total_predictions_number=-count)
         return {'deleted_predictions': count}
 
     def get_updated_weights(self):
@@ -868,13 +1092,16 @@ class Project(ProjectMixin, FsmHistoryStateModel):
             if update_fields is not None:
                 update_fields = {'is_published', 'is_draft'}.union(update_fields)
 
+        # only changes of these settings require tasks and summary reconciliation
+        changed_settings = self._get_changed_task_settings(update_fields)
+
         super(Project, self).save(*args, update_fields=update_fields, **kwargs)
 
         if label_config_has_changed:
             # save the new label config for future comparison
             self.__original_label_config = self.label_config
             # if tasks are already imported, emit signal that project is configured and ready for labeling
-            if self.num_tasks > 0:
+            if self.tasks.exists():
                 logger.debug(f'Sending post_label_config_and_import_tasks signal for project {self.id}')
                 ProjectSignals.post_label_config_and_import_tasks.send(sender=Project, project=self)
             else:
@@ -889,28 +1116,23 @@ class Project(ProjectMixin, FsmHistoryStateModel):
 
         # argument for recalculate project task stats
         if recalc:
-            self.update_tasks_states(
-                maximum_annotations_changed=self.__maximum_annotations != self.maximum_annotations,
-                overlap_cohort_percentage_changed=self.__overlap_cohort_percentage != self.overlap_cohort_percentage,
-                tasks_number_changed=False,
-            )
-            self.__maximum_annotations = self.maximum_annotations
-            self.__overlap_cohort_percentage = self.overlap_cohort_percentage
+            if changed_settings & {'maximum_annotations', 'overlap_cohort_percentage'}:
+                self.update_tasks_states(
+                    maximum_annotations_changed='maximum_annotations' in changed_settings,
+                    overlap_cohort_percentage_changed='overlap_cohort_percentage' in changed_settings,
+                    tasks_number_changed=False,
+                )
+            if 'maximum_annotations' in changed_settings:
+                self.__maximum_annotations = self.maximum_annotations
+            if 'overlap_cohort_percentage' in changed_settings:
+                self.__overlap_cohort_percentage = self.overlap_cohort_percentage
 
-        if self.__skip_queue != self.skip_queue:
-            bulk_update_stats_project_tasks(
-                self.tasks.filter(Q(annotations__isnull=False) & Q(annotations__ground_truth=False))
-            )
+        if 'skip_queue' in changed_settings:
+            self.update_tasks_stats_after_skip_queue_change()
+            self.__skip_queue = self.skip_queue
 
-        if hasattr(self, 'summary'):
-            with transaction.atomic():
-                # Lock summary for update to avoid race conditions
-                summary = ProjectSummary.objects.select_for_update().get(project=self)
-                # Ensure project.summary is consistent with current tasks / annotations
-                if self.num_tasks == 0:
-                    summary.reset()
-                elif self.num_annotations == 0 and self.num_drafts == 0:
-                    summary.reset(tasks_data_based=False)
+        if exists and changed_settings and hasattr(self, 'summary'):
+            self.reconcile_summary()
 
         # Call dimensions postprocess if configured (LSE feature)
         dimensions_postprocess = load_func(settings.PROJECT_SAVE_DIMENSIONS_POSTPROCESS)
@@ -1194,6 +1416,8 @@ class Project(ProjectMixin, FsmHistoryStateModel):
                 num_tasks_updated += update_tasks_counters(queryset, from_scratch)
                 bulk_update_stats_project_tasks(queryset, self)
             page_idx += 1
+
+        ProjectCounters.invalidate([self.id])
         return num_tasks_updated
 
     def _update_tasks_counters_and_task_states(
@@ -1636,6 +1860,127 @@ class ProjectSummary(models.Model):
         self.save(update_fields=['created_labels_drafts'])
 
 
+class ProjectCounters(models.Model):
+    """Materialized counters used by Project.objects.with_counts()
+
+    Counters are maintained incrementally by single task/annotation/prediction changes,
+    bulk operations invalidate them (reconciled_at = NULL) and schedule a background reconciliation.
+    Every counter is read only while reconciled_at is within settings.PROJECT_COUNTERS_MAX_STALENESS,
+    otherwise it's aggregated live.
+    """
+
+    RECONCILE_KEY = 'project_counters_reconcile:{}'
+
+    project = models.OneToOneField(
+        Project, primary_key=True, on_delete=models.CASCADE, related_name='materialized_counters'
+    )
+    task_number = models.IntegerField(_('task number'), default=0)
+    finished_task_number = models.IntegerField(_('finished task number'), default=0)
+    total_predictions_number = models.IntegerField(_('total predictions number'), default=0)
+    total_annotations_number = models.IntegerField(_('total annotations number'), default=0)
+    num_tasks_with_annotations = models.IntegerField(_('number of tasks with annotations'), default=0)
+    useful_annotation_number = models.IntegerField(_('useful annotation number'), default=0)
+    ground_truth_number = models.IntegerField(_('ground truth number'), default=0)
+    skipped_annotations_number = models.IntegerField(_('skipped annotations number'), default=0)
+    reconciled_at = models.DateTimeField(
+        _('reconciled at'),
+        null=True,
+        default=None,
+        help_text='Last time counters were recalculated from scratch, NULL if counters are invalidated',
+    )
+
+    @classmethod
+    def apply_delta(cls, project_id, **deltas):
+        """Increment counters of a project, invalidated or missing counters are left untouched"""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if project_id is None or not deltas:
+            return
+        cls.objects.filter(project_id=project_id, reconciled_at__isnull=False).update(
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+
+    @classmethod
+    def invalidate(cls, project_ids):
+        """Switch projects to live counters until the scheduled reconciliation is done"""
+        project_ids = {project_id for project_id in project_ids if project_id is not None}
+        if not project_ids:
+            return
+        cls.objects.filter(project_id__in=project_ids, reconciled_at__isnull=False).update(reconciled_at=None)
+        cls.schedule_reconcile(project_ids)
+
+    @classmethod
+    def schedule_reconcile(cls, project_ids):
+        """Start delayed reconciliation, projects already waiting for it are skipped.
+        Without redis counters are reconciled only by the reconcile_project_counters command.
+        """
+        if not redis_connected():
+            return
+
+        delay = settings.PROJECT_COUNTERS_RECONCILE_DELAY
+        project_ids = [
+            project_id
+            for project_id in sorted(set(project_ids))
+            if _redis.set(cls.RECONCILE_KEY.format(project_id), 1, ex=max(delay, 1), nx=True)
+        ]
+        if project_ids:
+            logger.debug(f'Schedule project counters reconciliation for projects {project_ids}')
+            start_job_async_or_sync(cls.reconcile, project_ids, in_seconds=delay)
+
+    @classmethod
+    def reconcile(cls, project_ids=None, **kwargs):
+        """Recalculate counters from scratch
+
+        :param project_ids: Project ids, all projects if None
+        :return: Count of reconciled projects
+        """
+        projects = Project._base_manager.all()
+        if project_ids is not None:
+            projects = projects.filter(id__in=project_ids)
+
+        fields = ProjectManager.COUNTER_FIELDS
+        reconciled = 0
+        for chunk in batched_iterator(projects.order_by('id').values_list('id', flat=True), settings.BATCH_SIZE):
+            # counting starts now, so deltas applied during it are covered by the staleness bound
+            reconciled_at = timezone.now()
+            queryset = ProjectManager.with_counts_annotate(
+                Project._base_manager.filter(id__in=chunk), materialized=False
+            )
+            counters = [
+                cls(project_id=row['id'], reconciled_at=reconciled_at, **{field: row[field] or 0 for field in fields})
+                for row in queryset.values('id', *fields)
+            ]
+            cls.objects.bulk_create(
+                counters,
+                update_conflicts=True,
+                unique_fields=['project'],
+                update_fields=[*fields, 'reconciled_at'],
+            )
+            reconciled += len(counters)
+
+        logger.debug(f'Project counters reconciled for {reconciled} projects')
+        return reconciled
+
+    @staticmethod
+    def is_stale(reconciled_at):
+        """Check if at least one materialized counter is not used anymore because of its staleness bound"""
+        bounds = [bound for bound in settings.PROJECT_COUNTERS_MAX_STALENESS.values() if bound is not None]
+        if not bounds:
+            return False
+        return reconciled_at is None or reconciled_at < timezone.now() - timedelta(seconds=min(bounds))
+
+    @staticmethod
+    def get_annotation_counters(annotation):
+        """Contribution of a single annotation to the project counters"""
+        was_cancelled = bool(annotation.was_cancelled)
+        ground_truth = bool(annotation.ground_truth)
+        return {
+            'total_annotations_number': int(not was_cancelled),
+            'skipped_annotations_number': int(was_cancelled),
+            'ground_truth_number': int(ground_truth),
+            'useful_annotation_number': int(not was_cancelled and not ground_truth and annotation.result is not None),
+        }
+
+
 class ProjectImport(models.Model):
     class Status(models.TextChoices):
         CREATED = 'created', _('Created')
@@ -1647,6 +1992,7 @@ class ProjectImport(models.Model):
     preannotated_from_fields = models.JSONField(null=True, blank=True)
     commit_to_project = models.BooleanField(default=False)
     return_task_ids = models.BooleanField(default=False)
+    skip_duplicates = models.BooleanField(default=False)
     status = models.CharField(max_length=64, choices=Status.choices, default=Status.CREATED)
     url = models.CharField(max_length=2048, null=True, blank=True)
     traceback = models.TextField(null=True, blank=True)
@@ -1664,6 +2010,10 @@ class ProjectImport(models.Model):
     data_columns = models.JSONField(default=list)
     tasks = models.JSONField(blank=True, null=True)
     task_ids = models.JSONField(default=list)
+    # live progress of the streaming import
+    processed_task_count = models.IntegerField(default=0, help_text='Number of tasks read and processed so far')
+    processed_batch_count = models.IntegerField(default=0, help_text='Number of processed batches')
+    tasks_per_second = models.FloatField(default=0, help_text='Average processing rate')
 
     def has_permission(self, user):
         return self.project.has_permission(user)
@@ -358,6 +358,7 @@ class ProjectImportSerializer(serializers.ModelSerializer):
             'preannotated_from_fields',
             'commit_to_project',
             'return_task_ids',
+            'skip_duplicates',
             'status',
             'url',
             'error',
@@ -374,6 +375,9 @@ class ProjectImportSerializer(serializers.ModelSerializer):
             'data_columns',
             'tasks',
             'task_ids',
+            'processed_task_count',
+            'processed_batch_count',
+            'tasks_per_second',
         ]
 
 
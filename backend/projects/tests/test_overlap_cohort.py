@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from projects.models import Project
+from projects.tests.factories import ProjectFactory
+from tasks.models import Task
+from tasks.tests.factories import AnnotationFactory, TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def make_project_with_cohort():
+    project = ProjectFactory(maximum_annotations=1)
+    tasks = [TaskFactory(project=project) for _ in range(10)]
+    for task in tasks[:3]:
+        AnnotationFactory(task=task, project=project, result=[])
+        AnnotationFactory(task=task, project=project, result=[])
+    for task in tasks[3:5]:
+        AnnotationFactory(task=task, project=project, result=[])
+
+    project.maximum_annotations = 2
+    project.overlap_cohort_percentage = 50
+    project.save(recalc=False)
+    return project, tasks
+
+
+def test_rearrange_overlap_cohort():
+    """Overlap cohort is filled by finished tasks first, then by the most annotated tasks"""
+    project, tasks = make_project_with_cohort()
+    project._rearrange_overlap_cohort()
+
+    overlaps = dict(Task.objects.filter(project=project).values_list('id', 'overlap'))
+    assert [overlaps[task.id] for task in tasks] == [2, 2, 2, 2, 2, 1, 1, 1, 1, 1]
+
+
+@pytest.mark.parametrize(
+    'bulk_update_is_labeled, flags, expected',
+    [
+        ('tasks.functions.bulk_update_is_labeled_by_overlap', {}, True),
+        ('tasks.functions.bulk_update_is_labeled_by_overlap', {'fflag_fix_fit_1082': True}, False),
+        ('tasks.functions.bulk_update_is_labeled_by_overlap', {'fflag_fix_back_plt_802': False}, False),
+        ('custom.bulk_update_is_labeled', {}, False),
+    ],
+)
+def test_is_labeled_in_overlap_sql_gating(settings, bulk_update_is_labeled, flags, expected):
+    """is_labeled is calculated by the overlap SQL only when it matches bulk_update_stats_project_tasks"""
+    settings.BULK_UPDATE_IS_LABELED = bulk_update_is_labeled
+    values = {'fflag_fix_fit_1082': False, 'fflag_fix_back_plt_802': True, **flags}
+
+    def flag_set(name, *args, **kwargs):
+        return next(value for prefix, value in values.items() if name.startswith(prefix))
+
+    with patch('projects.models.flag_set', side_effect=flag_set):
+        assert Project._is_labeled_in_overlap_sql() is expected
+
+
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='SQL overlap rearrangement is used on PostgreSQL only')
+@pytest.mark.parametrize('is_labeled_in_sql', [True, False])
+def test_rearrange_overlap_cohort_sql_is_labeled(is_labeled_in_sql):
+    """SQL overlap rearrangement sets the same is_labeled whether it's calculated in SQL or afterwards"""
+    project, tasks = make_project_with_cohort()
+    with patch.object(Project, '_is_labeled_in_overlap_sql', return_value=is_labeled_in_sql):
+        project._rearrange_overlap_cohort_sql(5)
+
+    values = dict(Task.objects.filter(project=project).values_list('id', 'overlap'))
+    labeled = dict(Task.objects.filter(project=project).values_list('id', 'is_labeled'))
+    assert [values[task.id] for task in tasks] == [2, 2, 2, 2, 2, 1, 1, 1, 1, 1]
+    assert [labeled[task.id] for task in tasks] == [True, True, True, False, False] + [False] * 5
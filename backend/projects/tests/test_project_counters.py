@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from projects.models import Project, ProjectCounters
+from projects.tests.factories import ProjectFactory
+from tasks.tests.factories import AnnotationFactory, PredictionFactory, TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _counts(project, **kwargs):
+    return Project.objects.with_counts(**kwargs).get(id=project.id).get_counters()
+
+
+def test_with_counts_reads_reconciled_counters():
+    """with_counts() uses materialized counters while they are fresh and live counters otherwise"""
+    project = ProjectFactory()
+    tasks = [TaskFactory(project=project) for _ in range(3)]
+    AnnotationFactory(task=tasks[0], project=project, result=[])
+    AnnotationFactory(task=tasks[1], project=project, result=[], was_cancelled=True)
+    PredictionFactory(task=tasks[2], project=project)
+
+    live = _counts(project, materialized=False)
+    assert ProjectCounters.reconcile([project.id]) == 1
+    counters = ProjectCounters.objects.get(project=project)
+    assert {field: getattr(counters, field) for field in live} == live
+    assert _counts(project) == live
+
+    TaskFactory(project=project)
+    counters.refresh_from_db()
+    assert counters.task_number == live['task_number'] + 1
+
+    ProjectCounters.objects.filter(project=project).update(total_annotations_number=100)
+    assert _counts(project)['total_annotations_number'] == 100
+    assert _counts(project, materialized=False)['total_annotations_number'] == 1
+
+    ProjectCounters.objects.filter(project=project).update(reconciled_at=timezone.now() - timedelta(days=1))
+    assert _counts(project)['total_annotations_number'] == 1
+
+    ProjectCounters.objects.filter(project=project).update(reconciled_at=timezone.now())
+    ProjectCounters.invalidate([project.id])
+    assert ProjectCounters.objects.get(project=project).reconciled_at is None
+    assert _counts(project)['total_annotations_number'] == 1
@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+import pytest
+from projects.models import Project
+from projects.tests.factories import ProjectFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_save_without_task_settings_changes_skips_reconciliation():
+    """Changing fields unrelated to tasks doesn't touch tasks states and summary"""
+    project = ProjectFactory()
+
+    with patch.object(Project, 'update_tasks_states') as update_tasks_states, patch.object(
+        Project, 'reconcile_summary'
+    ) as reconcile_summary:
+        project.title = 'new title'
+        project.save(update_fields=['title'])
+        project.description = 'new description'
+        project.save()
+
+    update_tasks_states.assert_not_called()
+    reconcile_summary.assert_not_called()
+
+
+def test_save_with_task_settings_changes_starts_reconciliation():
+    """Changing maximum_annotations starts tasks states update and summary reconciliation once"""
+    project = ProjectFactory(maximum_annotations=1)
+
+    with patch.object(Project, 'update_tasks_states') as update_tasks_states, patch.object(
+        Project, 'reconcile_summary'
+    ) as reconcile_summary:
+        project.maximum_annotations = 3
+        project.save(update_fields=['title'])
+        update_tasks_states.assert_not_called()
+
+        project.save(update_fields=['maximum_annotations'])
+        project.save()
+
+    update_tasks_states.assert_called_once_with(
+        maximum_annotations_changed=True,
+        overlap_cohort_percentage_changed=False,
+        tasks_number_changed=False,
+    )
+    reconcile_summary.assert_called_once()
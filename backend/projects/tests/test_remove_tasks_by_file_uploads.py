@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+import pytest
+from core.utils.db import raw_cascade_delete
+from data_import.models import FileUpload
+from django.db import models
+from django.db.models import ProtectedError, RestrictedError
+from projects.tests.factories import ProjectFactory
+from tasks.models import Annotation, AnnotationDraft, Prediction, Task, TaskLock
+from tasks.tests.factories import (
+    AnnotationDraftFactory,
+    AnnotationFactory,
+    PredictionFactory,
+    TaskFactory,
+    TaskLockFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def test_remove_tasks_by_file_uploads_deletes_dependents_in_chunks(settings):
+    """Tasks of removed file uploads are deleted with all dependent objects, other tasks are kept"""
+    settings.BATCH_SIZE = 2
+    project = ProjectFactory()
+    upload_1 = FileUpload.objects.create(user=project.created_by, project=project, file='upload_1.json')
+    upload_2 = FileUpload.objects.create(user=project.created_by, project=project, file='upload_2.json')
+
+    removed_tasks = [TaskFactory(project=project, file_upload=upload_1, data={'text': 'a'}) for _ in range(5)]
+    for task in removed_tasks:
+        annotation = AnnotationFactory(task=task, project=project)
+        AnnotationDraftFactory(task=task, annotation=annotation, user=project.created_by)
+        PredictionFactory(task=task, project=project)
+        TaskLockFactory(task=task, user=project.created_by)
+    kept_task = TaskFactory(project=project, file_upload=upload_2, data={'image': 'b'})
+    AnnotationFactory(task=kept_task, project=project)
+
+    assert project.remove_tasks_by_file_uploads([upload_1.id]) == 5
+
+    removed_ids = [task.id for task in removed_tasks]
+    assert list(Task.objects.filter(project=project).values_list('id', flat=True)) == [kept_task.id]
+    assert not Annotation.objects.filter(task_id__in=removed_ids).exists()
+    assert not AnnotationDraft.objects.filter(task_id__in=removed_ids).exists()
+    assert not Prediction.objects.filter(task_id__in=removed_ids).exists()
+    assert not TaskLock.objects.filter(task_id__in=removed_ids).exists()
+    assert Annotation.objects.filter(task=kept_task).count() == 1
+
+    project.summary.refresh_from_db()
+    assert project.summary.all_data_columns == {'image': 1}
+    assert project.summary.common_data_columns == ['image']
+
+
+def test_remove_tasks_by_file_uploads_without_tasks():
+    """Nothing is deleted or recalculated when file uploads have no tasks"""
+    project = ProjectFactory()
+    upload = FileUpload.objects.create(user=project.created_by, project=project, file='upload.json')
+    task = TaskFactory(project=project)
+
+    assert project.remove_tasks_by_file_uploads([upload.id]) == 0
+    assert Task.objects.filter(id=task.id).exists()
+
+
+@pytest.mark.parametrize('on_delete, error', [(models.PROTECT, ProtectedError), (models.RESTRICT, RestrictedError)])
+def test_raw_cascade_delete_keeps_protected_dependents(on_delete, error):
+    """Dependents of PROTECT and RESTRICT relations prevent the deletion as with Model.delete()"""
+    task = TaskFactory()
+    prediction = PredictionFactory(task=task, project=task.project)
+
+    with patch.object(Prediction._meta.get_field('task').remote_field, 'on_delete', on_delete):
+        with pytest.raises(error):
+            raw_cascade_delete(Task, [task.id])
+
+    assert Task.objects.filter(id=task.id).exists()
+    assert Prediction.objects.filter(id=prediction.id).exists()
+
+
+def test_raw_cascade_delete_sets_dependents_by_collector():
+    """Dependents of SET() relations are repointed by Django's Collector instead of being deleted"""
+    task = TaskFactory()
+    other_task = TaskFactory(project=task.project)
+    prediction = PredictionFactory(task=task, project=task.project)
+
+    with patch.object(Prediction._meta.get_field('task').remote_field, 'on_delete', models.SET(other_task.id)):
+        assert raw_cascade_delete(Task, [task.id]) == 1
+
+    assert not Task.objects.filter(id=task.id).exists()
+    prediction.refresh_from_db()
+    assert prediction.task_id == other_task.id
@@ -14,11 +14,13 @@ from data_export.models import DataExport
 from data_export.serializers import ExportDataSerializer
 from data_manager.managers import TaskQuerySet
 from django.conf import settings
-from django.db.models import Count, F, Q
+from django.db import connection
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.db.models.lookups import GreaterThanOrEqual
 from organizations.models import Organization
 from projects.models import Project
-from tasks.models import Annotation, Prediction, Task
+from tasks.models import Annotation, Prediction, Task, get_task_data_hash
 
 logger = logging.getLogger(__name__)
 
@@ -177,14 +179,13 @@ def fill_predictions_project(migration_name):
 
 def update_tasks_counters(queryset, from_scratch=True):
     """
-    Update tasks counters for the passed queryset of Tasks
+    Update tasks counters for the passed queryset of Tasks.
+    Counters are recalculated set-based: one UPDATE statement per chunk of task ids,
+    chunks and rows are processed in id order to keep row locking order consistent and prevent deadlocks.
     :param queryset: Tasks to update queryset
     :param from_scratch: Skip calculated tasks
     :return: Count of updated tasks
     """
-    total_annotations = Count('annotations', distinct=True, filter=Q(annotations__was_cancelled=False))
-    cancelled_annotations = Count('annotations', distinct=True, filter=Q(annotations__was_cancelled=True))
-    total_predictions = Count('predictions', distinct=True)
     # construct QuerySet in case of list of Tasks
     if isinstance(queryset, list) and len(queryset) > 0 and isinstance(queryset[0], Task):
         queryset = Task.objects.filter(id__in=[task.id for task in queryset])
@@ -197,43 +198,128 @@ def update_tasks_counters(queryset, from_scratch=True):
             Q(total_annotations__gt=0) | Q(cancelled_annotations__gt=0) | Q(total_predictions__gt=0)
         )
 
-    # filter our tasks with 0 annotations and 0 predictions and update them with 0
-    # order_by('id') ensures consistent row locking order to prevent deadlocks
-    queryset.filter(annotations__isnull=True, predictions__isnull=True).order_by('id').update(
-        total_annotations=0, cancelled_annotations=0, total_predictions=0
-    )
+    update_chunk = _update_tasks_counters_sql if connection.vendor == 'postgresql' else _update_tasks_counters_orm
+    updated_count = 0
 
-    # filter our tasks with 0 annotations and 0 predictions
-    queryset = queryset.filter(Q(annotations__isnull=False) | Q(predictions__isnull=False))
-    queryset = queryset.annotate(
-        new_total_annotations=total_annotations,
-        new_cancelled_annotations=cancelled_annotations,
-        new_total_predictions=total_predictions,
-    )
+    task_ids = iterate_queryset(queryset.order_by('id').values_list('id', flat=True), chunk_size=settings.BATCH_SIZE)
+    for task_ids_chunk in batched_iterator(task_ids, settings.BATCH_SIZE):
+        updated_count += update_chunk(task_ids_chunk)
+
+    return updated_count
 
-    updated_count = 0
 
-    tasks_iterator = iterate_queryset(
-        queryset.only('id', 'total_annotations', 'cancelled_annotations', 'total_predictions'),
-        chunk_size=settings.BATCH_SIZE,
+def _update_tasks_counters_sql(task_ids):
+    """
+    Recalculate counters for a chunk of tasks with a single UPDATE ... FROM (SELECT ... GROUP BY task_id) statement.
+    Task rows are locked in id order, only rows with changed counters are written.
+    :param task_ids: Sorted list of task ids
+    :return: Count of updated tasks
+    """
+    task_table = Task._meta.db_table
+    annotation_table = Annotation._meta.db_table
+    prediction_table = Prediction._meta.db_table
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {task_table}
+            SET total_annotations = c.total_annotations,
+                cancelled_annotations = c.cancelled_annotations,
+                total_predictions = c.total_predictions
+            FROM (
+                SELECT t.id AS task_id,
+                       COALESCE(a.total_annotations, 0) AS total_annotations,
+                       COALESCE(a.cancelled_annotations, 0) AS cancelled_annotations,
+                       COALESCE(p.total_predictions, 0) AS total_predictions
+                FROM (
+                    SELECT id FROM {task_table} WHERE id = ANY(%(task_ids)s) ORDER BY id FOR UPDATE
+                ) t
+                LEFT JOIN (
+                    SELECT task_id,
+                           COUNT(*) FILTER (WHERE was_cancelled = false) AS total_annotations,
+                           COUNT(*) FILTER (WHERE was_cancelled = true) AS cancelled_annotations
+                    FROM {annotation_table}
+                    WHERE task_id = ANY(%(task_ids)s)
+                    GROUP BY task_id
+                ) a ON a.task_id = t.id
+                LEFT JOIN (
+                    SELECT task_id, COUNT(*) AS total_predictions
+                    FROM {prediction_table}
+                    WHERE task_id = ANY(%(task_ids)s)
+                    GROUP BY task_id
+                ) p ON p.task_id = t.id
+            ) c
+            WHERE {task_table}.id = c.task_id
+              AND ({task_table}.total_annotations IS DISTINCT FROM c.total_annotations
+                   OR {task_table}.cancelled_annotations IS DISTINCT FROM c.cancelled_annotations
+                   OR {task_table}.total_predictions IS DISTINCT FROM c.total_predictions)
+            """,
+            {'task_ids': list(task_ids)},
+        )
+        return cursor.rowcount
+
+
+def _update_tasks_counters_orm(task_ids):
+    """
+    Recalculate counters for a chunk of tasks with a single UPDATE statement using correlated subqueries.
+    It's a fallback for databases other than PostgreSQL (SQLite), only rows with changed counters are written.
+    :param task_ids: Sorted list of task ids
+    :return: Count of updated tasks
+    """
+
+    def count_subquery(model, **filters):
+        counts = (
+            model.objects.filter(task=OuterRef('pk'), **filters)
+            .order_by()
+            .values('task')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+    queryset = Task.objects.filter(id__in=task_ids).annotate(
+        new_total_annotations=count_subquery(Annotation, was_cancelled=False),
+        new_cancelled_annotations=count_subquery(Annotation, was_cancelled=True),
+        new_total_predictions=count_subquery(Prediction),
+    )
+    queryset = queryset.exclude(
+        total_annotations=F('new_total_annotations'),
+        cancelled_annotations=F('new_cancelled_annotations'),
+        total_predictions=F('new_total_predictions'),
     )
+    return queryset.order_by('id').update(
+        total_annotations=F('new_total_annotations'),
+        cancelled_annotations=F('new_cancelled_annotations'),
+        total_predictions=F('new_total_predictions'),
+    )
+
+
+def fill_tasks_data_hash(project, queryset=None, only_missing=True):
+    """
+    Calculate task.data_hash used for duplicate detection
+    :param project: Project instance
+    :param queryset: Tasks to update queryset, all project tasks by default
+    :param only_missing: Skip tasks with calculated hash
+    :return: Count of updated tasks
+    """
+    if queryset is None:
+        queryset = project.tasks.all()
+    else:
+        # drop annotations and ordering from prepared querysets
+        queryset = Task.objects.filter(id__in=queryset.order_by().values('id'))
 
+    if only_missing:
+        queryset = queryset.filter(data_hash__isnull=True)
+
+    updated_count = 0
+    tasks_iterator = iterate_queryset(queryset.only('id', 'data'), chunk_size=settings.BATCH_SIZE)
     for _batch in batched_iterator(tasks_iterator, settings.BATCH_SIZE):
-        batch_list = []
         for task in _batch:
-            task.total_annotations = task.new_total_annotations
-            task.cancelled_annotations = task.new_cancelled_annotations
-            task.total_predictions = task.new_total_predictions
-            batch_list.append(task)
-
-        if batch_list:
-            Task.objects.bulk_update(
-                batch_list,
-                ['total_annotations', 'cancelled_annotations', 'total_predictions'],
-                batch_size=settings.BATCH_SIZE,
-            )
-            updated_count += len(batch_list)
+            task.data_hash = get_task_data_hash(task.data, project)
+        Task.objects.bulk_update(_batch, ['data_hash'], batch_size=settings.BATCH_SIZE)
+        updated_count += len(_batch)
 
+    logger.info(f'Data hash is calculated for {updated_count} tasks in project {project.id}')
     return updated_count
 
 
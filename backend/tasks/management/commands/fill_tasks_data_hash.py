@@ -0,0 +1,28 @@
+import logging
+
+from core.redis import start_job_async_or_sync
+from django.core.management.base import BaseCommand
+from projects.models import Project
+from tasks.functions import fill_tasks_data_hash
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Calculate task data hashes used for duplicate detection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, default=None, help='project id, all projects by default')
+        parser.add_argument('--recompute', action='store_true', help='recalculate already calculated hashes')
+
+    def handle(self, *args, **options):
+        projects = Project.objects.all()
+        if options['project']:
+            projects = projects.filter(id=options['project'])
+
+        for project in projects.order_by('id'):
+            logger.debug(f'Start processing project {project.id}.')
+            start_job_async_or_sync(fill_tasks_data_hash, project, only_missing=not options['recompute'])
+            logger.debug(f'End processing project {project.id}.')
+
+        logger.debug('Task data hashes were calculated.')
@@ -0,0 +1,14 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from tasks.models import TaskLock
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Delete expired task locks'
+
+    def handle(self, *args, **options):
+        deleted = TaskLock.sweep_expired()
+        logger.debug(f'{deleted} expired task locks were deleted.')
@@ -2,10 +2,12 @@
 """
 import base64
 import datetime
+import hashlib
 import logging
 import numbers
 import os
 import random
+import time
 import traceback
 import uuid
 from typing import Any, Mapping, Optional, Union, cast
@@ -15,8 +17,8 @@ import ujson as json
 from core.bulk_update_utils import bulk_update
 from core.current_request import get_current_request
 from core.feature_flags import flag_set
-from core.label_config import SINGLE_VALUED_TAGS
-from core.redis import start_job_async_or_sync
+from core.label_config import SINGLE_VALUED_TAGS, replace_task_data_undefined_with_config_field
+from core.redis import _redis, redis_connected, start_job_async_or_sync
 from core.utils.common import (
     find_first_one_to_one_related_field_by_prefix,
     load_func,
@@ -48,6 +50,21 @@ logger = logging.getLogger(__name__)
 TaskMixin = load_func(settings.TASK_MIXIN)
 
 
+def get_task_data_hash(data, project=None):
+    """Canonical hash of task data: keys are sorted, so the same data with another key order
+    gives the same hash. $undefined$ key is resolved like in the Data Manager if project is passed.
+
+    :param data: task.data dict
+    :param project: Project instance to resolve $undefined$ key
+    :return: sha256 hex digest
+    """
+    if project is not None and isinstance(data, dict) and settings.DATA_UNDEFINED_NAME in data:
+        data = dict(data)
+        replace_task_data_undefined_with_config_field(data, project)
+    serialized = json.dumps(data, sort_keys=True, ensure_ascii=False, escape_forward_slashes=False)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
 class Task(TaskMixin, FsmHistoryStateModel):
     """Business tasks from project"""
 
@@ -174,6 +191,14 @@ class Task(TaskMixin, FsmHistoryStateModel):
         db_index=True,
         help_text='When the last comment was updated',
     )
+    data_hash = models.CharField(
+        _('data hash'),
+        max_length=64,
+        null=True,
+        default=None,
+        editable=False,
+        help_text='Canonical hash of the task data, used for duplicate detection',
+    )
 
     objects = TaskManager()  # task manager by default
     prepared = PreparedTaskManager()  # task manager with filters, ordering, etc for data_manager app
@@ -187,6 +212,7 @@ class Task(TaskMixin, FsmHistoryStateModel):
             models.Index(fields=['id', 'overlap']),
             models.Index(fields=['overlap']),
             models.Index(fields=['project', 'id']),
+            models.Index(fields=['project', 'data_hash']),
         ]
 
     @property
@@ -366,7 +392,9 @@ class Task(TaskMixin, FsmHistoryStateModel):
         return mixin_has_permission and self.project.has_permission(user)
 
     def clear_expired_locks(self):
-        self.locks.filter(expire_at__lt=now()).delete()
+        """Expired locks are deleted by the periodic TaskLock sweeper, without redis they are cleared inline"""
+        if not TaskLock.schedule_sweep():
+            self.locks.filter(expire_at__lt=now()).delete()
 
     def set_lock(self, user):
         """Lock current task by specified user. Lock lifetime is set by `expire_in_secs`"""
@@ -381,13 +409,7 @@ class Task(TaskMixin, FsmHistoryStateModel):
             ):
                 lock_ttl = self.project.custom_task_lock_ttl
             expire_at = now() + datetime.timedelta(seconds=lock_ttl)
-            try:
-                task_lock = TaskLock.objects.get(task=self, user=user)
-            except TaskLock.DoesNotExist:
-                TaskLock.objects.create(task=self, user=user, expire_at=expire_at)
-            else:
-                task_lock.expire_at = expire_at
-                task_lock.save()
+            TaskLock.acquire(self, user, expire_at)
             logger.log(
                 get_next_task_logging_level(user),
                 f'User={user} acquires a lock for the task={self} ttl: {lock_ttl}',
@@ -527,6 +549,26 @@ class Task(TaskMixin, FsmHistoryStateModel):
     def ensure_unique_groundtruth(self, annotation_id):
         self.annotations.exclude(id=annotation_id).update(ground_truth=False)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'data' in instance.__dict__:
+            instance._remember_loaded_data()
+        return instance
+
+    def _remember_loaded_data(self):
+        # shallow copy is enough to detect reassigned or added top level keys without copying the whole data
+        self._loaded_data = dict(self.data) if isinstance(self.data, dict) else self.data
+
+    def _is_data_changed(self):
+        """Check if data differs from the value loaded from the db.
+        Nested values changed in place aren't detected, save such tasks with update_fields=['data'].
+        """
+        if not hasattr(self, '_loaded_data'):
+            # new or manually constructed instance, unless data is deferred
+            return 'data' in self.__dict__
+        return self.data != self._loaded_data
+
     def save(self, *args, update_fields=None, **kwargs):
         if self.inner_id == 0:
             task = Task.objects.filter(project=self.project).order_by('-inner_id').first()
@@ -539,7 +581,20 @@ class Task(TaskMixin, FsmHistoryStateModel):
             if update_fields is not None:
                 update_fields = {'inner_id'}.union(update_fields)
 
+        hash_data = 'data' in update_fields if update_fields is not None else self._is_data_changed()
+        if hash_data:
+            # project is needed only to resolve $undefined$ key, don't fetch it otherwise
+            project = self.project if settings.DATA_UNDEFINED_NAME in (self.data or {}) else None
+            self.data_hash = get_task_data_hash(self.data, project)
+            if update_fields is not None:
+                update_fields = {'data_hash'}.union(update_fields)
+
+        adding = self._state.adding
         super().save(*args, update_fields=update_fields, **kwargs)
+        if hash_data:
+            self._remember_loaded_data()
+        if adding:
+            update_project_counters(self.project_id, task_number=1, finished_task_number=int(bool(self.is_labeled)))
 
     @staticmethod
     def delete_tasks_without_signals(queryset):
@@ -829,8 +884,15 @@ class Annotation(AnnotationMixin, FsmHistoryStateModel):
             logger.debug(f'On delete updated total_annotations for task {task.id}')
 
         logger.debug(f'Update task stats for task={task}')
+        was_labeled = task.is_labeled
         task.update_is_labeled()
         Task.objects.filter(id=task.id).update(is_labeled=task.is_labeled)
+        update_project_counters_by_annotation(
+            self,
+            old_counters=get_annotation_project_counters(self),
+            new_counters={},
+            finished_task_delta=int(bool(task.is_labeled)) - int(bool(was_labeled)),
+        )
 
         # FSM: Update task state
         self._update_task_state_after_deletion(task, project)
@@ -880,9 +942,59 @@ class TaskLock(FsmHistoryStateModel):
     )
     created_at = models.DateTimeField(_('created at'), auto_now_add=True, help_text='Creation time', null=True)
 
+    SWEEP_KEY = 'task_locks:sweep'
+    # monotonic time until which the sweeper is known to be scheduled in this process
+    _sweep_scheduled_until = 0
+
     def has_permission(self, user):
         return self.task.has_permission(user)
 
+    @classmethod
+    def acquire(cls, task, user, expire_at):
+        """Acquire or refresh the lock of the task by user with a single INSERT ... ON CONFLICT statement"""
+        cls.objects.bulk_create(
+            [cls(task=task, user=user, expire_at=expire_at)],
+            update_conflicts=True,
+            unique_fields=['task', 'user'],
+            update_fields=['expire_at'],
+        )
+
+    @classmethod
+    def schedule_sweep(cls):
+        """Make sure the periodic sweeper of expired locks is scheduled, it's checked once per interval in a process.
+        :return: False if redis isn't available and expired locks should be cleared inline
+        """
+        if not redis_connected():
+            return False
+        if time.monotonic() < cls._sweep_scheduled_until:
+            return True
+
+        interval = settings.TASK_LOCK_SWEEP_INTERVAL
+        cls._sweep_scheduled_until = time.monotonic() + interval
+        if _redis.set(cls.SWEEP_KEY, 1, ex=max(interval, 1), nx=True):
+            start_job_async_or_sync(cls.sweep_expired, in_seconds=interval)
+        return True
+
+    @classmethod
+    def sweep_expired(cls, batch_size=None, **kwargs):
+        """Delete expired locks in id ordered batches
+        :return: Count of deleted locks
+        """
+        batch_size = batch_size or settings.BATCH_SIZE
+        expired = cls.objects.filter(expire_at__lt=now()).order_by('id')
+        deleted = 0
+        while lock_ids := list(expired.values_list('id', flat=True)[:batch_size]):
+            deleted += cls.objects.filter(id__in=lock_ids).delete()[0]
+
+        logger.debug(f'{deleted} expired task locks were deleted')
+        return deleted
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', 'expire_at']),
+        ]
+        constraints = [models.UniqueConstraint(fields=['task', 'user'], name='unique_task_lock_user')]
+
 
 class AnnotationDraftQuerySet(models.QuerySet):
     """Custom QuerySet for AnnotationDraft model"""
@@ -1103,12 +1215,17 @@ class Prediction(models.Model):
             update_fields = {'result'}.union(update_fields)
         # set updated_at field of task to now()
         self.update_task()
-        return super(Prediction, self).save(*args, update_fields=update_fields, **kwargs)
+        adding = self._state.adding
+        result = super(Prediction, self).save(*args, update_fields=update_fields, **kwargs)
+        if adding:
+            update_project_counters(self.project_id, total_predictions_number=1)
+        return result
 
     def delete(self, *args, **kwargs):
         result = super().delete(*args, **kwargs)
         # set updated_at field of task to now()
         self.update_task()
+        update_project_counters(self.project_id, total_predictions_number=-1)
         return result
 
     @classmethod
@@ -1360,12 +1477,15 @@ def update_project_summary_data_columns(sender, instance, created, update_fields
 @receiver(pre_save, sender=Annotation)
 def delete_project_summary_annotations_before_updating_annotation(sender, instance, **kwargs):
     """Before updating annotation fields - ensure previous info removed from project.summary"""
+    # previous state for materialized project counters, they are updated after saving
+    instance._project_counters_before = ({}, instance.task.is_labeled)
     try:
         old_annotation = sender.objects.get(id=instance.id)
     except Annotation.DoesNotExist:
         # annotation just created - do nothing
         return
     old_annotation.decrease_project_summary_counters()
+    instance._project_counters_before = (get_annotation_project_counters(old_annotation), instance.task.is_labeled)
 
     # update task counters if annotation changes it's was_cancelled status
     task = instance.task
@@ -1400,6 +1520,14 @@ def update_project_summary_annotations_and_is_labeled(sender, instance, created,
     instance.task.save(update_fields=['is_labeled', 'total_annotations', 'cancelled_annotations'], skip_fsm=True)
     logger.debug(f'Updated total_annotations and cancelled_annotations for {instance.task.id}.')
 
+    old_counters, was_labeled = getattr(instance, '_project_counters_before', ({}, instance.task.is_labeled))
+    update_project_counters_by_annotation(
+        instance,
+        old_counters=old_counters,
+        new_counters=get_annotation_project_counters(instance),
+        finished_task_delta=int(bool(instance.task.is_labeled)) - int(bool(was_labeled)),
+    )
+
 
 @receiver(pre_delete, sender=Prediction)
 def remove_predictions_from_project(sender, instance, **kwargs):
@@ -1417,6 +1545,53 @@ def save_predictions_to_project(sender, instance, **kwargs):
     logger.debug(f'Updated total_predictions for {instance.task.id}.')
 
 
+@receiver(post_bulk_create, sender=Annotation)
+def invalidate_project_counters_after_bulk_create(sender, objs, **kwargs):
+    """Bulk created annotations aren't counted incrementally, recalculate project counters"""
+    from projects.models import ProjectCounters
+
+    ProjectCounters.invalidate({annotation.project_id for annotation in objs})
+
+
+def update_project_counters(project_id, **deltas):
+    """Increment materialized project counters"""
+    from projects.models import ProjectCounters
+
+    ProjectCounters.apply_delta(project_id, **deltas)
+
+
+def get_annotation_project_counters(annotation):
+    """Contribution of the annotation to materialized project counters"""
+    from projects.models import ProjectCounters
+
+    return ProjectCounters.get_annotation_counters(annotation)
+
+
+def update_project_counters_by_annotation(annotation, old_counters, new_counters, finished_task_delta=0):
+    """Apply the change of annotation contribution to materialized project counters
+
+    :param annotation: Annotation instance
+    :param old_counters: Annotation contribution before the change, empty for a new annotation
+    :param new_counters: Annotation contribution after the change, empty for a deleted annotation
+    :param finished_task_delta: Change of task.is_labeled
+    """
+    deltas = {
+        field: new_counters.get(field, 0) - old_counters.get(field, 0) for field in {*old_counters, *new_counters}
+    }
+    if deltas.get('useful_annotation_number'):
+        # the task is counted in num_tasks_with_annotations by its first useful annotation only
+        has_other_useful = (
+            Annotation.objects.filter(
+                task_id=annotation.task_id, was_cancelled=False, ground_truth=False, result__isnull=False
+            )
+            .exclude(id=annotation.id)
+            .exists()
+        )
+        if not has_other_useful:
+            deltas['num_tasks_with_annotations'] = deltas['useful_annotation_number']
+    update_project_counters(annotation.project_id, finished_task_number=finished_task_delta, **deltas)
+
+
 # =========== END OF PROJECT SUMMARY UPDATES ===========
 
 
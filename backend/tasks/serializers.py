@@ -10,10 +10,11 @@ from core.utils.common import load_func, retry_database_locked
 from core.utils.db import fast_first
 from django.conf import settings
 from django.db import IntegrityError, transaction
+from django.db.models import Q
 from drf_spectacular.utils import extend_schema_field
 from fsm.serializer_fields import FSMStateField
-from fsm.state_inference import get_or_infer_state
-from fsm.utils import get_or_initialize_state, is_fsm_enabled
+from fsm.state_manager import get_state_manager
+from fsm.utils import is_fsm_enabled
 from label_studio_sdk.label_interface import LabelInterface
 from projects.models import Project
 from rest_flex_fields import FlexFieldsModelSerializer
@@ -23,8 +24,8 @@ from rest_framework.fields import SkipField
 from rest_framework.serializers import ModelSerializer
 from rest_framework.settings import api_settings
 from tasks.exceptions import AnnotationDuplicateError
-from tasks.models import Annotation, AnnotationDraft, Prediction, PredictionMeta, Task
-from tasks.validation import TaskValidator
+from tasks.models import Annotation, AnnotationDraft, Prediction, PredictionMeta, Task, get_task_data_hash
+from tasks.validation import TaskValidator, ValidatedTask
 from users.models import User
 from users.serializers import UserSerializer
 
@@ -213,7 +214,7 @@ class TaskSimpleSerializer(ModelSerializer):
 
     class Meta:
         model = Task
-        exclude = ('precomputed_agreement',)
+        exclude = ('precomputed_agreement', 'data_hash')
 
 
 class BaseTaskSerializer(FlexFieldsModelSerializer):
@@ -275,7 +276,7 @@ class BaseTaskSerializer(FlexFieldsModelSerializer):
 
     class Meta:
         model = Task
-        exclude = ('precomputed_agreement',)
+        exclude = ('precomputed_agreement', 'data_hash')
 
 
 class BaseTaskSerializerBulk(serializers.ListSerializer):
@@ -283,6 +284,7 @@ class BaseTaskSerializerBulk(serializers.ListSerializer):
 
     annotations = AnnotationSerializer(many=True, default=[], read_only=True)
     predictions = PredictionSerializer(many=True, default=[], read_only=True)
+    skipped_duplicates_count = 0
 
     @property
     def project(self):
@@ -313,9 +315,23 @@ class BaseTaskSerializerBulk(serializers.ListSerializer):
 
         ret, errors = [], []
         self.annotation_count, self.prediction_count = 0, 0
+        fast_validation = self.context.get('fast_validation', False)
+        sample_size = settings.IMPORT_FAST_VALIDATION_SAMPLE_SIZE
+        sample_shapes, required_data_keys = set(), None
         for i, item in enumerate(data):
             try:
-                validated = self.child.validate(item)
+                validated = None
+                if isinstance(item, ValidatedTask):
+                    validated = item
+                # items shaped as the fully validated sample get structural checks only
+                elif fast_validation and i >= sample_size and len(sample_shapes) == 1:
+                    if required_data_keys is None:
+                        required_data_keys = self._get_required_data_keys(self.project)
+                    validated = self._validate_uniform_item(item, next(iter(sample_shapes)), required_data_keys)
+                if validated is None:
+                    validated = self.child.validate(item)
+                    if fast_validation and i < sample_size:
+                        sample_shapes.add(isinstance(item, dict) and 'data' in item)
             except ValidationError as exc:
                 error = self.format_error(i, exc.detail, item)
                 errors.append(error)
@@ -338,6 +354,72 @@ class BaseTaskSerializerBulk(serializers.ListSerializer):
 
         return ret
 
+    @staticmethod
+    def _get_required_data_keys(project):
+        """Top level task data keys required by the project label config"""
+        return frozenset(data_key.split('[')[0].split('.')[0] for data_key in project.data_types or {})
+
+    @staticmethod
+    def _validate_uniform_item(item, is_task_root, required_data_keys):
+        """Cheap structural checks instead of TaskValidator for items of the same shape as the validated sample,
+        data value types are not checked. Returns None if the item must be validated fully.
+        """
+        if not isinstance(item, dict) or ('data' in item) != is_task_root:
+            return None
+
+        task = item if is_task_root else {'data': item}
+        data = task['data']
+        if (
+            not isinstance(data, dict)
+            or settings.DATA_UNDEFINED_NAME in data
+            or not required_data_keys.issubset(data.keys())
+        ):
+            return None
+
+        if is_task_root:
+            annotations = task.get('annotations', [])
+            if not isinstance(annotations, list) or not all(
+                isinstance(annotation, dict) and isinstance(annotation.get('result'), list)
+                for annotation in annotations
+            ):
+                return None
+            predictions = task.get('predictions', [])
+            if not isinstance(predictions, list) or not all(
+                isinstance(prediction, dict) and 'result' in prediction for prediction in predictions
+            ):
+                return None
+            if not isinstance(task.get('meta', {}), (dict, list)):
+                return None
+
+        return task
+
+    @staticmethod
+    def _get_members_email_to_id(organization, tasks):
+        """Resolve in one query only the organization members referenced by annotations, drafts and reviews"""
+        emails, ids = set(), set()
+        for task in tasks:
+            for annotation in task.get('annotations', []):
+                if not isinstance(annotation, dict):
+                    continue
+                completed_by = annotation.get('completed_by')
+                if isinstance(completed_by, dict):
+                    emails.add(completed_by.get('email'))
+                elif isinstance(completed_by, int):
+                    ids.add(completed_by)
+                for review in annotation.get('reviews', []):
+                    created_by = review.get('created_by') if isinstance(review, dict) else None
+                    if isinstance(created_by, dict):
+                        emails.add(created_by.get('email'))
+            for draft in task.get('drafts', []):
+                if isinstance(draft, dict):
+                    emails.add(draft.get('user'))
+
+        emails.discard(None)
+        if not emails and not ids:
+            return {}
+        members = organization.members.filter(Q(user__email__in=emails) | Q(user__id__in=ids))
+        return dict(members.values_list('user__email', 'user__id'))
+
     @staticmethod
     def _insert_valid_completed_by(annotations, members_email_to_id, members_ids, default_user):
         """Insert the correct id for completed_by by email in annotations"""
@@ -431,11 +513,15 @@ class BaseTaskSerializerBulk(serializers.ListSerializer):
         default_user = user or self.project.created_by
         ff_user = self.project.organization.created_by
 
+        # drop tasks with data which is already presented in the project
+        if self.context.get('skip_duplicates'):
+            validated_tasks = self._exclude_duplicated_tasks(validated_tasks)
+
         # get members from project, we need them to restore annotation.completed_by etc
         organization = self.project.organization
-        members_email_to_id = dict(organization.members.values_list('user__email', 'user__id'))
+        members_email_to_id = self._get_members_email_to_id(organization, validated_tasks)
         members_ids = set(members_email_to_id.values())
-        logger.debug(f'{len(members_email_to_id)} members found in organization {organization}')
+        logger.debug(f'{len(members_email_to_id)} referenced members found in organization {organization}')
 
         # to be sure we add tasks with annotations at the same time
         with transaction.atomic():
@@ -495,6 +581,33 @@ class BaseTaskSerializerBulk(serializers.ListSerializer):
 
         return db_tasks
 
+    def _exclude_duplicated_tasks(self, validated_tasks):
+        """Remove tasks with the same data as existing project tasks or previous tasks in the same batch,
+        the computed data hash is stored in the task dict to avoid hashing it again in add_tasks()
+        """
+        hashes = [get_task_data_hash(task['data'], self.project) for task in validated_tasks]
+
+        existing_hashes = set()
+        unique_hashes = list(set(hashes))
+        for i in range(0, len(unique_hashes), settings.BATCH_SIZE):
+            existing_hashes.update(
+                Task.objects.filter(
+                    project=self.project, data_hash__in=unique_hashes[i : i + settings.BATCH_SIZE]
+                ).values_list('data_hash', flat=True)
+            )
+
+        unique_tasks = []
+        for task, data_hash in zip(validated_tasks, hashes):
+            if data_hash in existing_hashes:
+                continue
+            existing_hashes.add(data_hash)
+            task['data_hash'] = data_hash
+            unique_tasks.append(task)
+
+        self.skipped_duplicates_count = len(validated_tasks) - len(unique_tasks)
+        logger.info(f'Skipped {self.skipped_duplicates_count} duplicated tasks for project {self.project.id}')
+        return unique_tasks
+
     def add_predictions(self, task_predictions):
         """Save predictions to DB and set the latest model version in the project"""
         db_predictions = []
@@ -675,6 +788,7 @@ class BaseTaskSerializerBulk(serializers.ListSerializer):
             t = Task(
                 project=self.project,
                 data=task['data'],
+                data_hash=task.get('data_hash') or get_task_data_hash(task['data'], self.project),
                 meta=task.get('meta', {}),
                 overlap=max_overlap,
                 is_labeled=current_overlap >= max_overlap,
@@ -723,9 +837,9 @@ class BaseTaskSerializerBulk(serializers.ListSerializer):
         if not tasks or not is_fsm_enabled(user):
             return
 
-        for task in tasks:
-            inferred_state = get_or_infer_state(task)
-            get_or_initialize_state(task, user=user, inferred_state=inferred_state)
+        get_state_manager().bulk_initialize_states(
+            tasks, user=user, organization_id=self.project.organization_id, reason='Task imported'
+        )
 
     @staticmethod
     def post_process_annotations(user, db_annotations, action):
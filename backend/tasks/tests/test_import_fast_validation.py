@@ -0,0 +1,90 @@
+import copy
+from unittest.mock import patch
+
+from data_import.serializers import ImportApiSerializer
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from projects.tests.factories import ProjectFactory
+from tasks.models import Annotation
+from tasks.validation import TaskValidator
+
+LABEL_CONFIG = """
+<View>
+  <Text name="text" value="$text"/>
+  <Choices name="label" toName="text">
+    <Choice value="pos"/>
+    <Choice value="neg"/>
+  </Choices>
+</View>
+"""
+
+
+class TestImportFastValidation(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = ProjectFactory(label_config=LABEL_CONFIG)
+        cls.user = cls.project.created_by
+
+    def _tasks(self, number):
+        return [
+            {
+                'data': {'text': f'text {i}'},
+                'annotations': [{'result': [], 'completed_by': {'email': self.user.email}}],
+                'predictions': [{'result': [], 'score': 0.5}],
+            }
+            for i in range(number)
+        ]
+
+    def _serializer(self, tasks, fast_validation):
+        return ImportApiSerializer(
+            data=tasks, many=True, context={'project': self.project, 'fast_validation': fast_validation}
+        )
+
+    @override_settings(IMPORT_FAST_VALIDATION_SAMPLE_SIZE=10)
+    def test_fast_validation_matches_full_validation(self):
+        tasks = self._tasks(50)
+        full = self._serializer(copy.deepcopy(tasks), fast_validation=False)
+        fast = self._serializer(copy.deepcopy(tasks), fast_validation=True)
+        assert full.is_valid() and fast.is_valid()
+        assert fast.validated_data == full.validated_data
+
+        db_tasks = fast.save(project_id=self.project.id)
+        assert len(db_tasks) == len(fast.db_annotations) == len(fast.db_predictions) == 50
+        assert set(Annotation.objects.filter(project=self.project).values_list('completed_by_id', flat=True)) == {
+            self.user.id
+        }
+
+    @override_settings(IMPORT_FAST_VALIDATION_SAMPLE_SIZE=10)
+    def test_fast_validation_falls_back_for_irregular_items(self):
+        tasks = self._tasks(20)
+        tasks[15] = {'data': {'other': 'missing text key'}}
+        tasks[16] = {'text': 'task data as root'}
+
+        serializer = self._serializer(tasks, fast_validation=True)
+        assert not serializer.is_valid()
+        errors = str(serializer.errors)
+        assert 'at item 15' in errors and '"text" key is expected' in errors
+        assert 'at item 16' not in errors
+
+    @override_settings(IMPORT_FAST_VALIDATION_SAMPLE_SIZE=10)
+    def test_fast_validation_runs_task_validator_for_sample_only(self):
+        for fast_validation, expected_calls in ((False, 50), (True, 10)):
+            serializer = self._serializer(self._tasks(50), fast_validation=fast_validation)
+            with patch.object(TaskValidator, 'validate', autospec=True, side_effect=TaskValidator.validate) as validate:
+                assert serializer.is_valid()
+            assert validate.call_count == expected_calls
+
+    def test_save_queries_dont_depend_on_batch_size(self):
+        queries_count = []
+        # the first import also sets the project model version
+        for tasks_number in (1, 10, 40):
+            serializer = self._serializer(self._tasks(tasks_number), fast_validation=True)
+            assert serializer.is_valid()
+            with CaptureQueriesContext(connection) as queries:
+                db_tasks = serializer.save(project_id=self.project.id)
+            assert len(db_tasks) == tasks_number
+            queries_count.append(len(queries))
+
+        # tasks, annotations and predictions are created by bulk_create(), members are resolved in one query
+        assert queries_count[1] == queries_count[2]
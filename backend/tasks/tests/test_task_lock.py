@@ -0,0 +1,53 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+from projects.tests.factories import ProjectFactory
+from tasks.models import TaskLock
+from tasks.tests.factories import TaskFactory, TaskLockFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_acquire_refreshes_existing_lock():
+    """Acquiring a lock twice by the same user refreshes the existing lock"""
+    project = ProjectFactory()
+    task = TaskFactory(project=project)
+    user = project.created_by
+    expire_at = timezone.now() + timedelta(minutes=1)
+
+    TaskLock.acquire(task, user, expire_at)
+    unique_id = TaskLock.objects.get(task=task, user=user).unique_id
+    TaskLock.acquire(task, user, expire_at + timedelta(minutes=1))
+
+    lock = TaskLock.objects.get(task=task, user=user)
+    assert lock.expire_at == expire_at + timedelta(minutes=1)
+    assert lock.unique_id == unique_id
+
+
+def test_sweep_expired_deletes_only_expired_locks():
+    """The sweeper deletes expired locks in batches and keeps active ones"""
+    project = ProjectFactory()
+    expired = [
+        TaskLockFactory(task=TaskFactory(project=project), expire_at=timezone.now() - timedelta(seconds=1))
+        for _ in range(3)
+    ]
+    active = TaskLockFactory(task=TaskFactory(project=project))
+
+    assert TaskLock.sweep_expired(batch_size=2) == 3
+    assert not TaskLock.objects.filter(id__in=[lock.id for lock in expired]).exists()
+    assert TaskLock.objects.filter(id=active.id).exists()
+
+
+def test_set_lock_without_redis_clears_expired_locks_inline():
+    """Without redis expired locks of the task are cleared by set_lock"""
+    project = ProjectFactory()
+    task = TaskFactory(project=project)
+    expired = TaskLockFactory(task=task, expire_at=timezone.now() - timedelta(seconds=1))
+
+    with patch('tasks.models.redis_connected', return_value=False):
+        task.set_lock(project.created_by)
+
+    assert not TaskLock.objects.filter(id=expired.id).exists()
+    assert TaskLock.objects.filter(task=task, user=project.created_by).exists()
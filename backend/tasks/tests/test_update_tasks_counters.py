@@ -0,0 +1,44 @@
+import pytest
+from projects.tests.factories import ProjectFactory
+from tasks.functions import update_tasks_counters
+from tasks.models import Task
+from tasks.tests.factories import AnnotationFactory, PredictionFactory, TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_update_tasks_counters_recounts_changed_tasks():
+    """Counters are recalculated set-based and only changed tasks are written"""
+    project = ProjectFactory()
+    task_1, task_2, task_3 = [TaskFactory(project=project) for _ in range(3)]
+    AnnotationFactory(task=task_1, project=project)
+    AnnotationFactory(task=task_1, project=project)
+    PredictionFactory(task=task_1, project=project)
+    AnnotationFactory(task=task_2, project=project, was_cancelled=True)
+    Task.objects.filter(project=project).update(total_annotations=5, cancelled_annotations=5, total_predictions=5)
+
+    assert update_tasks_counters(Task.objects.filter(project=project)) == 3
+
+    counters = {
+        task['id']: (task['total_annotations'], task['cancelled_annotations'], task['total_predictions'])
+        for task in Task.objects.filter(project=project).values(
+            'id', 'total_annotations', 'cancelled_annotations', 'total_predictions'
+        )
+    }
+    assert counters == {task_1.id: (2, 0, 1), task_2.id: (0, 1, 0), task_3.id: (0, 0, 0)}
+    assert update_tasks_counters(Task.objects.filter(project=project)) == 0
+
+
+def test_update_tasks_counters_not_from_scratch_skips_calculated_tasks():
+    """Tasks with already calculated counters are skipped when from_scratch=False"""
+    project = ProjectFactory()
+    task_1, task_2 = [TaskFactory(project=project) for _ in range(2)]
+    AnnotationFactory(task=task_1, project=project)
+    AnnotationFactory(task=task_2, project=project)
+    Task.objects.filter(id=task_1.id).update(total_annotations=7, cancelled_annotations=0, total_predictions=0)
+    Task.objects.filter(id=task_2.id).update(total_annotations=0, cancelled_annotations=0, total_predictions=0)
+
+    assert update_tasks_counters([task_1, task_2], from_scratch=False) == 1
+
+    assert Task.objects.get(id=task_1.id).total_annotations == 7
+    assert Task.objects.get(id=task_2.id).total_annotations == 1
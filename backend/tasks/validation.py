@@ -41,6 +41,11 @@ _DATA_TYPES = {
 logger = logging.getLogger(__name__)
 
 
+class ValidatedTask(dict):
+    """Task dict validated in bulk together with other tasks of the same shape
+    (e.g. once per Parquet row group), so it isn't validated again item by item"""
+
+
 class TaskValidator:
     """Task Validator with project scheme configs validation. It is equal to TaskSerializer from django backend."""
 
@@ -50,6 +55,11 @@ class TaskValidator:
         self.annotation_count = 0
         self.prediction_count = 0
 
+    @staticmethod
+    def get_expected_types(data_type, is_array=False):
+        """Python types allowed for a task data value used by the object tag"""
+        return (list,) if is_array else tuple(_DATA_TYPES.get(data_type, (str,)))
+
     @staticmethod
     def check_data(project, data):
         """Validate data from task['data']"""
@@ -76,12 +86,8 @@ class TaskValidator:
                     raise ValidationError('"{data_key}" key is expected in task data'.format(data_key=data_key))
                 data_item = data[data_key]
 
-            if is_array:
-                expected_types = (list,)
-            else:
-                expected_types = _DATA_TYPES.get(data_type, (str,))
-
-            if not isinstance(data_item, tuple(expected_types)):
+            expected_types = TaskValidator.get_expected_types(data_type, is_array)
+            if not isinstance(data_item, expected_types):
                 raise ValidationError(
                     "data['{data_key}']={data_value} is of type '{type}', "
                     'but the object tag {data_type} expects the following types: {expected_types}'.format(
@@ -36,7 +36,7 @@ const supportedExtensions = {
   image: ["bmp", "gif", "jpg", "jpeg", "png", "svg", "webp"],
   html: ["html", "htm", "xml"],
   pdf: ["pdf"],
-  structuredData: ["csv", "tsv", "json"],
+  structuredData: ["csv", "tsv", "json", "jsonl", "parquet", "arrow"],
 };
 const allSupportedExtensions = flatten(Object.values(supportedExtensions));
 